@@ -0,0 +1,170 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(values, percent: float) -> float:
+    """
+    Return the given percentile of a collection of numbers (nearest-rank method).
+
+    Args:
+        values (iterable): The numbers to summarize.
+        percent (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        float: The percentile, or 0.0 if there are no values.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, round(percent / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class AsyncStore:
+    """
+    asyncio front-end that serves many concurrent clients from one Store.
+
+    Orders are put on a bounded queue and processed by a fixed number of worker
+    tasks. Each worker runs Store.order on a thread of its own, so the event loop
+    keeps serving clients while orders are placed, and several workers place orders
+    at the same time; that needs a store created with thread_safe=True. When the
+    queue is full, order() waits until a worker frees a slot, which applies
+    backpressure to the callers.
+    """
+    def __init__(self, store, workers: int = 4, max_queue: int = 1000, latency_window: int = 10000):
+        """
+        Initialize the front-end.
+
+        Args:
+            store (Store): The store that processes the orders.
+            workers (int): The number of worker tasks.
+            max_queue (int): The maximum number of orders waiting in the queue.
+            latency_window (int): The number of most recent latencies kept for the stats.
+
+        Raises:
+            ValueError: If workers or max_queue is not positive, or there are several
+                workers and the store is not thread-safe.
+        """
+        if workers <= 0:
+            raise ValueError("Workers must be positive.")
+        if max_queue <= 0:
+            raise ValueError("Max queue must be positive.")
+        if workers > 1 and not store.thread_safe:
+            raise ValueError("Several workers need a thread-safe store.")
+        self.store = store
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue = None
+        self._executor = None
+        self._tasks = []
+        self._latencies = deque(maxlen=latency_window)
+        self._max_depth = 0
+        self._completed = 0
+        self._failed = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """
+        Create the queue and start the worker tasks on the running event loop.
+        """
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="async-store")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self):
+        """
+        Wait for the queued orders to finish, then stop the worker tasks and their threads.
+        """
+        if not self._tasks:
+            return
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._executor.shutdown()
+        self._executor = None
+
+    async def order(self, shopping_list: list) -> float:
+        """
+        Queue an order and wait for its result.
+
+        Args:
+            shopping_list (list): A list of (Product, quantity) tuples.
+
+        Returns:
+            float: The total price for the order.
+
+        Raises:
+            RuntimeError: If the front-end has not been started.
+            ValueError: If Store.order rejects the order; any other exception raised by
+                Store.order is passed on to the caller in the same way.
+        """
+        if not self._tasks:
+            raise RuntimeError("AsyncStore is not started.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((shopping_list, future, time.perf_counter()))
+        depth = self._queue.qsize()
+        if depth > self._max_depth:
+            self._max_depth = depth
+        return await future
+
+    async def list_products(self) -> list:
+        """
+        Return the active products of the store.
+
+        Returns:
+            list: A list of active Product instances.
+        """
+        return self.store.get_all_products()
+
+    def stats(self) -> dict:
+        """
+        Return queue-depth and latency statistics.
+
+        Latencies are measured from the moment an order is queued until its result
+        is ready, in seconds, over the most recent orders.
+
+        Returns:
+            dict: The current and maximum queue depth, completed and failed order counts,
+            and the p50, p99 and maximum latency.
+        """
+        latencies = list(self._latencies)
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_depth": self._max_depth,
+            "completed": self._completed,
+            "failed": self._failed,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p99": percentile(latencies, 99),
+            "latency_max": max(latencies, default=0.0),
+        }
+
+    async def _worker(self):
+        """Take orders from the queue and run them through Store.order on the executor."""
+        loop = asyncio.get_running_loop()
+        while True:
+            shopping_list, future, queued_at = await self._queue.get()
+            try:
+                total_price = await loop.run_in_executor(self._executor, self.store.order, shopping_list)
+            except Exception as error:  # Any failure belongs to this order; the worker keeps running.
+                self._failed += 1
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                self._completed += 1
+                if not future.done():
+                    future.set_result(total_price)
+            finally:
+                self._latencies.append(time.perf_counter() - queued_at)
+                self._queue.task_done()
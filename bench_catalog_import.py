@@ -0,0 +1,71 @@
+"""
+Benchmark streaming CSV import of a large catalog and record peak memory.
+
+The first pass only validates the rows, which shows the memory bound of the
+streaming pipeline itself; the second pass also keeps every product in a Store.
+Peak memory is the process's peak RSS, so the second figure includes the first.
+
+Run with: python bench_catalog_import.py [number_of_rows] [chunk_size]
+"""
+import csv
+import os
+import sys
+import resource
+import tempfile
+import time
+
+from catalog_io import CSV_FIELDS, import_products, read_products_csv
+from store import Store
+
+
+def write_rows(path: str, count: int) -> None:
+    """Write a CSV catalog without building Product objects."""
+    promotions = ["", "PercentDiscount", "SecondHalfPrice", "ThirdOneFree"]
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(CSV_FIELDS)
+        for idx in range(count):
+            promotion = promotions[idx % len(promotions)]
+            writer.writerow(["Product", f"Product {idx}", 10 + idx % 90, idx % 50, "true", "",
+                             promotion, 15 if promotion == "PercentDiscount" else ""])
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(label: str, action) -> None:
+    """Run an action and print its time and the process's peak memory afterwards."""
+    start = time.perf_counter()
+    rows = action()
+    elapsed = time.perf_counter() - start
+    print(f"{label:24} {rows:,} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s), "
+          f"peak RSS {peak_rss_mb():.1f} MB")
+
+
+def run(count: int = 1_000_000, chunk_size: int = 10_000) -> None:
+    """Write a catalog file and import it twice."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.csv")
+        write_rows(path, count)
+        print(f"rows: {count}, chunk size: {chunk_size}, file size: {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"{'baseline':24} peak RSS {peak_rss_mb():.1f} MB")
+
+        def validate_only():
+            with open(path, newline="", encoding="utf-8") as file:
+                return sum(len(products) for products, _ in read_products_csv(file, chunk_size))
+
+        def import_into_store():
+            store = Store([])
+            with open(path, newline="", encoding="utf-8") as file:
+                report = import_products(store, read_products_csv(file, chunk_size))
+            return report["imported"]
+
+        measure("stream and validate", validate_only)
+        measure("import into Store", import_into_store)
+
+
+if __name__ == "__main__":
+    arguments = [int(value) for value in sys.argv[1:]]
+    run(*arguments)
@@ -0,0 +1,47 @@
+"""
+Benchmark startup from a catalog file: full materialization versus memory mapping.
+
+Run with: python bench_catalog_load.py [number_of_products]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from catalog_file import MappedCatalog, read_catalog, write_catalog
+from products import Product
+
+
+def run(count: int = 1_000_000) -> None:
+    """Write a catalog file, then time both ways of opening it and answering queries."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.bin")
+        write_catalog(path, (Product(f"Product {idx}", 10 + idx % 90, idx % 7) for idx in range(count)))
+        print(f"products: {count}, file size: {os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        products, _ = read_catalog(path)
+        loaded = time.perf_counter() - start
+        total = sum(product.quantity for product in products)
+        active = [product for product in products if product.active]
+        print(f"read_catalog:  load {loaded:.3f}s, total quantity {total}, active {len(active)}")
+        del products, active
+
+        start = time.perf_counter()
+        with MappedCatalog(path) as catalog:
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            total = catalog.get_total_quantity()
+            summed = time.perf_counter() - start
+            start = time.perf_counter()
+            active = catalog.active_indices()
+            filtered = time.perf_counter() - start
+            start = time.perf_counter()
+            page = [catalog[index].show() for index in active[:20]]
+            paged = time.perf_counter() - start
+            print(f"MappedCatalog: open {opened * 1000:.2f}ms, total quantity {total} in {summed * 1000:.1f}ms, "
+                  f"active {len(active)} in {filtered * 1000:.1f}ms, first page of {len(page)} in {paged * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
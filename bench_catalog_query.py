@@ -0,0 +1,45 @@
+"""
+Benchmark indexed catalog queries against scanning the product list.
+
+Run with: python bench_catalog_query.py [number_of_products]
+"""
+import random
+import sys
+import time
+
+from products import Product
+from store import Store
+
+QUERIES = [
+    ("exact name", {"text": "product 123456"}),
+    ("rare prefix", {"text": "12345"}),
+    ("common word", {"text": "product"}),
+    ("common word, in stock", {"text": "product", "in_stock": True}),
+    ("price range", {"min_price": 500, "max_price": 510}),
+    ("word and price range", {"text": "product", "min_price": 500, "max_price": 510, "page": 3}),
+    ("prefix and price range", {"text": "99", "min_price": 100, "max_price": 200}),
+]
+
+
+def run(count: int = 1_000_000) -> None:
+    """Build a catalog, then time each query through the index and by scanning."""
+    rng = random.Random(1)
+    store = Store([Product(f"Product {idx}", rng.randint(100, 99_999) / 100, idx % 3) for idx in range(count)])
+    start = time.perf_counter()
+    store.query()
+    print(f"products: {count}, index build: {time.perf_counter() - start:.2f}s")
+    for label, arguments in QUERIES:
+        repeats = 100
+        start = time.perf_counter()
+        for _ in range(repeats):
+            products, _ = store.query(**arguments)
+        elapsed = (time.perf_counter() - start) / repeats
+        print(f"{label:24} {elapsed * 1e3:8.3f} ms  ({len(products)} results)")
+
+    start = time.perf_counter()
+    matches = [product for product in store.list_of_products if "12345" in product.name.casefold()]
+    print(f"{'scan for comparison':24} {(time.perf_counter() - start) * 1e3:8.3f} ms  ({len(matches)} results)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,84 @@
+"""
+Benchmark a flash-sale drop of one LimitedProduct under heavy thread contention.
+
+Many threads place single-unit purchase attempts for the same product, far more
+than there is stock, once through Store.order on a thread-safe store and once
+through FlashSale.buy. Prints the attempt throughput and the latency of the
+successful and the rejected attempts.
+
+Run with: python bench_flash_sale.py [threads] [attempts] [stock]
+"""
+import sys
+import threading
+import time
+
+from async_store import percentile
+from flash_sale import FlashSale
+from products import LimitedProduct
+from store import Store
+
+
+def drive(buy, threads: int, attempts: int) -> tuple:
+    """Run the attempts on a pool of threads; return the elapsed time and the (ok, seconds) samples."""
+    customers = iter(range(attempts))
+    lock = threading.Lock()
+    samples = []
+    start_line = threading.Barrier(threads + 1)
+
+    def worker():
+        local = []
+        start_line.wait()
+        while True:
+            with lock:
+                customer = next(customers, None)
+            if customer is None:
+                break
+            start = time.perf_counter()
+            try:
+                buy(customer % (attempts // 2))  # Every customer tries twice.
+                ok = True
+            except ValueError:
+                ok = False
+            local.append((ok, time.perf_counter() - start))
+        with lock:
+            samples.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    start_line.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start, samples
+
+
+def report(label: str, elapsed: float, samples: list):
+    """Print throughput and latency percentiles of a run."""
+    accepted = [seconds for ok, seconds in samples if ok]
+    rejected = [seconds for ok, seconds in samples if not ok]
+    print(f"{label:12} {len(samples) / elapsed:9,.0f} attempts/s  sold {len(accepted):6}  "
+          f"ok p50 {percentile(accepted, 50) * 1e6:7.1f} us  p99 {percentile(accepted, 99) * 1e6:8.1f} us  "
+          f"rejected p50 {percentile(rejected, 50) * 1e6:6.1f} us  p99 {percentile(rejected, 99) * 1e6:8.1f} us")
+
+
+def run(threads: int = 64, attempts: int = 200_000, stock: int = 10_000):
+    """Run the drop through Store.order and through a FlashSale and compare them."""
+    print(f"threads: {threads}, attempts: {attempts}, stock: {stock}")
+    sneakers = LimitedProduct("Exclusive Sneakers", 200, stock, 1)
+    store = Store([sneakers], thread_safe=True)
+    elapsed, samples = drive(lambda customer: store.order([(sneakers, 1)]), threads, attempts)
+    report("Store.order", elapsed, samples)
+
+    sneakers = LimitedProduct("Exclusive Sneakers", 200, stock, 1)
+    store = Store([sneakers], thread_safe=True)
+    sale = FlashSale(store, sneakers, stock, 1, time.time(), time.time() + 3600)
+    sale.open()
+    elapsed, samples = drive(sale.buy, threads, attempts)
+    sale.close()
+    report("FlashSale", elapsed, samples)
+    print(f"flash sale sold {sale.sold}, product quantity left {sneakers.quantity}")
+
+
+if __name__ == "__main__":
+    run(*(int(value) for value in sys.argv[1:]))
@@ -0,0 +1,51 @@
+"""
+Benchmark listing a page of a large catalog: cached listing versus rendering every product.
+
+Run with: python bench_listing.py [number_of_products]
+"""
+import sys
+import time
+
+from products import Product
+from store import Store
+
+PAGE_SIZE = 20
+
+
+def run(count: int = 1_000_000) -> None:
+    """Time a full render, the first listing page and repeated pages of the cached listing."""
+    store = Store([Product(f"Product {idx}", 10 + idx % 90, 1 + idx % 7) for idx in range(count)])
+    print(f"products: {count}, page size: {PAGE_SIZE}")
+
+    start = time.perf_counter()
+    rows = [product.show() for product in store.get_all_products()]
+    print(f"render all rows:            {time.perf_counter() - start:.4f}s")
+    del rows
+
+    start = time.perf_counter()
+    store.listing.page(1, PAGE_SIZE)
+    print(f"first page (builds view):   {time.perf_counter() - start:.4f}s")
+
+    last_page = store.listing.page_count(PAGE_SIZE)
+    for label, number in (("page 1 (cached rows)", 1), ("last page (new rows)", last_page),
+                          ("last page (cached rows)", last_page)):
+        start = time.perf_counter()
+        store.listing.page(number, PAGE_SIZE)
+        print(f"{label + ':':27} {(time.perf_counter() - start) * 1e6:.1f} µs")
+
+    product = store.listing.page(1, PAGE_SIZE)[0][0][0]
+    product.price += 1
+    start = time.perf_counter()
+    store.listing.page(1, PAGE_SIZE)
+    print(f"{'page 1 after a price change:':27} {(time.perf_counter() - start) * 1e6:.1f} µs")
+
+    start = time.perf_counter()
+    store.listing.page(1, PAGE_SIZE, search="product 99999")
+    print(f"first search (one scan):    {time.perf_counter() - start:.4f}s")
+    start = time.perf_counter()
+    store.listing.page(2, PAGE_SIZE, search="product 99999")
+    print(f"{'next search page:':27} {(time.perf_counter() - start) * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
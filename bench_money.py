@@ -0,0 +1,89 @@
+"""
+Benchmark order totals in integer cents against float and decimal.Decimal arithmetic.
+
+All three variants price the same order lines with the same promotions:
+  float    the float formulas the promotions used before (price / 2, percent / 100)
+  cents    Product._cents_for, the integer path behind Product.buy and Store.order
+  decimal  the same formulas on Decimal, rounded half to even per line
+
+Run with: python bench_money.py [number_of_lines]
+"""
+import random
+import sys
+import time
+from decimal import Decimal, ROUND_HALF_EVEN
+
+from money import from_cents
+from products import Product
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+
+PROMOTIONS = [None, PercentDiscount(30), SecondHalfPrice(), ThirdOneFree()]
+CENT = Decimal("0.01")
+
+
+def float_line(price: float, promotion, quantity: int) -> float:
+    """Price a line with the float formulas the promotions used before."""
+    if promotion is None:
+        return price * quantity
+    if isinstance(promotion, PercentDiscount):
+        total = price * quantity
+        return total - total * (promotion.percent / 100)
+    if isinstance(promotion, SecondHalfPrice):
+        return quantity // 2 * (price + price / 2) + quantity % 2 * price
+    return quantity // 3 * (2 * price) + quantity % 3 * price
+
+
+def decimal_line(price: Decimal, promotion, quantity: int) -> Decimal:
+    """Price a line on Decimal, rounding half to even to a whole cent."""
+    if promotion is None:
+        total = price * quantity
+    elif isinstance(promotion, PercentDiscount):
+        total = price * quantity * (100 - Decimal(str(promotion.percent))) / 100
+    elif isinstance(promotion, SecondHalfPrice):
+        total = price * (3 * (quantity // 2) + 2 * (quantity % 2)) / 2
+    else:
+        total = price * (2 * (quantity // 3) + quantity % 3)
+    return total.quantize(CENT, rounding=ROUND_HALF_EVEN)
+
+
+def run(count: int = 1_000_000) -> None:
+    """Time the three variants on the same lines and compare their totals."""
+    rng = random.Random(42)
+    products = []
+    for index in range(1000):
+        product = Product(f"Product {index}", rng.randint(1, 200_000) / 100, 1)
+        product.promotion = PROMOTIONS[index % len(PROMOTIONS)]
+        products.append(product)
+    lines = [(rng.choice(products), rng.randint(1, 20)) for _ in range(count)]
+    float_lines = [(product.price, product.promotion, quantity) for product, quantity in lines]
+    decimal_lines = [(Decimal(str(product.price)), product.promotion, quantity) for product, quantity in lines]
+
+    start = time.perf_counter()
+    float_total = 0.0
+    for price, promotion, quantity in float_lines:
+        float_total += float_line(price, promotion, quantity)
+    float_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cents_total = 0
+    for product, quantity in lines:
+        cents_total += product._cents_for(quantity)
+    cents_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decimal_total = Decimal(0)
+    for price, promotion, quantity in decimal_lines:
+        decimal_total += decimal_line(price, promotion, quantity)
+    decimal_seconds = time.perf_counter() - start
+
+    print(f"lines: {count}")
+    print(f"float:   {float_seconds:.3f}s  total {float_total:.6f}")
+    print(f"cents:   {cents_seconds:.3f}s  total {from_cents(cents_total):.6f}")
+    print(f"decimal: {decimal_seconds:.3f}s  total {decimal_total}")
+    print(f"cents vs float:   {float_seconds / cents_seconds:.2f}x")
+    print(f"cents vs decimal: {decimal_seconds / cents_seconds:.2f}x")
+    print(f"cents total matches decimal: {Decimal(cents_total) / 100 == decimal_total}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
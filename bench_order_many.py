@@ -0,0 +1,60 @@
+"""
+Benchmark Store.order_many against looping Store.order over the same orders.
+
+Run with: python bench_order_many.py [number_of_orders]
+"""
+import random
+import sys
+import time
+
+from products import Product
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+from store import Store
+
+
+def build_store(product_count: int) -> Store:
+    """Build a store with plenty of stock and a mix of promotions."""
+    promotions = [None, PercentDiscount(30), SecondHalfPrice(), ThirdOneFree()]
+    products = []
+    for idx in range(product_count):
+        product = Product(f"Product {idx}", 10 + idx % 90, 10_000_000)
+        product.promotion = promotions[idx % len(promotions)]
+        products.append(product)
+    return Store(products)
+
+
+def build_orders(store: Store, order_count: int, lines_per_order: int, seed: int = 42) -> list:
+    """Build shopping lists that draw from a small set of popular products."""
+    rng = random.Random(seed)
+    products = store.list_of_products
+    orders = []
+    for _ in range(order_count):
+        orders.append([(rng.choice(products), rng.randint(1, 3)) for _ in range(lines_per_order)])
+    return orders
+
+
+def run(order_count: int = 100_000, product_count: int = 50, lines_per_order: int = 3) -> None:
+    """Time both code paths on identical stores and orders and print the speedup."""
+    loop_store = build_store(product_count)
+    loop_orders = build_orders(loop_store, order_count, lines_per_order)
+    start = time.perf_counter()
+    loop_totals = [loop_store.order(shopping_list) for shopping_list in loop_orders]
+    loop_seconds = time.perf_counter() - start
+
+    batch_store = build_store(product_count)
+    batch_orders = build_orders(batch_store, order_count, lines_per_order)
+    start = time.perf_counter()
+    batch_totals, failures = batch_store.order_many(batch_orders)
+    batch_seconds = time.perf_counter() - start
+
+    assert not failures
+    assert batch_totals == loop_totals
+    assert batch_store.get_total_quantity() == loop_store.get_total_quantity()
+    print(f"orders: {order_count}, products: {product_count}, lines per order: {lines_per_order}")
+    print(f"loop order(): {loop_seconds:.3f}s ({order_count / loop_seconds:,.0f} orders/s)")
+    print(f"order_many(): {batch_seconds:.3f}s ({order_count / batch_seconds:,.0f} orders/s)")
+    print(f"speedup: {loop_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,53 @@
+"""
+Benchmark product construction through the validating constructors against the trusted paths.
+
+  constructor  Product(...) / LimitedProduct(...), every field checked, then stored directly
+  from_trusted Product.from_trusted(...), fields stored directly, no validation
+  columns      products_from_columns(...), every column validated once, then from_trusted
+
+One product in ten is a LimitedProduct.
+
+Run with: python bench_product_construction.py [number_of_products]
+"""
+import random
+import sys
+import time
+
+from products import Product, LimitedProduct, products_from_columns, np
+
+
+def run(count: int = 1_000_000) -> None:
+    """Build the same products with each path and print the time per product."""
+    rng = random.Random(42)
+    names = [f"Product {index}" for index in range(count)]
+    prices = [rng.randint(1, 200_000) / 100 for _ in range(count)]
+    quantities = [rng.randint(0, 500) for _ in range(count)]
+    maximums = [rng.randint(1, 5) if index % 10 == 0 else 0 for index in range(count)]
+    rows = list(zip(names, prices, quantities, maximums))
+
+    def constructor():
+        return [LimitedProduct(name, price, quantity, maximum) if maximum else Product(name, price, quantity)
+                for name, price, quantity, maximum in rows]
+
+    def from_trusted():
+        return [LimitedProduct.from_trusted(name, price, quantity, maximum) if maximum
+                else Product.from_trusted(name, price, quantity)
+                for name, price, quantity, maximum in rows]
+
+    def columns():
+        return products_from_columns(names, prices, quantities, maximums)
+
+    print(f"products: {count}  (NumPy {'available' if np is not None else 'not installed'})")
+    baseline = None
+    for label, build in (("constructor", constructor), ("from_trusted", from_trusted), ("columns", columns)):
+        start = time.perf_counter()
+        products = build()
+        seconds = time.perf_counter() - start
+        assert len(products) == count
+        del products
+        baseline = baseline or seconds
+        print(f"{label:13} {seconds:.3f}s  {seconds / count * 1e9:6.0f} ns/product  {baseline / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,67 @@
+"""
+Benchmark memory use and attribute access time of the __slots__ product classes.
+
+The comparison classes are built from the same methods and properties without
+__slots__, which reproduces the previous per-instance __dict__ layout.
+
+Run with: python bench_product_memory.py [number_of_products]
+"""
+import sys
+import time
+import tracemalloc
+
+from products import Product
+
+
+def without_slots(cls):
+    """
+    Return a copy of a product class whose instances store attributes in a __dict__.
+
+    Only classes that do not call super() can be copied this way.
+    """
+    hidden = set(cls.__dict__.get("__slots__", ())) | {"__slots__", "__dict__", "__weakref__"}
+    namespace = {key: value for key, value in vars(cls).items() if key not in hidden}
+    return type(f"Dict{cls.__name__}", (), namespace)
+
+
+def measure_memory(factory, count: int) -> int:
+    """Return the bytes allocated while building ``count`` products."""
+    tracemalloc.start()
+    products = [factory(idx) for idx in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del products
+    return current
+
+
+def measure_access(products: list, repeat: int = 9) -> float:
+    """Return the best time to read price, quantity and active of every product."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for product in products:
+            product.price
+            product.quantity
+            product.active
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(count: int = 200_000) -> None:
+    """Print bytes per product and access time for both layouts."""
+    dict_product = without_slots(Product)
+    layouts = [
+        ("Product (__dict__)", lambda idx: dict_product(f"Product {idx}", 10.5, idx + 1)),
+        ("Product (__slots__)", lambda idx: Product(f"Product {idx}", 10.5, idx + 1)),
+    ]
+    print(f"products: {count}")
+    for label, factory in layouts:
+        memory = measure_memory(factory, count)
+        products = [factory(idx) for idx in range(count)]
+        access = measure_access(products)
+        print(f"{label:28} {memory / count:7.1f} bytes/product  "
+              f"access: {access / count * 1e9:6.1f} ns/product")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
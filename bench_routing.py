@@ -0,0 +1,62 @@
+"""
+Benchmark order routing over many locations.
+
+Every product is stocked in a random subset of the locations. Each strategy
+routes the same order lines; the naive variant scans and sorts every location
+for every line, as a single stock table without indexes would.
+
+Run with: python bench_routing.py [number_of_locations] [number_of_lines]
+"""
+import random
+import sys
+import time
+
+from products import Product
+from locations import Location, Inventory, LargestStockFirst, NearestFirst
+
+
+def naive_route(inventory: Inventory, product, quantity: int, destination) -> list:
+    """Sort all locations by distance and take from those that hold the product."""
+    lines = []
+    ranked = sorted(inventory.locations.values(), key=lambda location: location.distance_to(destination))
+    for location in ranked:
+        held = inventory._by_location[location.name].get(product, 0)
+        if held:
+            taken = min(held, quantity)
+            lines.append((location.name, taken))
+            quantity -= taken
+            if not quantity:
+                break
+    return lines
+
+
+def run(location_count: int = 500, line_count: int = 20_000) -> None:
+    """Time routing with the indexed strategies and with a full scan."""
+    rng = random.Random(42)
+    locations = [Location(f"Site {index}", rng.uniform(0, 1000), rng.uniform(0, 1000))
+                 for index in range(location_count)]
+    inventory = Inventory(locations)
+    products = [Product(f"Product {index}", 10, 1) for index in range(1000)]
+    for product in products:
+        for location in rng.sample(locations, rng.randint(5, location_count // 4)):
+            inventory.set_stock(product, location.name, rng.randint(1, 20))
+    lines = [(rng.choice(products), rng.randint(1, 30), (rng.uniform(0, 1000), rng.uniform(0, 1000)))
+             for _ in range(line_count)]
+
+    print(f"locations: {location_count}  lines: {line_count}")
+    for label, strategy in (("largest stock first", LargestStockFirst()), ("nearest first", NearestFirst())):
+        start = time.perf_counter()
+        for product, quantity, destination in lines:
+            inventory.route({product: min(quantity, product.quantity)}, destination, strategy)
+        seconds = time.perf_counter() - start
+        print(f"{label:22} {seconds / line_count * 1e6:8.1f} us/line")
+    start = time.perf_counter()
+    for product, quantity, destination in lines:
+        naive_route(inventory, product, min(quantity, product.quantity), destination)
+    seconds = time.perf_counter() - start
+    print(f"{'nearest, full scan':22} {seconds / line_count * 1e6:8.1f} us/line")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20_000)
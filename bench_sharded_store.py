@@ -0,0 +1,60 @@
+"""
+Benchmark order throughput of the sharded store at 1, 2, 4 and 8 shard processes.
+
+Most orders touch a single product, so they are batched per shard; the rest span
+shards and go through the two-phase commit. Scaling requires as many free cores
+as shard processes.
+
+Run with: python bench_sharded_store.py [number_of_orders] [batch_size]
+"""
+import os
+import random
+import sys
+import time
+
+from products import Product
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+from sharded_store import ShardedStore
+
+
+def build_products(count: int = 10_000) -> list:
+    """Build a catalog with plenty of stock and a mix of promotions."""
+    promotions = [None, PercentDiscount(30), SecondHalfPrice(), ThirdOneFree()]
+    products = []
+    for idx in range(count):
+        product = Product(f"Product {idx}", 10 + idx % 90, 10**9)
+        product.promotion = promotions[idx % len(promotions)]
+        products.append(product)
+    return products
+
+
+def build_orders(names: list, count: int, spanning_ratio: float = 0.05, seed: int = 42) -> list:
+    """Build mostly single-product orders with a share of multi-product orders."""
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(count):
+        lines = 3 if rng.random() < spanning_ratio else 1
+        orders.append([(rng.choice(names), rng.randint(1, 3)) for _ in range(lines)])
+    return orders
+
+
+def run(order_count: int = 200_000, batch_size: int = 10_000) -> None:
+    """Time the same orders at each shard count and print orders per second."""
+    products = build_products()
+    orders = build_orders([product.name for product in products], order_count)
+    print(f"orders: {order_count}, batch size: {batch_size}, cores: {os.cpu_count()}")
+    baseline = None
+    for processes in (1, 2, 4, 8):
+        with ShardedStore(products, processes=processes) as sharded:
+            start = time.perf_counter()
+            for offset in range(0, order_count, batch_size):
+                sharded.order_many(orders[offset:offset + batch_size])
+            elapsed = time.perf_counter() - start
+        throughput = order_count / elapsed
+        baseline = baseline or throughput
+        print(f"{processes} processes: {elapsed:.2f}s ({throughput:,.0f} orders/s, {throughput / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    arguments = [int(value) for value in sys.argv[1:]]
+    run(*arguments)
@@ -0,0 +1,141 @@
+"""
+Benchmark suite for the store, product and promotion hot paths.
+
+Every case reports the best time per operation over several repeats. Results can
+be written as JSON and compared against a saved baseline; the run fails with exit
+status 1 when a case is slower than the baseline by more than the tolerance.
+
+Usage:
+    python bench_suite.py [--quick] [--output results.json]
+                          [--baseline baseline.json] [--tolerance 0.25] [--filter text]
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+
+from products import Product, LimitedProduct
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+from store import Store
+
+UNLIMITED = 10**15
+PROMOTIONS = {
+    "none": None,
+    "percent_discount": PercentDiscount(30),
+    "second_half_price": SecondHalfPrice(),
+    "third_one_free": ThirdOneFree(),
+}
+
+
+def build_store(size: int) -> Store:
+    """Build a store with ``size`` products, one in ten of them inactive."""
+    products = [Product(f"Product {idx}", 10 + idx % 90, UNLIMITED) for idx in range(size)]
+    for product in products[::10]:
+        product.active = False
+    return Store(products)
+
+
+def product_cases() -> dict:
+    """Return the Product construction and purchase cases."""
+    cases = {"product_init": lambda: Product("MacBook Air M2", 1450, 100)}
+    for label, promotion in PROMOTIONS.items():
+        product = Product(f"Buy {label}", 250, UNLIMITED)
+        product.promotion = promotion
+        cases[f"product_buy[{label}]"] = lambda product=product: product.buy(3)
+    limited = LimitedProduct("Exclusive Sneakers", 150, UNLIMITED, maximum=2)
+    cases["limited_product_buy"] = lambda: limited.buy(2)
+    return cases
+
+
+def order_cases() -> dict:
+    """Return the Store.order cases at several cart sizes."""
+    cases = {}
+    store = build_store(1000)
+    products = store.get_all_products()
+    for cart_size in (1, 10, 100):
+        shopping_list = [(products[idx], 1) for idx in range(cart_size)]
+        cases[f"store_order[cart={cart_size}]"] = lambda shopping_list=shopping_list: store.order(shopping_list)
+    return cases
+
+
+def listing_cases(quick: bool) -> dict:
+    """Return the listing and aggregate cases at several catalog sizes."""
+    cases = {}
+    sizes = (10, 1000, 100_000) if quick else (10, 1000, 100_000, 1_000_000)
+    for size in sizes:
+        store = build_store(size)
+        cases[f"get_all_products[n={size}]"] = store.get_all_products
+        cases[f"get_total_quantity[n={size}]"] = store.get_total_quantity
+    return cases
+
+
+def time_case(function, repeat: int = 5) -> float:
+    """Return the best time per call of a function in seconds."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_cases(quick: bool, name_filter: str = "") -> dict:
+    """Run every case whose name contains ``name_filter`` and return ns per operation."""
+    results = {}
+    for group in (product_cases, order_cases, lambda: listing_cases(quick)):
+        for name, function in group().items():
+            if name_filter in name:
+                results[name] = time_case(function) * 1e9
+                print(f"{name:40} {results[name]:14,.1f} ns/op")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results (dict): ns per operation of the current run.
+        baseline (dict): ns per operation of the baseline run.
+        tolerance (float): The allowed relative slowdown, for example 0.25 for 25%.
+
+    Returns:
+        list: The names of the cases that regressed beyond the tolerance.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = current / previous - 1
+        marker = "REGRESSION" if change > tolerance else ""
+        print(f"{name:40} {previous:14,.1f} -> {current:14,.1f} ns/op ({change:+.1%}) {marker}")
+        if change > tolerance:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    """Parse arguments, run the suite and return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="skip the 10^6 catalog size")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    arguments = parser.parse_args(argv)
+
+    results = run_cases(arguments.quick, arguments.filter)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "unit": "ns/op", "results": results}, file, indent=2)
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, arguments.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed by more than {arguments.tolerance:.0%}.")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
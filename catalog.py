@@ -0,0 +1,207 @@
+import math
+import threading
+from contextlib import nullcontext
+
+
+class Catalog:
+    """
+    Indexed collection of products keyed by product name.
+
+    The catalog keeps a name index for O(1) lookup and removal, and an
+    active-products view that is updated incrementally whenever a product's
+    ``active`` flag changes, so listing never scans inactive products.
+
+    Running inventory aggregates (total quantity, total reserved quantity and total
+    stock value at list price) are updated from the same change notifications.
+
+    ``version`` is incremented whenever the set of active products or a product
+    name changes, so views built from the catalog know when to rebuild. Secondary
+    indexes can follow additions and removals with add_listener.
+    """
+    def __init__(self, products=(), thread_safe: bool = False):
+        """
+        Initialize the catalog with an optional iterable of products.
+
+        Args:
+            products (iterable): Product instances to index.
+            thread_safe (bool): Whether to guard the indexes and aggregates with a lock.
+
+        Raises:
+            ValueError: If two products share the same name.
+        """
+        self._lock = threading.Lock() if thread_safe else nullcontext()
+        # Only thread-safe catalogs pay for entering a lock on every product change.
+        self._observer = self._on_locked_product_change if thread_safe else self._on_product_change
+        self._by_name = {}
+        self._active = {}
+        self._listeners = ()
+        self.version = 0
+        self.total_quantity = 0
+        self.total_reserved = 0
+        self.total_value = 0
+        for product in products:
+            self.add(product)
+
+    @property
+    def active_count(self) -> int:
+        """int: The number of active products."""
+        return len(self._active)
+
+    @property
+    def inactive_count(self) -> int:
+        """int: The number of inactive products."""
+        return len(self._by_name) - len(self._active)
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __iter__(self):
+        return iter(self._by_name.values())
+
+    def __contains__(self, product):
+        return self._by_name.get(getattr(product, "name", None)) is product
+
+    def add(self, product):
+        """
+        Index a product and start tracking its changes.
+
+        Args:
+            product (Product): The product instance to add.
+
+        Raises:
+            ValueError: If a product with the same name is already in the catalog.
+        """
+        with self._lock:
+            if product.name in self._by_name:
+                raise ValueError(f"Product {product.name} is already in the store.")
+            self._by_name[product.name] = product
+            self.version += 1
+            if product.active:
+                self._active[product.name] = product
+            self.total_quantity += product.quantity
+            self.total_reserved += product.reserved
+            self.total_value += product.price * product.quantity
+        product.add_observer(self._observer)
+        for listener in self._listeners:
+            listener("add", product)
+
+    def remove(self, product):
+        """
+        Remove a product from the catalog and stop tracking its changes.
+
+        Args:
+            product (Product): The product instance to remove.
+
+        Raises:
+            ValueError: If the product is not in the catalog.
+        """
+        with self._lock:
+            if product not in self:
+                raise ValueError("Product not found in the store.")
+            del self._by_name[product.name]
+            self._active.pop(product.name, None)
+            self.version += 1
+            self.total_quantity -= product.quantity
+            self.total_reserved -= product.reserved
+            self.total_value -= product.price * product.quantity
+        product.remove_observer(self._observer)
+        for listener in self._listeners:
+            listener("remove", product)
+
+    def add_listener(self, callback):
+        """
+        Register a callback that is invoked after a product is added or removed.
+
+        The callback is called as ``callback(event, product)`` with event "add" or "remove".
+
+        Args:
+            callback (callable): The function to notify.
+        """
+        self._listeners += (callback,)
+
+    def get(self, name):
+        """
+        Look up a product by name.
+
+        Args:
+            name (str): The product's name.
+
+        Returns:
+            Product or None: The matching product, or None if it is not in the catalog.
+        """
+        return self._by_name.get(name)
+
+    def active_products(self) -> list:
+        """
+        Return the active products without scanning the inactive ones.
+
+        Products that are reactivated are listed after the products that stayed active.
+
+        Returns:
+            list: A list of active Product instances.
+        """
+        with self._lock:
+            return list(self._active.values())
+
+    def verify_aggregates(self) -> bool:
+        """
+        Check the running aggregates against a full recompute over all products.
+
+        Returns:
+            bool: True if the aggregates are consistent.
+
+        Raises:
+            AssertionError: If any aggregate differs from the recomputed value.
+        """
+        total_quantity = sum(product.quantity for product in self)
+        total_reserved = sum(product.reserved for product in self)
+        total_value = sum(product.price * product.quantity for product in self)
+        active_count = sum(1 for product in self if product.active)
+        if total_quantity != self.total_quantity:
+            raise AssertionError(
+                f"Total quantity is {self.total_quantity}, recomputed {total_quantity}."
+            )
+        if total_reserved != self.total_reserved:
+            raise AssertionError(
+                f"Total reserved is {self.total_reserved}, recomputed {total_reserved}."
+            )
+        if not math.isclose(total_value, self.total_value, rel_tol=1e-9, abs_tol=1e-6):
+            raise AssertionError(
+                f"Total value is {self.total_value}, recomputed {total_value}."
+            )
+        if active_count != self.active_count:
+            raise AssertionError(
+                f"Active count is {self.active_count}, recomputed {active_count}."
+            )
+        return True
+
+    def _on_locked_product_change(self, product, field, old_value, new_value):
+        """Apply a product change under the catalog lock; the observer of thread-safe catalogs."""
+        with self._lock:
+            self._on_product_change(product, field, old_value, new_value)
+
+    def _on_product_change(self, product, field, old_value, new_value):
+        """Keep the indexes, the active view and the aggregates in sync with product changes."""
+        if field == "quantity":
+            delta = new_value - old_value
+            self.total_quantity += delta
+            self.total_value += product.price * delta
+        elif field == "reserved":
+            self.total_reserved += new_value - old_value
+        elif field == "price":
+            self.total_value += (new_value - old_value) * product.quantity
+        elif field == "active":
+            self.version += 1
+            if new_value:
+                self._active[product.name] = product
+            else:
+                self._active.pop(product.name, None)
+        elif field == "name":
+            if new_value in self._by_name:
+                product._name = old_value
+                raise ValueError(f"Product {new_value} is already in the store.")
+            del self._by_name[old_value]
+            self._by_name[new_value] = product
+            self.version += 1
+            if self._active.pop(old_value, None) is not None:
+                self._active[new_value] = product
@@ -0,0 +1,373 @@
+import mmap
+import os
+import struct
+from array import array
+from itertools import compress
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; column scans fall back to Python builtins.
+    np = None
+
+from products import Product, NonStockedProduct, LimitedProduct
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+
+# File layout, all little-endian:
+#   header: magic, format version, product count, journal sequence number
+#   float64 prices, int64 quantities, int64 maximums, float64 promotion parameters,
+#   int64 name offsets (count + 1), uint8 product kinds, uint8 promotion kinds,
+#   uint8 active flags, padding to 8 bytes, UTF-8 names.
+# Every column starts on an 8-byte boundary, so the file can be memory-mapped and
+# its columns read in place.
+MAGIC = b"BBCATLG\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sIxxxxQQ")
+
+PRODUCT_KINDS = (Product, NonStockedProduct, LimitedProduct)
+PROMOTION_KINDS = (None, PercentDiscount, SecondHalfPrice, ThirdOneFree)
+
+
+def column_offsets(count: int) -> dict:
+    """
+    Compute where each column of a catalog file with ``count`` products starts.
+
+    Args:
+        count (int): The number of products in the file.
+
+    Returns:
+        dict: The byte offset of every column, and of the names blob under "names".
+    """
+    offsets = {}
+    position = HEADER.size
+    for column, item_size, length in (
+        ("prices", 8, count),
+        ("quantities", 8, count),
+        ("maximums", 8, count),
+        ("promotion_params", 8, count),
+        ("name_offsets", 8, count + 1),
+        ("kinds", 1, count),
+        ("promotion_kinds", 1, count),
+        ("active", 1, count),
+    ):
+        offsets[column] = position
+        position += item_size * length
+    offsets["names"] = (position + 7) // 8 * 8
+    return offsets
+
+
+def write_catalog(path: str, products, seq: int = 0):
+    """
+    Write products to a columnar catalog file, atomically replacing any existing file.
+
+    Args:
+        path (str): The file to write.
+        products (iterable): The products to store.
+        seq (int): The journal sequence number the catalog is consistent with.
+
+    Raises:
+        TypeError: If a product or promotion type cannot be stored.
+    """
+    prices = array("d")
+    quantities = array("q")
+    maximums = array("q")
+    promotion_params = array("d")
+    name_offsets = array("q", [0])
+    kinds = bytearray()
+    promotion_kinds = bytearray()
+    active = bytearray()
+    names = bytearray()
+    for product in products:
+        kind = type(product)
+        if kind not in PRODUCT_KINDS:
+            raise TypeError(f"Cannot store product type {kind.__name__}.")
+        promotion_kind = type(product.promotion) if product.promotion is not None else None
+        if promotion_kind not in PROMOTION_KINDS:
+            raise TypeError(f"Cannot store promotion type {promotion_kind.__name__}.")
+        prices.append(product.price)
+        quantities.append(product.quantity)
+        maximums.append(product.maximum if kind is LimitedProduct else 0)
+        promotion_params.append(product.promotion.percent if promotion_kind is PercentDiscount else 0.0)
+        names += product.name.encode("utf-8")
+        name_offsets.append(len(names))
+        kinds.append(PRODUCT_KINDS.index(kind))
+        promotion_kinds.append(PROMOTION_KINDS.index(promotion_kind))
+        active.append(product.active)
+    count = len(prices)
+    offsets = column_offsets(count)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, count, seq))
+        for column in (prices, quantities, maximums, promotion_params, name_offsets):
+            file.write(column.tobytes())
+        file.write(kinds)
+        file.write(promotion_kinds)
+        file.write(active)
+        file.write(b"\x00" * (offsets["names"] - file.tell()))
+        file.write(names)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def read_header(buffer) -> tuple:
+    """
+    Parse and check the header of a catalog file.
+
+    Args:
+        buffer (bytes-like): The file contents, or at least its header.
+
+    Returns:
+        tuple: The product count and the journal sequence number.
+
+    Raises:
+        ValueError: If the buffer is not a supported catalog file.
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError("Catalog file is truncated.")
+    magic, version, count, seq = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a catalog file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported catalog file version {version}.")
+    return count, seq
+
+
+def read_columns(buffer) -> tuple:
+    """
+    Expose the columns of a catalog file as typed memoryviews without copying.
+
+    Args:
+        buffer (bytes-like): The file contents, for example an mmap.
+
+    Returns:
+        tuple: The product count, the journal sequence number and a dict of columns.
+
+    Raises:
+        ValueError: If the buffer is not a supported catalog file.
+    """
+    count, seq = read_header(buffer)
+    offsets = column_offsets(count)
+    view = memoryview(buffer)
+    columns = {}
+    for column, fmt in (("prices", "d"), ("quantities", "q"), ("maximums", "q"),
+                        ("promotion_params", "d"), ("name_offsets", "q")):
+        length = count + 1 if column == "name_offsets" else count
+        start = offsets[column]
+        columns[column] = view[start:start + 8 * length].cast(fmt)
+    for column in ("kinds", "promotion_kinds", "active"):
+        start = offsets[column]
+        columns[column] = view[start:start + count]
+    columns["names"] = view[offsets["names"]:]
+    if len(columns["names"]) < columns["name_offsets"][count]:
+        raise ValueError("Catalog file is truncated.")
+    return count, seq, columns
+
+
+def build_product(columns: dict, index: int):
+    """
+    Materialize the product stored at ``index`` in a set of catalog columns.
+
+    Args:
+        columns (dict): The columns returned by read_columns.
+        index (int): The position of the product in the file.
+
+    Returns:
+        Product: The product instance.
+    """
+    offsets = columns["name_offsets"]
+    name = bytes(columns["names"][offsets[index]:offsets[index + 1]]).decode("utf-8")
+    kind = PRODUCT_KINDS[columns["kinds"][index]]
+    price = columns["prices"][index]
+    if price.is_integer():
+        price = int(price)  # Prices are stored as float64; keep whole prices as ints.
+    if kind is NonStockedProduct:
+        product = NonStockedProduct(name, price)
+    elif kind is LimitedProduct:
+        product = LimitedProduct(name, price, columns["quantities"][index], columns["maximums"][index])
+    else:
+        product = Product(name, price, columns["quantities"][index])
+    product.active = bool(columns["active"][index])
+    promotion_kind = PROMOTION_KINDS[columns["promotion_kinds"][index]]
+    if promotion_kind is PercentDiscount:
+        product.promotion = PercentDiscount(columns["promotion_params"][index])
+    elif promotion_kind is not None:
+        product.promotion = promotion_kind()
+    return product
+
+
+def read_catalog(path: str) -> tuple:
+    """
+    Load every product of a catalog file.
+
+    Args:
+        path (str): The file to read.
+
+    Returns:
+        tuple: The list of products and the journal sequence number.
+
+    Raises:
+        ValueError: If the file is not a supported catalog file.
+    """
+    with open(path, "rb") as file:
+        buffer = file.read()
+    count, seq, columns = read_columns(buffer)
+    products = [build_product(columns, index) for index in range(count)]
+    for column in columns.values():
+        column.release()
+    return products, seq
+
+
+class MappedCatalog:
+    """
+    Read a catalog file through a memory map and materialize products lazily.
+
+    Opening a MappedCatalog only maps the file and parses its header, so startup
+    time does not depend on the number of products. Product objects are built on
+    first access. Total quantity and active-product filtering run directly over the
+    mapped columns. The map is private copy-on-write: changes to materialized products
+    are written back to the mapped columns, so column scans stay exact, but the file
+    on disk is never modified.
+    """
+    def __init__(self, path: str):
+        """
+        Map a catalog file.
+
+        Args:
+            path (str): The catalog file written by write_catalog.
+
+        Raises:
+            ValueError: If the file is not a supported catalog file.
+        """
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        try:
+            self.count, self.seq, self._columns = read_columns(self._map)
+        except ValueError:
+            self._map.close()
+            raise
+        self._products = {}
+        self._index_of = {}
+        self._index_by_name = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int):
+        """
+        Return the product at a position, materializing it on first access.
+
+        Args:
+            index (int): The position of the product in the file.
+
+        Returns:
+            Product: The product instance; repeated calls return the same object.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("Catalog index out of range.")
+        product = self._products.get(index)
+        if product is None:
+            product = build_product(self._columns, index)
+            self._products[index] = product
+            self._index_of[product] = index
+            product.add_observer(self._on_product_change)
+        return product
+
+    def __iter__(self):
+        return (self[index] for index in range(self.count))
+
+    @property
+    def materialized_count(self) -> int:
+        """int: The number of products built so far."""
+        return len(self._products)
+
+    def get_product(self, name: str):
+        """
+        Look up a product by name; the name index is built on the first lookup.
+
+        Args:
+            name (str): The product's name.
+
+        Returns:
+            Product or None: The matching product, or None if it is not in the catalog.
+        """
+        if self._index_by_name is None:
+            offsets = self._columns["name_offsets"]
+            names = bytes(self._columns["names"][:offsets[self.count]])
+            self._index_by_name = {
+                names[offsets[index]:offsets[index + 1]].decode("utf-8"): index
+                for index in range(self.count)
+            }
+        index = self._index_by_name.get(name)
+        return None if index is None else self[index]
+
+    def get_total_quantity(self) -> int:
+        """
+        Sum the quantity column without materializing any product.
+
+        Returns:
+            int: The total quantity of all products.
+        """
+        quantities = self._columns["quantities"]
+        if np is not None:
+            return int(np.frombuffer(quantities, dtype=np.int64).sum())
+        return sum(quantities)
+
+    def active_indices(self) -> list:
+        """
+        Return the positions of the active products by scanning the active column.
+
+        Returns:
+            list: The indexes of active products in file order.
+        """
+        active = self._columns["active"]
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(active, dtype=np.uint8)).tolist()
+        return list(compress(range(self.count), active))
+
+    def get_all_products(self) -> list:
+        """
+        Return the active products, materializing only those.
+
+        Returns:
+            list: A list of active Product instances.
+        """
+        return [self[index] for index in self.active_indices()]
+
+    def close(self):
+        """
+        Stop following the materialized products, release the mapped columns and unmap the file.
+
+        Materialized products stay usable after closing; their changes are simply no
+        longer written to the columns.
+        """
+        if self._map.closed:
+            return
+        for product in self._products.values():
+            product.remove_observer(self._on_product_change)
+        for column in self._columns.values():
+            column.release()
+        self._map.close()
+
+    def _on_product_change(self, product, field, old_value, new_value):
+        """Write changes of materialized products back into the mapped columns."""
+        index = self._index_of[product]
+        if field == "quantity":
+            self._columns["quantities"][index] = new_value
+        elif field == "active":
+            self._columns["active"][index] = int(new_value)
+        elif field == "price":
+            self._columns["prices"][index] = float(new_value)
+        elif field == "name" and self._index_by_name is not None:
+            del self._index_by_name[old_value]
+            self._index_by_name[new_value] = index
@@ -0,0 +1,216 @@
+import re
+import threading
+from bisect import bisect_left, insort
+from math import isqrt
+
+from money import to_cents
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# A query word whose matching tokens index more products than this is always checked
+# product by product instead of being resolved through the posting sets.
+BROAD_TERM_LIMIT = 10_000
+
+
+def tokenize(text: str) -> list:
+    """
+    Split a text into case-folded word tokens.
+
+    Args:
+        text (str): The text to split, for example a product name.
+
+    Returns:
+        list: The tokens in order of appearance.
+    """
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+class CatalogIndex:
+    """
+    Secondary indexes over a Catalog for name search and price filtering.
+
+    The name index maps every token of every product name to the set of products
+    whose name contains it; a sorted list of the distinct tokens turns a prefix into
+    a contiguous range of tokens. The price index is a list of (price in cents,
+    name, product) entries sorted by price, so a price range is found by bisection.
+
+    The in-stock index is the set of active products with available stock. The
+    in-stock filter intersects it with the name matches, or walks it instead of the
+    price range when it is the smaller side, so a mostly sold-out catalog is not
+    scanned product by product.
+
+    The indexes follow the catalog: additions and removals through its listeners,
+    renames, price and stock changes through product observers.
+    """
+    def __init__(self, catalog):
+        """
+        Build the indexes for every product of a catalog and start following it.
+
+        Args:
+            catalog (Catalog): The catalog to index.
+        """
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._in_stock = set()
+        for product in catalog:
+            for token in set(tokenize(product.name)):
+                self._postings.setdefault(token, set()).add(product)
+            if product.active and product.available > 0:
+                self._in_stock.add(product)
+            product.add_observer(self._on_product_change)
+        self._tokens = sorted(self._postings)
+        self._by_price = sorted((product.price_cents, product.name, product) for product in catalog)
+        catalog.add_listener(self._on_catalog_change)
+
+    def query(self, text: str = "", min_price: float = None, max_price: float = None,
+              in_stock: bool = False, page: int = 1, size: int = 20) -> tuple:
+        """
+        Find products by name prefix, price range and stock.
+
+        Every word of ``text`` must be a prefix of a word of the product name,
+        ignoring case. Results are ordered by price, then by name.
+
+        Args:
+            text (str): The search words; empty to match every product.
+            min_price (float or None): The lowest price to include.
+            max_price (float or None): The highest price to include.
+            in_stock (bool): Whether to include only active products with available stock.
+            page (int): The page number, starting at 1.
+            size (int): The number of products per page.
+
+        Returns:
+            tuple: The list of products on the page and whether more pages follow.
+
+        Raises:
+            ValueError: If the page number or size is not positive.
+        """
+        if page <= 0 or size <= 0:
+            raise ValueError("Page number and size must be positive.")
+        low = to_cents(min_price) if min_price is not None else None
+        high = to_cents(max_price) if max_price is not None else None
+        skip = (page - 1) * size
+        with self._lock:
+            by_price = self._by_price
+            start = bisect_left(by_price, (low,)) if low is not None else 0
+            stop = bisect_left(by_price, (high + 1,)) if high is not None else len(by_price)
+            # Collecting a word's products costs about their number m; walking the price
+            # range costs about (skip + size) * range / m until the page is full. The
+            # posting sets win while m * m stays below (skip + size) * range.
+            limit = min(BROAD_TERM_LIMIT, isqrt((skip + size) * (stop - start)))
+            candidates = None
+            broad_terms = []
+            for term in set(tokenize(text)):
+                matches = self._term_matches(term, limit)
+                if matches is None:
+                    broad_terms.append(term)
+                else:
+                    candidates = matches if candidates is None else candidates & matches
+            stocked = self._in_stock
+            if in_stock:
+                if candidates is not None:
+                    candidates = candidates & stocked
+                elif len(stocked) <= limit:
+                    candidates = set(stocked)  # Fewer products in stock than the range walk would visit.
+
+            def accepted(product):
+                if in_stock and product not in stocked:
+                    return False
+                if broad_terms:
+                    tokens = tokenize(product.name)
+                    return all(any(token.startswith(term) for token in tokens) for term in broad_terms)
+                return True
+
+            if candidates is not None:
+                # Selective words: filter and sort the few candidates.
+                results = sorted(
+                    (product for product in candidates
+                     if (low is None or product.price_cents >= low)
+                     and (high is None or product.price_cents <= high) and accepted(product)),
+                    key=lambda product: (product.price_cents, product.name),
+                )
+                return results[skip:skip + size], len(results) > skip + size
+
+            # No selective word: walk the price range in order until the page is full.
+            results = []
+            for index in range(start, stop):
+                product = by_price[index][2]
+                if accepted(product):
+                    if skip:
+                        skip -= 1
+                        continue
+                    results.append(product)
+                    if len(results) > size:
+                        break
+            return results[:size], len(results) > size
+
+    def _term_matches(self, term: str, limit: int):
+        """Return the products with a name token starting with ``term``, or None if there are more than ``limit``."""
+        tokens = self._tokens
+        matches = set()
+        total = 0
+        for index in range(bisect_left(tokens, term), len(tokens)):
+            token = tokens[index]
+            if not token.startswith(term):
+                break
+            posting = self._postings[token]
+            total += len(posting)
+            if total > limit:
+                return None
+            matches |= posting
+        return matches
+
+    def _add_name(self, product, name: str):
+        """Add a product to the postings of the tokens of a name."""
+        for token in set(tokenize(name)):
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = {product}
+                insort(self._tokens, token)
+            else:
+                posting.add(product)
+
+    def _remove_name(self, product, name: str):
+        """Remove a product from the postings of the tokens of a name."""
+        for token in set(tokenize(name)):
+            posting = self._postings[token]
+            posting.discard(product)
+            if not posting:
+                del self._postings[token]
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def _remove_price(self, price_cents: int, name: str):
+        """Remove the price entry with the given key."""
+        del self._by_price[bisect_left(self._by_price, (price_cents, name))]
+
+    def _on_catalog_change(self, event: str, product):
+        """Index added products and drop removed ones."""
+        with self._lock:
+            if event == "add":
+                self._add_name(product, product.name)
+                insort(self._by_price, (product.price_cents, product.name, product))
+                if product.active and product.available > 0:
+                    self._in_stock.add(product)
+                product.add_observer(self._on_product_change)
+            elif event == "remove":
+                self._remove_name(product, product.name)
+                self._remove_price(product.price_cents, product.name)
+                self._in_stock.discard(product)
+                product.remove_observer(self._on_product_change)
+
+    def _on_product_change(self, product, field, old_value, new_value):
+        """Track a product's stock state and reindex it when its name or price changed."""
+        if field == "quantity" or field == "reserved" or field == "active":
+            # A single set operation, atomic without taking the index lock on every purchase.
+            if product._active and product._quantity > product._reserved:
+                self._in_stock.add(product)
+            else:
+                self._in_stock.discard(product)
+        elif field == "name":
+            with self._lock:
+                self._remove_name(product, old_value)
+                self._add_name(product, new_value)
+                self._remove_price(product.price_cents, old_value)
+                insort(self._by_price, (product.price_cents, new_value, product))
+        elif field == "price":
+            with self._lock:
+                self._remove_price(to_cents(old_value), product.name)
+                insort(self._by_price, (product.price_cents, product.name, product))
@@ -0,0 +1,210 @@
+import csv
+import json
+
+from products import product_to_dict, product_from_dict
+
+CSV_FIELDS = ["type", "name", "price", "quantity", "active", "maximum", "promotion", "percent"]
+
+
+def _parse_number(value: str, field: str):
+    """Parse an int or, failing that, a float from a CSV cell."""
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"Invalid {field} {value!r}.") from None
+
+
+def _parse_int(value: str, field: str) -> int:
+    """Parse an int from a CSV cell."""
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {field} {value!r}.") from None
+
+
+def csv_row_to_dict(row: dict) -> dict:
+    """
+    Convert a CSV row into the dict accepted by product_from_dict.
+
+    Args:
+        row (dict): A row read by csv.DictReader with the CSV_FIELDS columns.
+
+    Returns:
+        dict: The product type, fields and promotion.
+
+    Raises:
+        ValueError: If a cell cannot be parsed.
+    """
+    data = {
+        "type": row.get("type") or "Product",
+        "name": row.get("name") or "",
+        "price": _parse_number(row.get("price") or "", "price"),
+    }
+    if row.get("quantity"):
+        data["quantity"] = _parse_int(row["quantity"], "quantity")
+    if row.get("active"):
+        active = row["active"].strip().lower()
+        if active not in ("true", "false"):
+            raise ValueError(f"Invalid active {row['active']!r}.")
+        data["active"] = active == "true"
+    if row.get("maximum"):
+        data["maximum"] = _parse_int(row["maximum"], "maximum")
+    if row.get("promotion"):
+        data["promotion"] = {"type": row["promotion"]}
+        if row.get("percent"):
+            data["promotion"]["percent"] = _parse_number(row["percent"], "percent")
+    return data
+
+
+def dict_to_csv_row(data: dict) -> dict:
+    """
+    Convert a product dict into a CSV row with the CSV_FIELDS columns.
+
+    Args:
+        data (dict): A dict produced by product_to_dict.
+
+    Returns:
+        dict: The CSV row.
+    """
+    promotion = data.get("promotion") or {}
+    return {
+        "type": data["type"],
+        "name": data["name"],
+        "price": data["price"],
+        "quantity": data["quantity"],
+        "active": "true" if data["active"] else "false",
+        "maximum": data.get("maximum", ""),
+        "promotion": promotion.get("type", ""),
+        "percent": promotion.get("percent", ""),
+    }
+
+
+def _read_chunks(rows, to_dict, chunk_size: int):
+    """Validate numbered rows into products and yield them chunk by chunk."""
+    products, errors = [], []
+    for row_number, row in rows:
+        try:
+            products.append((row_number, product_from_dict(to_dict(row))))
+        except (TypeError, ValueError) as error:
+            errors.append((row_number, str(error)))
+        if len(products) + len(errors) >= chunk_size:
+            yield products, errors
+            products, errors = [], []
+    if products or errors:
+        yield products, errors
+
+
+def read_products_csv(file, chunk_size: int = 10_000):
+    """
+    Stream products from a CSV file in chunks.
+
+    Only one chunk of rows is held in memory at a time. Invalid rows are reported
+    with their row number (the header is row 1) instead of stopping the import.
+
+    Args:
+        file (file object): An open text file with a CSV_FIELDS header row.
+        chunk_size (int): The number of rows per chunk.
+
+    Yields:
+        tuple: The valid (row number, product) pairs of the chunk and a list of
+        (row number, error message) pairs.
+    """
+    rows = enumerate(csv.DictReader(file), start=2)
+    return _read_chunks(rows, csv_row_to_dict, chunk_size)
+
+
+def read_products_jsonl(file, chunk_size: int = 10_000):
+    """
+    Stream products from a JSON Lines file in chunks.
+
+    Each line holds one object in the format of product_to_dict. Blank lines are
+    skipped, and invalid lines are reported with their line number.
+
+    Args:
+        file (file object): An open text file.
+        chunk_size (int): The number of lines per chunk.
+
+    Yields:
+        tuple: The valid (line number, product) pairs of the chunk and a list of
+        (line number, error message) pairs.
+    """
+    def parse(line: str) -> dict:
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Invalid JSON: {error.msg}.") from None
+        if not isinstance(data, dict):
+            raise ValueError("Each line must hold a JSON object.")
+        return data
+
+    rows = ((line_number, line) for line_number, line in enumerate(file, start=1) if line.strip())
+    return _read_chunks(rows, parse, chunk_size)
+
+
+def import_products(store, chunks, max_errors: int = 1000) -> dict:
+    """
+    Add streamed products to a store chunk by chunk, without printing per product.
+
+    Products whose name is already in the store, or earlier in the input, are
+    reported as row errors.
+
+    Args:
+        store (Store): The store to add the products to.
+        chunks (iterable): Chunks from read_products_csv or read_products_jsonl.
+        max_errors (int): The number of error messages kept; further errors are only counted.
+
+    Returns:
+        dict: The number of imported products, the number of errors and up to
+        ``max_errors`` (row number, error message) tuples.
+    """
+    report = {"imported": 0, "error_count": 0, "errors": []}
+
+    def add_error(row_number, message):
+        report["error_count"] += 1
+        if len(report["errors"]) < max_errors:
+            report["errors"].append((row_number, message))
+
+    for products, errors in chunks:
+        for row_number, message in errors:
+            add_error(row_number, message)
+        accepted, names = [], set()
+        for row_number, product in products:
+            if product.name in names or store.get_product(product.name) is not None:
+                add_error(row_number, f"Product {product.name} is already in the store.")
+                continue
+            names.add(product.name)
+            accepted.append(product)
+        store.add_products(accepted)
+        report["imported"] += len(accepted)
+    return report
+
+
+def write_products_csv(products, file):
+    """
+    Write products to a CSV file one row at a time.
+
+    Args:
+        products (iterable): The products to export.
+        file (file object): An open text file, opened with newline="".
+    """
+    writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for product in products:
+        writer.writerow(dict_to_csv_row(product_to_dict(product)))
+
+
+def write_products_jsonl(products, file):
+    """
+    Write products to a JSON Lines file one line at a time.
+
+    Args:
+        products (iterable): The products to export.
+        file (file object): An open text file.
+    """
+    for product in products:
+        file.write(json.dumps(product_to_dict(product), separators=(",", ":")))
+        file.write("\n")
@@ -0,0 +1,35 @@
+import pytest
+from reservations import ReservationBook
+from store import Store
+
+
+class FakeClock:
+    """A clock that stands still until a test sets ``now``."""
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_store(clock):
+    """
+    Return a factory of stores whose reservations run on the test's clock.
+
+    The factory takes the list of products, the thread_safe flag and any store
+    attributes to set afterwards, such as inventory or rules.
+    """
+    def make(products, thread_safe=False, **attributes):
+        store = Store(products, thread_safe=thread_safe)
+        store.reservations = ReservationBook(clock=clock)
+        for name, value in attributes.items():
+            setattr(store, name, value)
+        return store
+
+    return make
@@ -0,0 +1,251 @@
+import threading
+
+# Event kinds. Field changes carry the old and the new value; additions and removals carry None.
+ADDED = "added"
+REMOVED = "removed"
+STOCK_CHANGED = "stock_changed"
+DEACTIVATED = "deactivated"
+ACTIVATED = "activated"
+PRICE_CHANGED = "price_changed"
+PROMOTION_CHANGED = "promotion_changed"
+RENAMED = "renamed"
+
+FIELD_EVENTS = {
+    "quantity": STOCK_CHANGED,
+    "price": PRICE_CHANGED,
+    "promotion": PROMOTION_CHANGED,
+    "name": RENAMED,
+}
+
+
+class ChangeEvent:
+    """
+    One change of a catalog, numbered in the order the changes happened.
+
+    Attributes:
+        seq (int): The event's sequence number; the first event of a feed is 1.
+        kind (str): One of the event kinds defined in this module.
+        product (Product): The product that changed.
+        name (str): The product's name when the event happened; the new name for RENAMED.
+        old_value: The field's previous value, or None for ADDED and REMOVED.
+        new_value: The field's new value, or None for ADDED and REMOVED.
+    """
+    __slots__ = ("seq", "kind", "product", "name", "old_value", "new_value")
+
+    def __init__(self, seq: int, kind: str, product, name: str, old_value=None, new_value=None):
+        self.seq = seq
+        self.kind = kind
+        self.product = product
+        self.name = name
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def __repr__(self):
+        return f"ChangeEvent({self.seq}, {self.kind!r}, {self.name!r}, {self.old_value!r}, {self.new_value!r})"
+
+
+class Subscription:
+    """
+    A subscriber of a ChangeFeed and the sequence number of the last event delivered to it.
+
+    Attributes:
+        callback (callable): The function the events are delivered to.
+        cursor (int): The sequence number of the last event delivered.
+        errors (int): The number of deliveries whose callback raised an exception.
+        last_error (Exception or None): The exception raised by the latest failed delivery.
+    """
+    __slots__ = ("callback", "cursor", "errors", "last_error")
+
+    def __init__(self, callback, cursor: int):
+        self.callback = callback
+        self.cursor = cursor
+        self.errors = 0
+        self.last_error = None
+
+
+class ChangeFeed:
+    """
+    A numbered log of the changes of a catalog's products, with batched delivery.
+
+    The feed follows additions and removals through the catalog's listeners and
+    field changes through product observers, and records each change as a
+    ChangeEvent with the next sequence number. Recording an event only appends it
+    to a list, inside the product setter that caused it; nothing is delivered from
+    there. Subscribers receive the pending events in lists of up to ``batch_size``
+    when flush() is called, which Store does after each operation that changes
+    products, once its product locks are released. An exception raised by a
+    subscriber is counted on its Subscription and does not reach the store or the
+    other subscribers.
+
+    The most recent ``capacity`` events are retained, so a consumer that stored the
+    sequence number of the last event it processed can catch up with
+    events_since() or by subscribing from that cursor, instead of re-reading the
+    whole catalog. Only changes made after the feed was created are recorded.
+    """
+    def __init__(self, catalog, batch_size: int = 100, capacity: int = 100_000):
+        """
+        Start recording the changes of a catalog.
+
+        Args:
+            catalog (Catalog): The catalog to follow.
+            batch_size (int): The largest number of events delivered in one call.
+            capacity (int): The number of recent events retained for catching up.
+
+        Raises:
+            ValueError: If the batch size or capacity is not positive, or the capacity
+                is smaller than the batch size.
+        """
+        if batch_size <= 0 or capacity < batch_size:
+            raise ValueError("Batch size must be positive and no larger than the capacity.")
+        self.batch_size = batch_size
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._delivering = threading.Lock()
+        self._events = []
+        self._dropped = 0
+        self._subscriptions = ()
+        self._delivered = 0
+        for product in catalog:
+            product.add_observer(self._on_product_change)
+        catalog.add_listener(self._on_catalog_change)
+
+    @property
+    def last_seq(self) -> int:
+        """int: The sequence number of the latest event, 0 before the first one."""
+        return self._dropped + len(self._events)
+
+    def events_since(self, cursor: int, limit: int = None) -> list:
+        """
+        Return the retained events that follow a sequence number.
+
+        Args:
+            cursor (int): The sequence number of the last event already processed; 0 for all.
+            limit (int or None): The largest number of events to return.
+
+        Returns:
+            list: The ChangeEvent instances after ``cursor``, oldest first.
+
+        Raises:
+            ValueError: If events after the cursor are no longer retained, or the cursor
+                is ahead of the feed.
+        """
+        with self._lock:
+            return self._slice(cursor, limit)
+
+    def subscribe(self, callback, cursor: int = None) -> Subscription:
+        """
+        Register a callback that receives lists of events.
+
+        The callback is called from flush() as ``callback(events)`` with the events in
+        order. It may change products; the events it causes are delivered after the
+        current batch. Exceptions it raises are recorded on the Subscription, and the
+        events of that batch count as delivered.
+
+        Args:
+            callback (callable): The function to deliver the events to.
+            cursor (int or None): Deliver the events after this sequence number first;
+                None to receive only events that happen from now on.
+
+        Returns:
+            Subscription: The subscription, whose ``cursor`` is the last delivered event.
+
+        Raises:
+            ValueError: If events after the cursor are no longer retained.
+        """
+        with self._lock:
+            if cursor is None:
+                cursor = self.last_seq
+            self._slice(cursor, 0)
+            subscription = Subscription(callback, cursor)
+            self._subscriptions += (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """
+        Stop delivering events to a subscription.
+
+        Args:
+            subscription (Subscription): The subscription returned by subscribe().
+
+        Raises:
+            ValueError: If the subscription is not registered.
+        """
+        with self._lock:
+            if subscription not in self._subscriptions:
+                raise ValueError("Subscription is not registered.")
+            self._subscriptions = tuple(item for item in self._subscriptions if item is not subscription)
+
+    def flush(self):
+        """
+        Deliver every pending event to the subscribers.
+
+        If another call is already delivering, in this thread or another one, that
+        call delivers the pending events instead and this one returns at once.
+        """
+        if not self._subscriptions or self._delivered == self.last_seq:
+            return
+        while self._delivering.acquire(blocking=False):
+            try:
+                while True:
+                    with self._lock:
+                        self._delivered = self.last_seq
+                        batches = []
+                        for subscription in self._subscriptions:
+                            events = self._slice(subscription.cursor, self.batch_size)
+                            if events:
+                                subscription.cursor = events[-1].seq
+                                batches.append((subscription, events))
+                    if not batches:
+                        break
+                    for subscription, events in batches:
+                        try:
+                            subscription.callback(events)
+                        except Exception as error:  # A failing subscriber must not affect the others.
+                            subscription.errors += 1
+                            subscription.last_error = error
+            finally:
+                self._delivering.release()
+            # Events recorded by another thread after the last check are delivered here.
+            if self._delivered == self.last_seq:
+                break
+
+    def _slice(self, cursor: int, limit) -> list:
+        """Return up to ``limit`` events after a cursor; the caller holds the lock."""
+        start = cursor - self._dropped
+        if start < 0:
+            raise ValueError(f"Events after {cursor} are no longer retained; reload the catalog.")
+        if start > len(self._events):
+            raise ValueError(f"Sequence number {cursor} is ahead of the feed.")
+        return self._events[start:] if limit is None else self._events[start:start + limit]
+
+    def _record(self, kind: str, product, name: str, old_value=None, new_value=None):
+        """Append an event; it is delivered by the next flush()."""
+        with self._lock:
+            events = self._events
+            events.append(ChangeEvent(self._dropped + len(events) + 1, kind, product, name, old_value, new_value))
+            if len(events) >= 2 * self.capacity:
+                # Trim in large steps, but never past an event a subscriber still has to receive.
+                keep_from = min([self._dropped + len(events) - self.capacity]
+                                + [subscription.cursor for subscription in self._subscriptions])
+                drop = keep_from - self._dropped
+                if drop > 0:
+                    del events[:drop]
+                    self._dropped += drop
+
+    def _on_catalog_change(self, event: str, product):
+        """Record additions and removals and follow the added products."""
+        if event == "add":
+            product.add_observer(self._on_product_change)
+            self._record(ADDED, product, product.name)
+        elif event == "remove":
+            product.remove_observer(self._on_product_change)
+            self._record(REMOVED, product, product.name)
+
+    def _on_product_change(self, product, field, old_value, new_value):
+        """Record a product field change as a typed event."""
+        if field == "active":
+            self._record(ACTIVATED if new_value else DEACTIVATED, product, product.name, old_value, new_value)
+            return
+        kind = FIELD_EVENTS.get(field)
+        if kind is not None:
+            self._record(kind, product, product.name, old_value, new_value)
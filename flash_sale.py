@@ -0,0 +1,286 @@
+import threading
+import time
+from collections import deque
+
+from products import InsufficientStockError, PurchaseLimitError
+
+
+class SoldOutError(InsufficientStockError):
+    """Raised when a flash sale has no stock left for a purchase."""
+
+
+class CustomerLimitError(PurchaseLimitError):
+    """Raised when a purchase would take a customer over a flash sale's per-customer limit."""
+
+
+class SaleClosedError(ValueError):
+    """Raised when a purchase is made outside a flash sale's time window."""
+
+
+class StockCounter:
+    """
+    A fixed stock counted down in shards.
+
+    The stock is split evenly over the shards, each with its own lock, so buyers
+    that start at different shards do not contend. A buyer whose shard runs dry
+    locks every shard, in index order, and takes the rest from the others; holding
+    all of them makes the check and the take one step, so concurrent buyers cannot
+    each hold part of the stock and reject one another. Once every shard is empty
+    the ``exhausted`` flag is set, under all the locks; put_back() clears it under
+    its shard's lock. The flag is read without a lock, so rejecting buyers after a
+    sell-out costs a single attribute read.
+    """
+    def __init__(self, total: int, shards: int = 16):
+        """
+        Initialize the counter.
+
+        Args:
+            total (int): The stock to count down.
+            shards (int): The number of shards.
+
+        Raises:
+            ValueError: If the total is negative or the number of shards is not positive.
+        """
+        if total < 0:
+            raise ValueError("Total should not be negative.")
+        if shards <= 0:
+            raise ValueError("Shards must be positive.")
+        self._counts = [total // shards + (index < total % shards) for index in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self.exhausted = total == 0
+
+    @property
+    def remaining(self) -> int:
+        """int: The stock left over all shards."""
+        return sum(self._counts)
+
+    def take(self, quantity: int, shard: int = 0) -> bool:
+        """
+        Take a quantity from the stock, starting at a given shard.
+
+        Args:
+            quantity (int): The quantity to take; positive.
+            shard (int): The shard to try first, for example derived from the buyer.
+
+        Returns:
+            bool: True if the whole quantity was taken, False if the stock is too low;
+            nothing is taken in that case.
+        """
+        if self.exhausted:
+            return False
+        shards = len(self._counts)
+        shard %= shards
+        with self._locks[shard]:
+            if self._counts[shard] >= quantity:
+                self._counts[shard] -= quantity
+                return True
+        # The own shard is short: lock every shard and gather the quantity only if the total covers it.
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            counts = self._counts
+            if sum(counts) < quantity:
+                if not any(counts):
+                    self.exhausted = True
+                return False
+            needed = quantity
+            for offset in range(shards):
+                index = (shard + offset) % shards
+                part = min(counts[index], needed)
+                counts[index] -= part
+                needed -= part
+                if not needed:
+                    return True
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def put_back(self, quantity: int, shard: int = 0):
+        """
+        Return a quantity to the stock, for example after a purchase failed.
+
+        Args:
+            quantity (int): The quantity to return.
+            shard (int): The shard to return it to.
+        """
+        shard %= len(self._counts)
+        with self._locks[shard]:
+            self._counts[shard] += quantity
+            self.exhausted = False
+
+
+class FairLock:
+    """
+    A lock granted in the order it was requested.
+
+    Waiters queue up in FIFO order and the lock is handed directly from the
+    releasing thread to the longest waiter, so no thread can overtake another.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self._held = False
+
+    def __enter__(self):
+        with self._lock:
+            if not self._held:
+                self._held = True
+                return self
+            waiter = threading.Lock()
+            waiter.acquire()
+            self._waiters.append(waiter)
+        waiter.acquire()  # Blocks until the previous holder hands the lock over.
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().release()
+            else:
+                self._held = False
+
+
+class FlashSale:
+    """
+    A time-bounded sale of a fixed stock of one product to many concurrent buyers.
+
+    Opening the sale moves its stock out of the product's available quantity with
+    Store.allocate, so regular orders cannot take it. Each purchase then goes
+    through these steps:
+
+      1. the time window and a lock-free sold-out flag, which rejects buyers at
+         once after the sale's stock is gone;
+      2. the per-customer limit over all of the customer's purchases in the sale,
+         kept in sharded tallies;
+      3. a fair lock, the admission queue, which lets buyers in one at a time and
+         in the order they reached it;
+      4. inside the queue, the sharded stock counter claims the quantity and
+         Store.commit buys it from the sale's reservation.
+
+    Because the claim is made after admission, stock goes to buyers strictly in
+    arrival order: a later buyer can neither take the last units ahead of an
+    earlier one nor overtake it at the store. The counter's shards therefore do
+    not spread contention on the claim; what keeps the crowd out of the queue is
+    the counter's lock-free exhausted flag, read in step 1, which turns every
+    buyer away once the stock is gone. Buyers already queued at that point are
+    rejected at the counter when their turn comes.
+
+    Stock that is not sold when the sale is closed returns to the product.
+    """
+    def __init__(self, store, product, quantity: int, per_customer: int, starts_at: float, ends_at: float,
+                 shards: int = 16, clock=time.time):
+        """
+        Initialize a flash sale; call open() to allocate its stock.
+
+        Args:
+            store (Store): The store that sells the product.
+            product (Product): The product on sale.
+            quantity (int): The stock sold in the sale.
+            per_customer (int): The most a customer may buy over the whole sale.
+            starts_at (float): The clock time the sale starts.
+            ends_at (float): The clock time the sale ends.
+            shards (int): The number of shards of the stock counter and customer tallies.
+            clock (callable): Returns the current time, in the unit of starts_at and ends_at.
+
+        Raises:
+            ValueError: If the quantity or per-customer limit is not positive, or the sale
+                ends before it starts.
+        """
+        if quantity <= 0 or per_customer <= 0:
+            raise ValueError("Quantity and per-customer limit must be positive.")
+        if ends_at <= starts_at:
+            raise ValueError("A flash sale must end after it starts.")
+        self.store = store
+        self.product = product
+        self.quantity = quantity
+        self.per_customer = per_customer
+        self.starts_at = starts_at
+        self.ends_at = ends_at
+        self._clock = clock
+        self._counter = StockCounter(quantity, shards)
+        self._tallies = [{} for _ in range(shards)]
+        self._tally_locks = [threading.Lock() for _ in range(shards)]
+        self._admission = FairLock()
+        self._reservation = None
+        self.sold = 0
+
+    @property
+    def remaining(self) -> int:
+        """int: The sale's stock that is not claimed by a purchase."""
+        return self._counter.remaining
+
+    def open(self):
+        """
+        Allocate the sale's stock from the product, holding it until the sale ends.
+
+        Raises:
+            ValueError: If the sale is already open or the product has less available stock.
+        """
+        if self._reservation is not None:
+            raise ValueError("The flash sale is already open.")
+        ttl = max(self.ends_at - self._clock(), 0) + 1
+        self._reservation = self.store.allocate(self.product, self.quantity, ttl)
+
+    def close(self) -> int:
+        """
+        Return the unsold stock to the product.
+
+        Returns:
+            int: The number of units sold.
+        """
+        with self._admission:
+            if self._reservation is not None:
+                self.store.release(self._reservation)
+                self._reservation = None
+        return self.sold
+
+    def buy(self, customer, quantity: int = 1) -> float:
+        """
+        Buy from the sale on behalf of a customer.
+
+        Args:
+            customer (hashable): The customer's identifier.
+            quantity (int): The quantity to buy.
+
+        Returns:
+            float: The total price for the purchase.
+
+        Raises:
+            SaleClosedError: If the sale is not open or outside its time window.
+            SoldOutError: If the sale's stock is gone.
+            CustomerLimitError: If the customer would exceed the per-customer limit.
+            ValueError: If the quantity is not positive or exceeds the product's per-order limit.
+        """
+        now = self._clock()
+        reservation = self._reservation
+        if reservation is None or not self.starts_at <= now < self.ends_at:
+            raise SaleClosedError("The flash sale is not running.")
+        counter = self._counter
+        if counter.exhausted:
+            raise SoldOutError(f"{self.product.name} is sold out.")
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Quantity must be positive.")
+        shard = hash(customer) % len(self._tallies)
+        with self._tally_locks[shard]:
+            tally = self._tallies[shard]
+            bought = tally.get(customer, 0)
+            if bought + quantity > self.per_customer:
+                raise CustomerLimitError(
+                    f"Customer limit of {self.per_customer} reached; {bought} already bought."
+                )
+            tally[customer] = bought + quantity
+        try:
+            with self._admission:
+                if not counter.take(quantity, shard):
+                    raise SoldOutError(f"{self.product.name} is sold out.")
+                try:
+                    total = self.store.commit(reservation, [(self.product, quantity)])
+                except ValueError:
+                    counter.put_back(quantity, shard)
+                    raise
+                self.sold += quantity
+                return total
+        except ValueError:
+            with self._tally_locks[shard]:
+                self._tallies[shard][customer] -= quantity
+            raise
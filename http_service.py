@@ -0,0 +1,271 @@
+"""
+HTTP/JSON front-end of a Store on asyncio streams.
+
+Endpoints:
+  GET  /products?page=1&size=20&search=   one page of the listing of active products
+  POST /quote   {"items": [{"name": ..., "quantity": ...}]}   price a cart without buying it
+  POST /order   {"items": [{"name": ..., "quantity": ...}]}   place an order
+  GET  /stats   the number of orders and of store passes that served them
+
+Responses are JSON objects; errors carry an "error" message. Connections are kept
+alive between requests unless the client sends "Connection: close" or speaks
+HTTP/1.0 without asking for keep-alive.
+"""
+import asyncio
+import json
+from urllib.parse import urlsplit, parse_qs
+
+MAX_BODY = 1 << 20
+MAX_HEADERS = 100
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+ROUTES = {"/products": "GET", "/stats": "GET", "/quote": "POST", "/order": "POST"}
+
+
+class _BadRequest(Exception):
+    """Raised for an invalid request; malformed HTTP also closes the connection after the response."""
+
+    def __init__(self, message: str, status: int = 400, close: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.close = close
+
+
+class OrderService:
+    """
+    Serves a store's listing, quotes and orders over HTTP/1.1 with keep-alive.
+
+    Concurrent order requests are micro-batched: the orders that arrive within
+    ``batch_window`` seconds of the first pending one, up to ``max_batch`` orders,
+    are placed with a single Store.order_many call. order_many validates and commits
+    the grouped demand once per product and applies the orders in arrival order,
+    so each order still succeeds or fails on its own.
+    """
+    def __init__(self, store, max_batch: int = 64, batch_window: float = 0.001):
+        """
+        Initialize the service.
+
+        Args:
+            store (Store): The store that serves the requests.
+            max_batch (int): The largest number of orders placed in one store pass.
+            batch_window (float): The seconds a pending order waits for others to join its batch.
+
+        Raises:
+            ValueError: If max_batch is not positive or batch_window is negative.
+        """
+        if max_batch <= 0:
+            raise ValueError("Max batch must be positive.")
+        if batch_window < 0:
+            raise ValueError("Batch window should not be negative.")
+        self.store = store
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._server = None
+        self._pending = []
+        self._timer = None
+        self._orders = 0
+        self._batches = 0
+        self._largest_batch = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def port(self) -> int:
+        """int: The port the service listens on."""
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Start listening on the running event loop.
+
+        Args:
+            host (str): The address to bind.
+            port (int): The port to bind; 0 picks a free port, see ``port``.
+        """
+        if self._server is None:
+            self._server = await asyncio.start_server(self._serve_connection, host, port)
+
+    async def close(self):
+        """
+        Stop listening and place the orders that are still pending.
+        """
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        self._flush()
+
+    def stats(self) -> dict:
+        """
+        Return the batching statistics.
+
+        Returns:
+            dict: The number of orders, the number of store passes and the largest batch.
+        """
+        return {"orders": self._orders, "batches": self._batches, "largest_batch": self._largest_batch}
+
+    async def _serve_connection(self, reader, writer):
+        """Answer the requests of one connection until it is closed."""
+        try:
+            while True:
+                keep_alive = True
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, keep_alive, body = request
+                    status, payload = await self._dispatch(method, target, body)
+                except _BadRequest as error:
+                    status, payload = error.status, {"error": str(error)}
+                    keep_alive = keep_alive and not error.close
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception:  # Answer instead of dropping the connection without a response.
+                    status, payload = 500, {"error": "Internal server error."}
+                    keep_alive = False
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """Read one request; return (method, target, keep_alive, body) or None at end of stream."""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise _BadRequest("Malformed request line.", close=True) from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise _BadRequest("Too many headers.", close=True)
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _BadRequest("Invalid Content-Length.", close=True) from None
+        if length > MAX_BODY:
+            raise _BadRequest("Request body is too large.", 413, close=True)
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        return method, target, keep_alive, body
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> tuple:
+        """Route a request to its endpoint and return the status and the JSON payload."""
+        url = urlsplit(target)
+        if url.path not in ROUTES:
+            return 404, {"error": f"Unknown path {url.path}."}
+        if method != ROUTES[url.path]:
+            return 405, {"error": f"Use {ROUTES[url.path]} for {url.path}."}
+        if url.path == "/stats":
+            return 200, self.stats()
+        if url.path == "/products":
+            return self._list_products(parse_qs(url.query))
+        shopping_list = self._parse_items(body)
+        try:
+            if url.path == "/quote":
+                total = self.store.quote(shopping_list)
+            else:
+                total = await self._submit_order(shopping_list)
+        except ValueError as error:
+            return 409, {"error": str(error)}
+        return 200, {"total": total}
+
+    def _list_products(self, query: dict) -> tuple:
+        """Serve one page of the store's listing."""
+        try:
+            number = int(query.get("page", ["1"])[0])
+            size = int(query.get("size", ["20"])[0])
+        except ValueError:
+            raise _BadRequest("Page and size must be integers.") from None
+        try:
+            rows, total = self.store.listing.page(number, size, query.get("search", [""])[0])
+        except ValueError as error:
+            raise _BadRequest(str(error)) from None
+        products = [{
+            "name": product.name,
+            "price": product.price,
+            "quantity": product.available,
+            "promotion": product.promotion.name if product.promotion else None,
+        } for product, _ in rows]
+        return 200, {"products": products, "total": total}
+
+    def _parse_items(self, body: bytes) -> list:
+        """Turn the items of a JSON cart into a shopping list of (Product, quantity) tuples."""
+        try:
+            items = json.loads(body)["items"]
+            shopping_list = []
+            for item in items:
+                product = self.store.get_product(item["name"])
+                if product is None:
+                    raise _BadRequest(f"Unknown product {item['name']}.")
+                if item["quantity"].__class__ is not int:
+                    raise _BadRequest("Quantities must be integers.")
+                shopping_list.append((product, item["quantity"]))
+        except (ValueError, KeyError, TypeError):
+            raise _BadRequest('Body must be {"items": [{"name": ..., "quantity": ...}]}.') from None
+        return shopping_list
+
+    def _submit_order(self, shopping_list: list):
+        """Queue an order for the next batch and return a future of its total."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((shopping_list, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self):
+        """
+        Place the pending orders with one store pass and resolve their futures.
+
+        If the store pass itself raises, every order of the batch fails with that error.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            totals, failures = self.store.order_many([shopping_list for shopping_list, _ in batch])
+        except Exception as error:  # Runs from a timer callback; the waiting requests must still get an answer.
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self._orders += len(batch)
+        self._batches += 1
+        self._largest_batch = max(self._largest_batch, len(batch))
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if totals[index] is None:
+                future.set_exception(ValueError(failures[index]))
+            else:
+                future.set_result(totals[index])
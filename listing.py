@@ -0,0 +1,124 @@
+import threading
+from collections import OrderedDict
+
+
+class ProductListing:
+    """
+    Cached, paginated listing of a store's active products.
+
+    Each product's row (the text of Product.show()) is rendered once and kept until
+    one of the product's fields changes; the change notification drops only that
+    row. The ordered list of active products is rebuilt only after the catalog
+    version changes, that is after products are added, removed, activated,
+    deactivated or renamed. Between such changes a page is served by slicing the
+    list and rendering at most the rows on the page, so its cost depends on the
+    page size and not on the size of the catalog.
+
+    Name searches are case-insensitive substring matches. The matches of a search
+    are computed with one scan over the names and cached until the catalog version
+    changes, so paging through the results of a search costs the same as paging
+    through the full listing. Only the most recently used searches are kept, so
+    the cache stays bounded however many distinct searches arrive.
+    """
+    def __init__(self, store, max_searches: int = 256):
+        """
+        Create a listing over a store's active products.
+
+        Args:
+            store (Store): The store to list.
+            max_searches (int): The maximum number of cached search results.
+
+        Raises:
+            ValueError: If max_searches is not positive.
+        """
+        if max_searches <= 0:
+            raise ValueError("Max searches must be positive.")
+        self.store = store
+        self.max_searches = max_searches
+        self._lock = threading.Lock()
+        self._version = None
+        self._products = []
+        self._searches = OrderedDict()
+        self._rows = {}
+
+    def page(self, number: int = 1, size: int = 20, search: str = "") -> tuple:
+        """
+        Return one page of rendered rows.
+
+        Args:
+            number (int): The page number, starting at 1.
+            size (int): The number of rows per page.
+            search (str): Only list products whose name contains this text, ignoring case.
+
+        Returns:
+            tuple: A list of (Product, row) pairs for the page and the total number of
+            matching products.
+
+        Raises:
+            ValueError: If the page number or size is not positive.
+        """
+        if number <= 0 or size <= 0:
+            raise ValueError("Page number and size must be positive.")
+        self.store.reservations.release_expired()
+        with self._lock:
+            products = self._matching(search.casefold())
+            start = (number - 1) * size
+            page = [(product, self._row(product)) for product in products[start:start + size]]
+            return page, len(products)
+
+    def page_count(self, size: int = 20, search: str = "") -> int:
+        """
+        Return the number of pages of a listing.
+
+        Args:
+            size (int): The number of rows per page.
+            search (str): The name filter, as for page().
+
+        Returns:
+            int: The number of pages; 0 if no product matches.
+
+        Raises:
+            ValueError: If the page size is not positive.
+        """
+        if size <= 0:
+            raise ValueError("Page size must be positive.")
+        with self._lock:
+            return -(-len(self._matching(search.casefold())) // size)
+
+    def _matching(self, search: str) -> list:
+        """Return the active products matching a case-folded search, rebuilding stale views."""
+        catalog = self.store.catalog
+        if self._version != catalog.version:
+            self._version = catalog.version
+            self._products = catalog.active_products()
+            self._searches.clear()
+            active = set(self._products)
+            for product in [product for product in self._rows if product not in active]:
+                del self._rows[product]
+                product.remove_observer(self._on_product_change)
+        if not search:
+            return self._products
+        matches = self._searches.get(search)
+        if matches is None:
+            matches = [product for product in self._products if search in product.name.casefold()]
+            self._searches[search] = matches
+            if len(self._searches) > self.max_searches:
+                self._searches.popitem(last=False)
+        else:
+            self._searches.move_to_end(search)
+        return matches
+
+    def _row(self, product) -> str:
+        """Return the cached row of a product, rendering it on a miss."""
+        row = self._rows.get(product)
+        if row is None:
+            if product not in self._rows:
+                product.add_observer(self._on_product_change)
+            row = self._rows[product] = product.show()
+        return row
+
+    def _on_product_change(self, product, field, old_value, new_value):
+        """Drop the rendered row of a product whose fields changed, keeping its registration."""
+        with self._lock:
+            if product in self._rows:
+                self._rows[product] = None
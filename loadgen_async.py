@@ -0,0 +1,61 @@
+"""
+Local load generator for the asyncio store front-end.
+
+Run with: python loadgen_async.py [clients] [seconds] [workers] [max_queue]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from async_store import AsyncStore, percentile
+from products import Product
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+from store import Store
+
+
+def build_store(product_count: int = 100) -> Store:
+    """Build a store with effectively unlimited stock and a mix of promotions."""
+    promotions = [None, PercentDiscount(30), SecondHalfPrice(), ThirdOneFree()]
+    products = []
+    for idx in range(product_count):
+        product = Product(f"Product {idx}", 10 + idx % 90, 10**9)
+        product.promotion = promotions[idx % len(promotions)]
+        products.append(product)
+    return Store(products, thread_safe=True)
+
+
+async def client(front_end: AsyncStore, products: list, deadline: float, latencies: list, seed: int):
+    """Place random orders until the deadline and record client-side latency."""
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        shopping_list = [(rng.choice(products), rng.randint(1, 3)) for _ in range(rng.randint(1, 5))]
+        start = time.perf_counter()
+        await front_end.order(shopping_list)
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(clients: int = 200, seconds: float = 3.0, workers: int = 4, max_queue: int = 100):
+    """Drive the front-end with concurrent clients and print throughput and latency."""
+    store = build_store()
+    products = store.get_all_products()
+    latencies = []
+    async with AsyncStore(store, workers=workers, max_queue=max_queue) as front_end:
+        start = time.perf_counter()
+        deadline = start + seconds
+        await asyncio.gather(*(
+            client(front_end, products, deadline, latencies, seed) for seed in range(clients)
+        ))
+        elapsed = time.perf_counter() - start
+        stats = front_end.stats()
+    print(f"clients: {clients}, workers: {workers}, max queue: {max_queue}")
+    print(f"requests: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:,.0f} req/s)")
+    print(f"client latency p50: {percentile(latencies, 50) * 1000:.2f} ms, "
+          f"p99: {percentile(latencies, 99) * 1000:.2f} ms")
+    print(f"queue latency p50: {stats['latency_p50'] * 1000:.2f} ms, "
+          f"p99: {stats['latency_p99'] * 1000:.2f} ms, max queue depth: {stats['max_queue_depth']}")
+
+
+if __name__ == "__main__":
+    arguments = [int(value) for value in sys.argv[1:]]
+    asyncio.run(run(*arguments))
@@ -0,0 +1,101 @@
+"""
+Local load generator for the HTTP/JSON order service.
+
+Starts the service on the loopback interface in a child process, then drives it
+with concurrent keep-alive connections that each place random orders back to
+back. Prints throughput, client-side tail latency and how the service batched the
+orders. A max_batch of 1 turns micro-batching off, for comparison.
+
+Run with: python loadgen_http.py [connections] [seconds] [max_batch] [batch_window_ms]
+"""
+import asyncio
+import json
+import multiprocessing
+import random
+import sys
+import time
+
+from async_store import percentile
+from http_service import OrderService
+from loadgen_async import build_store
+
+
+def serve(connection, max_batch: int, batch_window: float):
+    """Run the service in this process and send its port through ``connection``."""
+    async def main():
+        async with OrderService(build_store(), max_batch, batch_window) as service:
+            connection.send(service.port)
+            await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+async def request(reader, writer, method: str, path: str, payload=None) -> tuple:
+    """Send one request on a keep-alive connection and return the status and decoded body."""
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(port: int, names: list, deadline: float, latencies: list, seed: int) -> int:
+    """Place random orders on one connection until the deadline; return the number of failures."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    failures = 0
+    try:
+        while time.perf_counter() < deadline:
+            items = [{"name": rng.choice(names), "quantity": rng.randint(1, 3)} for _ in range(rng.randint(1, 5))]
+            start = time.perf_counter()
+            status, _ = await request(reader, writer, "POST", "/order", {"items": items})
+            latencies.append(time.perf_counter() - start)
+            failures += status != 200
+    finally:
+        writer.close()
+    return failures
+
+
+async def run(connections: int = 50, seconds: float = 3.0, max_batch: int = 64, batch_window_ms: float = 1.0):
+    """Start the service, drive it with concurrent connections and print the results."""
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    server = multiprocessing.Process(target=serve, args=(sender, max_batch, batch_window_ms / 1000), daemon=True)
+    server.start()
+    try:
+        port = receiver.recv()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        _, page = await request(reader, writer, "GET", "/products?size=100")
+        names = [product["name"] for product in page["products"]]
+        latencies = []
+        start = time.perf_counter()
+        failures = await asyncio.gather(*(
+            client(port, names, start + seconds, latencies, seed) for seed in range(connections)
+        ))
+        elapsed = time.perf_counter() - start
+        _, stats = await request(reader, writer, "GET", "/stats")
+        writer.close()
+    finally:
+        server.terminate()
+        server.join()
+    print(f"connections: {connections}, max batch: {max_batch}, batch window: {batch_window_ms} ms")
+    print(f"requests: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:,.0f} req/s), "
+          f"failed: {sum(failures)}")
+    print(f"latency p50: {percentile(latencies, 50) * 1000:.2f} ms, "
+          f"p99: {percentile(latencies, 99) * 1000:.2f} ms, "
+          f"p99.9: {percentile(latencies, 99.9) * 1000:.2f} ms")
+    print(f"store passes: {stats['batches']}, "
+          f"orders per pass: {stats['orders'] / max(stats['batches'], 1):.1f} (max {stats['largest_batch']})")
+
+
+if __name__ == "__main__":
+    arguments = [float(value) if index == 3 else int(value) for index, value in enumerate(sys.argv[1:])]
+    asyncio.run(run(*arguments))
@@ -0,0 +1,359 @@
+import heapq
+import math
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from products import InsufficientStockError
+
+
+class Location:
+    """
+    A warehouse or shop that holds stock.
+
+    Attributes:
+        name (str): The location's unique name.
+        x (float): The location's first coordinate, used for distances.
+        y (float): The location's second coordinate, used for distances.
+    """
+    __slots__ = ("name", "x", "y")
+
+    def __init__(self, name: str, x: float = 0.0, y: float = 0.0):
+        """
+        Initialize a location.
+
+        Args:
+            name (str): The location's unique name.
+            x (float): The location's first coordinate.
+            y (float): The location's second coordinate.
+
+        Raises:
+            ValueError: If the name is empty.
+        """
+        if not name:
+            raise ValueError("Location name should not be empty.")
+        self.name = name
+        self.x = x
+        self.y = y
+
+    def distance_to(self, point) -> float:
+        """
+        Return the straight-line distance to a point.
+
+        Args:
+            point (tuple): The (x, y) coordinates of the point.
+
+        Returns:
+            float: The distance.
+        """
+        return math.hypot(self.x - point[0], self.y - point[1])
+
+
+class RoutingStrategy(ABC):
+    """
+    Abstract base class of the rule that decides which locations serve an order line.
+    """
+    @abstractmethod
+    def rank(self, stock: dict, locations: dict, destination=None):
+        """
+        Yield the locations holding a product in the order they should be drawn from.
+
+        Only as many locations as the line needs are taken from the iterator, so
+        strategies should produce them lazily.
+
+        Args:
+            stock (dict): The positive quantity per location name.
+            locations (dict): The Location per location name.
+            destination (tuple or None): The (x, y) coordinates the order is shipped to.
+
+        Returns:
+            iterator: Location names.
+        """
+        pass
+
+
+class LargestStockFirst(RoutingStrategy):
+    """
+    Draws from the locations holding the most stock first, which keeps splits rare.
+    """
+    def rank(self, stock: dict, locations: dict, destination=None):
+        """Yield the locations by descending quantity, ties by name."""
+        heap = [(-quantity, name) for name, quantity in stock.items()]
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)[1]
+
+
+class NearestFirst(RoutingStrategy):
+    """
+    Draws from the locations closest to the destination first.
+
+    Without a destination, locations are ranked by distance to ``origin``, or by
+    descending stock if no origin is set either.
+    """
+    def __init__(self, origin=None):
+        """
+        Initialize the strategy.
+
+        Args:
+            origin (tuple or None): The (x, y) coordinates used when an order has no destination.
+        """
+        self.origin = origin
+
+    def rank(self, stock: dict, locations: dict, destination=None):
+        """Yield the locations by ascending distance, ties by name."""
+        point = destination if destination is not None else self.origin
+        if point is None:
+            yield from LargestStockFirst().rank(stock, locations)
+            return
+        heap = [(locations[name].distance_to(point), name) for name in stock]
+        heapq.heapify(heap)
+        while heap:
+            yield heapq.heappop(heap)[1]
+
+
+class Inventory:
+    """
+    Per-location stock beneath the products of a store.
+
+    The catalog stays shared: names, prices and promotions live on the products,
+    and each tracked product's ``quantity`` is kept equal to the sum of its stock
+    over all locations, so every existing API keeps working on the total.
+
+    Stock is indexed both ways, by product (only the locations that hold it) and by
+    location, so routing a line only looks at the locations holding the product and
+    a heap hands them out in the strategy's order; the cost of a line does not grow
+    with the number of locations that do not stock the product.
+
+    Store.order routes each line with the inventory's strategy and splits it over
+    several locations when needed. Quantity changes made directly through the
+    product API are applied too: decreases are drawn from the largest stocks and
+    increases go to the default location, the first one registered. Stock held by
+    reservations is not tied to a location.
+    """
+    def __init__(self, locations, strategy: RoutingStrategy = None):
+        """
+        Initialize an inventory over a set of locations.
+
+        Args:
+            locations (iterable): The Location instances.
+            strategy (RoutingStrategy or None): The routing used by orders; largest stock first by default.
+
+        Raises:
+            ValueError: If no location is given or two locations share a name.
+        """
+        self._lock = threading.RLock()
+        self._locations = {}
+        self._by_location = {}
+        for location in locations:
+            self.add_location(location)
+        if not self._locations:
+            raise ValueError("An inventory needs at least one location.")
+        self.default_location = next(iter(self._locations))
+        self.strategy = strategy if strategy is not None else LargestStockFirst()
+        self._by_product = {}
+        self._pending = {}
+        self._expected = {}
+
+    @property
+    def locations(self) -> dict:
+        """dict: The Location per location name."""
+        return self._locations
+
+    def add_location(self, location: Location):
+        """
+        Register a location without stock.
+
+        Args:
+            location (Location): The location to add.
+
+        Raises:
+            ValueError: If a location with the same name is already registered.
+        """
+        with self._lock:
+            if location.name in self._locations:
+                raise ValueError(f"Location {location.name} is already registered.")
+            self._locations[location.name] = location
+            self._by_location[location.name] = {}
+
+    def set_stock(self, product, location: str, quantity: int):
+        """
+        Set the stock of a product at one location, reactivating it if its total becomes positive.
+
+        The product is tracked from its first call; its quantity becomes the sum over
+        the locations, so stock it held before being tracked is replaced. This does not
+        take the store's product lock; once the inventory serves a store that takes
+        orders, use Store.set_location_stock instead.
+
+        Args:
+            product (Product): The product.
+            location (str): The location's name.
+            quantity (int): The new quantity at that location.
+
+        Raises:
+            TypeError: If the quantity is not an integer.
+            ValueError: If the quantity is negative or the location is unknown.
+        """
+        if not isinstance(quantity, int):
+            raise TypeError("Quantity must be an integer.")
+        if quantity < 0:
+            raise ValueError("Quantity should not be negative.")
+        with self._lock:
+            if location not in self._locations:
+                raise ValueError(f"Unknown location {location}.")
+            stock = self._by_product.get(product)
+            if stock is None:
+                stock = self._by_product[product] = {}
+                product.add_observer(self._on_product_change)
+            self._put(product, stock, location, quantity)
+            total = sum(stock.values())
+            if product.quantity != total:
+                self._expected[product] = total
+                product.quantity = total
+            if total > 0:
+                product.active = True
+
+    def stock(self, product) -> dict:
+        """
+        Return the stock of a product per location.
+
+        Args:
+            product (Product): The product.
+
+        Returns:
+            dict: The positive quantity per location name.
+        """
+        with self._lock:
+            return dict(self._by_product.get(product, {}))
+
+    def stock_at(self, location: str) -> dict:
+        """
+        Return the stock held at a location.
+
+        Args:
+            location (str): The location's name.
+
+        Returns:
+            dict: The positive quantity per product.
+
+        Raises:
+            ValueError: If the location is unknown.
+        """
+        with self._lock:
+            if location not in self._by_location:
+                raise ValueError(f"Unknown location {location}.")
+            return dict(self._by_location[location])
+
+    def route(self, demand: dict, destination=None, strategy: RoutingStrategy = None) -> dict:
+        """
+        Plan which locations serve each product of an order, without changing stock.
+
+        Args:
+            demand (dict): The quantity per product.
+            destination (tuple or None): The (x, y) coordinates the order is shipped to.
+            strategy (RoutingStrategy or None): The routing to use instead of the inventory's.
+
+        Returns:
+            dict: A list of (location name, quantity) pairs per tracked product; products
+            without per-location stock are left out.
+
+        Raises:
+            InsufficientStockError: If the locations together hold less than a product's demand.
+        """
+        strategy = strategy or self.strategy
+        plan = {}
+        with self._lock:
+            for product, quantity in demand.items():
+                stock = self._by_product.get(product)
+                if stock is None:
+                    continue
+                plan[product] = self._split(product, stock, quantity, strategy, destination)
+        return plan
+
+    @contextmanager
+    def fulfill(self, demand: dict, destination=None):
+        """
+        Route an order and draw the purchases made inside the block from the planned locations.
+
+        Args:
+            demand (dict): The quantity per product.
+            destination (tuple or None): The (x, y) coordinates the order is shipped to.
+
+        Yields:
+            dict: The plan returned by route().
+
+        Raises:
+            InsufficientStockError: If the locations together hold less than a product's
+                demand; nothing is changed in that case.
+        """
+        plan = self.route(demand, destination)
+        with self._lock:
+            for product, lines in plan.items():
+                self._pending[product] = [list(line) for line in lines]
+        try:
+            yield plan
+        finally:
+            with self._lock:
+                for product in plan:
+                    self._pending.pop(product, None)
+
+    def _split(self, product, stock: dict, quantity: int, strategy: RoutingStrategy, destination) -> list:
+        """Take a quantity from a product's locations in the strategy's order."""
+        lines = []
+        remaining = quantity
+        if remaining > 0:
+            for name in strategy.rank(stock, self._locations, destination):
+                taken = min(stock[name], remaining)
+                lines.append((name, taken))
+                remaining -= taken
+                if not remaining:
+                    break
+        if remaining:
+            raise InsufficientStockError(
+                f"Not enough quantity for product {product.name} across locations. "
+                f"Requested: {quantity}, Available: {quantity - remaining}"
+            )
+        return lines
+
+    def _put(self, product, stock: dict, location: str, quantity: int):
+        """Store a product's quantity at a location in both indexes, dropping zero entries."""
+        if quantity:
+            stock[location] = quantity
+            self._by_location[location][product] = quantity
+        else:
+            stock.pop(location, None)
+            self._by_location[location].pop(product, None)
+
+    def _on_product_change(self, product, field, old_value, new_value):
+        """Apply quantity changes made through the product to the locations."""
+        if field != "quantity":
+            return
+        with self._lock:
+            if self._expected.pop(product, None) == new_value:
+                return
+            stock = self._by_product[product]
+            delta = new_value - old_value
+            if delta > 0:
+                location = self.default_location
+                self._put(product, stock, location, stock.get(location, 0) + delta)
+                return
+            needed = -delta
+            # Purchases inside fulfill() take the planned locations first.
+            pending = self._pending.get(product, ())
+            lines = []
+            for line in pending:
+                if not needed:
+                    break
+                taken = min(line[1], needed)
+                if taken:
+                    lines.append((line[0], taken))
+                    line[1] -= taken
+                    needed -= taken
+            if needed:
+                drawn = dict(stock)
+                for location, taken in lines:
+                    drawn[location] -= taken
+                drawn = {location: quantity for location, quantity in drawn.items() if quantity > 0}
+                lines += self._split(product, drawn, needed, LargestStockFirst(), None)
+            for location, taken in lines:
+                self._put(product, stock, location, stock[location] - taken)
@@ -1,8 +1,10 @@
 import sys
 from products import Product, NonStockedProduct, LimitedProduct
-from store import Store
+from persistence import StorePersistence
 from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
 
+RESERVATION_TTL = 15 * 60  # Seconds a shopping list holds its stock while the user is shopping.
+PAGE_SIZE = 20
 
 def quit_program():
     """
@@ -12,17 +14,35 @@ def quit_program():
     sys.exit()
 
 
+def print_page(rows, number):
+    """
+    Print the rows of a listing page, numbered across pages.
+
+    Args:
+        rows (list): The (Product, row) pairs of the page.
+        number (int): The page number, starting at 1.
+    """
+    for idx, (_, row) in enumerate(rows, start=(number - 1) * PAGE_SIZE + 1):
+        print(f"{idx}. {row}")
+
+
 def list_all_products(store_object):
     """
-    Display a numbered list of all active products in the store.
+    Display a numbered list of all active products in the store, page by page.
 
     Args:
         store_object (Store): The store instance containing products.
     """
-    all_products = store_object.get_all_products()
+    number = 1
     print("------")
-    for idx, product in enumerate(all_products, start=1):
-        print(f"{idx}. {product.show()}")
+    while True:
+        rows, total = store_object.listing.page(number, PAGE_SIZE)
+        print_page(rows, number)
+        if number * PAGE_SIZE >= total:
+            break
+        if input(f"Shown {number * PAGE_SIZE} of {total}. Press Enter for more, or q to stop: ") == "q":
+            break
+        number += 1
     print("-----")
 
 
@@ -42,18 +62,23 @@ def get_all_quantity(store_object):
 def wrap_order(store_object):
     """
     Handle the interactive process for placing an order:
-    - Display all active products.
+    - Display the active products matching an optional name search.
     - Prompt user for product selection and quantity.
-    - Build a shopping list and process the order.
+    - Build a shopping list, reserving its stock as products are added.
+    - Commit the reservation as the order.
 
     Args:
         store_object (Store): The store instance to order products from.
     """
-    all_products = store_object.get_all_products()
-    for idx, product in enumerate(all_products, start=1):
-        print(f"{idx}. {product.show()}")
+    search = input("Search products by name (Enter to list all): ").strip()
+    rows, total = store_object.listing.page(1, PAGE_SIZE, search)
+    print_page(rows, 1)
+    if total > len(rows):
+        print(f"Showing {len(rows)} of {total} products. Refine the search to see others.")
+    all_products = [product for product, _ in rows]
 
     shopping_list = []
+    reservation = None
     while True:
         user_choice = input("Which product do you want to buy? (Enter empty to finish): ")
         if not user_choice:
@@ -75,6 +100,23 @@ def wrap_order(store_object):
             print("Please enter a positive quantity. Please try again")
             continue
 
+        # Hold the stock of the whole list, so the order cannot fail for lack of stock later.
+        if reservation is not None:
+            store_object.release(reservation)
+        try:
+            reservation = store_object.reserve(shopping_list + [(chosen_product, quantity)], RESERVATION_TTL)
+        except ValueError as error:
+            print(f"Could not add product: {error}")
+            reservation = None
+            if shopping_list:
+                # Hold the previous list again; its stock may have been bought in the meantime.
+                try:
+                    reservation = store_object.reserve(shopping_list, RESERVATION_TTL)
+                except ValueError as error:
+                    print(f"Your shopping list is no longer available and was emptied: {error}")
+                    shopping_list = []
+            continue
+
         shopping_list.append((chosen_product, quantity))
         print("-------")
         print("Product added to shopping list!")
@@ -82,7 +124,7 @@ def wrap_order(store_object):
 
     if shopping_list:
         try:
-            total_price = store_object.order(shopping_list)
+            total_price = store_object.commit(reservation)
             print("--------")
             print(f"Order placed. Total price is {total_price}€")
             print("--------")
@@ -124,6 +166,9 @@ def start(store_object):
 def main():
     """
     Set up the store with sample products and promotions, then start the CLI.
+
+    The store state is kept in the "store_data" directory, so stock and catalog
+    changes survive a restart; the sample products are only used on the first run.
     """
     # Create a sample product list with various product types.
     product_list = [
@@ -139,8 +184,12 @@ def main():
     product_list[1].promotion = SecondHalfPrice()  # Second item half price for Bose Earbuds
     product_list[2].promotion = ThirdOneFree()  # Buy 2, get 1 free for Google Pixel 7
 
-    store = Store(product_list)
-    start(store)
+    persistence = StorePersistence("store_data")
+    store = persistence.open_store(product_list)
+    try:
+        start(store)
+    finally:
+        persistence.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,328 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from money import from_cents
+from products import Product, LimitedProduct, InsufficientStockError, PurchaseLimitError
+from promotions import Promotion
+from store import Store
+
+# Upper bounds of the latency buckets in seconds: 1 µs doubling up to about 1 s.
+LATENCY_BUCKETS = tuple(1e-6 * 2 ** exponent for exponent in range(21))
+
+
+def rejection_reason(error: Exception) -> str:
+    """
+    Classify why a call was rejected.
+
+    Args:
+        error (Exception): The exception raised by the call.
+
+    Returns:
+        str: "insufficient_stock", "limit_exceeded", "invalid" for other ValueErrors,
+        or the exception's class name.
+    """
+    if isinstance(error, InsufficientStockError):
+        return "insufficient_stock"
+    if isinstance(error, PurchaseLimitError):
+        return "limit_exceeded"
+    if isinstance(error, ValueError):
+        return "invalid"
+    return type(error).__name__
+
+
+class Histogram:
+    """
+    A fixed-bucket histogram in the style of a Prometheus histogram.
+    """
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            bounds (tuple): The ascending upper bounds of the buckets.
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """
+        Add one observation.
+
+        Args:
+            value (float): The observed value.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """
+        Return the cumulative count at each upper bound, ending with +Inf.
+
+        Returns:
+            list: (upper bound, count) pairs; the last bound is float("inf").
+        """
+        result = []
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+
+def _label_value(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    """Format a bucket bound the way Prometheus expects."""
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+class Metrics:
+    """
+    Opt-in instrumentation of order processing, purchases, promotions and listings.
+
+    While disabled, nothing is wrapped and the instrumented methods run unchanged.
+    enable() replaces Store.order, the listing methods, Product.buy_cents (which
+    Product.buy and Store.order go through), LimitedProduct.buy_cents and every concrete
+    Promotion.apply_promotion_cents with timing wrappers; disable()
+    restores the originals. Instrumentation is process-wide: it covers every store
+    and product.
+
+    Collected data:
+        calls: the number of calls per method.
+        latency: a latency Histogram per method.
+        rejections: the number of failed calls per (method, reason), see rejection_reason.
+        discount_cents: the discount in cents granted per promotion name on purchases,
+            relative to list price; ``discounts`` gives it in currency units.
+
+    Trace hooks registered with add_trace_hook are called after every instrumented
+    call with the method name, the duration in seconds and the exception, if any.
+    Nested calls report separately, so an order's time splits into its purchases and
+    their promotion pricing.
+
+    Discounts are accumulated in integer cents and converted only when reported,
+    so their totals do not drift however many purchases are counted.
+    """
+    def __init__(self):
+        """
+        Initialize disabled, empty metrics.
+        """
+        self._lock = threading.Lock()
+        self._originals = {}
+        self._trace_hooks = ()
+        self.reset()
+
+    @property
+    def discounts(self) -> dict:
+        """dict: The discount granted per promotion name on purchases, relative to list price."""
+        with self._lock:
+            return {name: from_cents(cents) for name, cents in self.discount_cents.items()}
+
+    @property
+    def enabled(self) -> bool:
+        """bool: Whether the instrumented methods are currently wrapped."""
+        return bool(self._originals)
+
+    def reset(self):
+        """
+        Clear every collected value.
+        """
+        with self._lock:
+            self.calls = {}
+            self.latency = {}
+            self.rejections = {}
+            self.discount_cents = {}
+
+    def enable(self):
+        """
+        Wrap the instrumented methods. Calling it again has no effect.
+        """
+        with self._lock:
+            if self._originals:
+                return
+            targets = [
+                (Store, "order"),
+                (Store, "get_all_products"),
+                (Store, "get_total_quantity"),
+                (Product, "buy_cents"),
+                (LimitedProduct, "buy_cents"),
+            ]
+            targets += [(cls, "apply_promotion_cents") for cls in _promotion_classes()]
+            for cls, attribute in targets:
+                original = cls.__dict__[attribute]
+                # LimitedProduct.buy_cents delegates to Product.buy_cents, so discounts are taken there only.
+                on_result = self._record_discount if (cls, attribute) == (Product, "buy_cents") else None
+                self._originals[(cls, attribute)] = original
+                setattr(cls, attribute, self._instrument(f"{cls.__name__}.{attribute}", original, on_result))
+
+    def disable(self):
+        """
+        Restore the original methods. Collected values are kept.
+        """
+        with self._lock:
+            for (cls, attribute), original in self._originals.items():
+                setattr(cls, attribute, original)
+            self._originals = {}
+
+    def add_trace_hook(self, hook):
+        """
+        Register a callback for every instrumented call.
+
+        Args:
+            hook (callable): Called as hook(method, duration, error) with the method name,
+                the duration in seconds and the raised exception or None.
+        """
+        with self._lock:
+            self._trace_hooks += (hook,)
+
+    def remove_trace_hook(self, hook):
+        """
+        Unregister a callback added with add_trace_hook.
+
+        Args:
+            hook (callable): The callback to remove.
+        """
+        with self._lock:
+            self._trace_hooks = tuple(registered for registered in self._trace_hooks if registered != hook)
+
+    def snapshot(self) -> dict:
+        """
+        Return the collected values as a JSON-serializable dict.
+
+        Returns:
+            dict: Call counts, latency histograms (cumulative buckets, sum and count),
+            rejections per method and reason, and discounts per promotion.
+        """
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "latency": {
+                    method: {
+                        "buckets": [[_format_bound(bound), count] for bound, count in histogram.cumulative()],
+                        "sum": histogram.sum,
+                        "count": histogram.count,
+                    }
+                    for method, histogram in self.latency.items()
+                },
+                "rejections": {
+                    method: dict(reasons) for method, reasons in self.rejections.items()
+                },
+                "discounts": {name: from_cents(cents) for name, cents in self.discount_cents.items()},
+            }
+
+    def to_json(self) -> str:
+        """
+        Return the snapshot as a JSON document.
+
+        Returns:
+            str: The JSON text.
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Return the collected values in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics text, ending with a newline.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP bestbuy_calls_total Calls of instrumented methods.",
+            "# TYPE bestbuy_calls_total counter",
+        ]
+        for method, count in sorted(snapshot["calls"].items()):
+            lines.append(f'bestbuy_calls_total{{method="{_label_value(method)}"}} {count}')
+        lines += [
+            "# HELP bestbuy_call_duration_seconds Latency of instrumented methods.",
+            "# TYPE bestbuy_call_duration_seconds histogram",
+        ]
+        for method, histogram in sorted(snapshot["latency"].items()):
+            label = _label_value(method)
+            for bound, count in histogram["buckets"]:
+                lines.append(f'bestbuy_call_duration_seconds_bucket{{method="{label}",le="{bound}"}} {count}')
+            lines.append(f'bestbuy_call_duration_seconds_sum{{method="{label}"}} {histogram["sum"]!r}')
+            lines.append(f'bestbuy_call_duration_seconds_count{{method="{label}"}} {histogram["count"]}')
+        lines += [
+            "# HELP bestbuy_rejections_total Failed calls by reason.",
+            "# TYPE bestbuy_rejections_total counter",
+        ]
+        for method, reasons in sorted(snapshot["rejections"].items()):
+            for reason, count in sorted(reasons.items()):
+                lines.append(
+                    f'bestbuy_rejections_total{{method="{_label_value(method)}",reason="{reason}"}} {count}'
+                )
+        lines += [
+            "# HELP bestbuy_promotion_discount_total Discount granted on purchases per promotion.",
+            "# TYPE bestbuy_promotion_discount_total counter",
+        ]
+        for promotion, amount in sorted(snapshot["discounts"].items()):
+            lines.append(f'bestbuy_promotion_discount_total{{promotion="{_label_value(promotion)}"}} {amount!r}')
+        return "\n".join(lines) + "\n"
+
+    def _instrument(self, method: str, function, on_result=None):
+        """Wrap a function so that each call is counted, timed and traced."""
+        record = self._record
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as error:
+                record(method, time.perf_counter() - start, error)
+                raise
+            record(method, time.perf_counter() - start, None)
+            if on_result is not None:
+                on_result(args, result)
+            return result
+
+        return wrapper
+
+    def _record(self, method: str, duration: float, error):
+        """Add one call to the counters and notify the trace hooks."""
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            histogram = self.latency.get(method)
+            if histogram is None:
+                histogram = self.latency[method] = Histogram()
+            histogram.observe(duration)
+            if error is not None:
+                reasons = self.rejections.setdefault(method, {})
+                reason = rejection_reason(error)
+                reasons[reason] = reasons.get(reason, 0) + 1
+            hooks = self._trace_hooks
+        for hook in hooks:
+            hook(method, duration, error)
+
+    def _record_discount(self, args: tuple, total_cents: int):
+        """Add the discount of a completed purchase to its promotion's total."""
+        product, quantity = args[0], args[1]
+        promotion = product.promotion
+        if promotion is None:
+            return
+        discount = product.price_cents * quantity - total_cents
+        with self._lock:
+            self.discount_cents[promotion.name] = self.discount_cents.get(promotion.name, 0) + discount
+
+
+def _promotion_classes() -> list:
+    """Return every Promotion subclass that implements apply_promotion_cents itself."""
+    classes, pending = [], list(Promotion.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if "apply_promotion_cents" in cls.__dict__:
+            classes.append(cls)
+    return classes
+
+
+METRICS = Metrics()
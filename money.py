@@ -0,0 +1,78 @@
+"""
+Integer money arithmetic in cents.
+
+Prices are converted to whole cents once, when they are set, and every line total
+and order total is computed on integers. The only rounding happens where a
+promotion divides: the exact result is rounded to a whole cent with round half to
+even, once per order line. Amounts are converted back to floats only when they
+are returned, so the same order always produces the same total, whatever the
+order of its lines.
+
+The helpers work on Python ints and on NumPy integer arrays alike.
+"""
+
+CENTS_PER_UNIT = 100
+
+
+def to_cents(amount) -> int:
+    """
+    Convert an amount of money to whole cents.
+
+    Ints are converted exactly. Floats are rounded to the nearest cent, ties to even.
+
+    Args:
+        amount (int or float): The amount in currency units.
+
+    Returns:
+        int: The amount in cents.
+    """
+    if isinstance(amount, int):
+        return amount * CENTS_PER_UNIT
+    return round(amount * CENTS_PER_UNIT)
+
+
+def array_to_cents(prices):
+    """
+    Convert a NumPy array of prices to whole cents, rounding like to_cents.
+
+    Args:
+        prices (numpy.ndarray): The amounts in currency units.
+
+    Returns:
+        numpy.ndarray: The amounts in cents as int64.
+    """
+    return (prices * CENTS_PER_UNIT).round().astype("int64")
+
+
+def from_cents(cents) -> float:
+    """
+    Convert cents to an amount in currency units.
+
+    Args:
+        cents (int): The amount in cents.
+
+    Returns:
+        float: The amount in currency units, the float nearest to the exact value.
+    """
+    return cents / CENTS_PER_UNIT
+
+
+def divide_half_even(numerator, denominator):
+    """
+    Divide integers, rounding the quotient to the nearest integer with ties to even.
+
+    Args:
+        numerator (int or numpy.ndarray): The dividend; not negative.
+        denominator (int): The divisor; positive.
+
+    Returns:
+        int or numpy.ndarray: The rounded quotient.
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    if remainder.__class__ is int:
+        remainder += remainder
+        if remainder > denominator or remainder == denominator and quotient & 1:
+            return quotient + 1
+        return quotient
+    twice = 2 * remainder  # NumPy arrays: the same rule, element-wise.
+    return quotient + (twice > denominator) + ((twice == denominator) & (quotient & 1))
@@ -0,0 +1,234 @@
+import json
+import os
+import threading
+import time
+
+from catalog_file import write_catalog, read_catalog
+from products import product_from_dict
+from store import Store
+
+
+class OrderJournal:
+    """
+    Append-only journal of store changes, stored as one JSON record per line.
+
+    Records are group-committed: they are buffered in memory and written together
+    once ``batch_size`` records are pending or ``flush_interval`` seconds have passed
+    since the last write, so journaling does not cost a write per order. Records
+    still in the buffer are lost if the process dies before the next flush.
+    """
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.05, fsync: bool = False):
+        """
+        Open the journal for appending.
+
+        Args:
+            path (str): The journal file.
+            batch_size (int): The number of pending records that triggers a write.
+            flush_interval (float): The maximum age in seconds of pending records before a write.
+            fsync (bool): Whether each write is also forced to disk.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, record: dict):
+        """
+        Queue a record for the next group commit.
+
+        Args:
+            record (dict): A JSON-serializable record.
+        """
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._pending.append(line)
+            if (len(self._pending) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._write_pending()
+
+    def flush(self):
+        """
+        Write every pending record to the journal file.
+        """
+        with self._lock:
+            self._write_pending()
+
+    def truncate(self):
+        """
+        Drop every pending and written record, leaving an empty journal.
+        """
+        with self._lock:
+            self._pending = []
+            self._file.truncate(0)
+            self._file.seek(0)
+
+    def close(self):
+        """
+        Flush the pending records and close the journal file.
+        """
+        self.flush()
+        self._file.close()
+
+    def _write_pending(self):
+        """Write the pending records in one call; the caller holds the lock."""
+        if self._pending:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    @staticmethod
+    def read(path: str):
+        """
+        Yield the records of a journal file, skipping a torn last line.
+
+        Args:
+            path (str): The journal file.
+
+        Yields:
+            dict: The journal records in the order they were written.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    return  # Incomplete write at the moment of a crash.
+                yield json.loads(line)
+
+
+class StorePersistence:
+    """
+    Keeps a Store durable with periodic snapshots and an order journal.
+
+    Store.order, order_many, add_product, remove_product and update_stock append
+    a record to the journal. Every ``snapshot_every`` records the whole catalog is
+    written to a compact columnar snapshot and the journal is emptied, so recovery
+    only replays a bounded journal tail and startup time does not grow with history.
+    """
+    SNAPSHOT_FILE = "catalog.snapshot"
+    JOURNAL_FILE = "journal.log"
+
+    def __init__(self, directory: str, snapshot_every: int = 10_000, batch_size: int = 256,
+                 flush_interval: float = 0.05, fsync: bool = False):
+        """
+        Initialize persistence in a directory, creating it if needed.
+
+        Args:
+            directory (str): The directory holding the snapshot and the journal.
+            snapshot_every (int): The number of journal records between snapshots.
+            batch_size (int): The journal's group-commit batch size.
+            flush_interval (float): The journal's maximum flush delay in seconds.
+            fsync (bool): Whether journal writes and snapshots are forced to disk.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self.snapshot_every = snapshot_every
+        self._journal_options = {"batch_size": batch_size, "flush_interval": flush_interval, "fsync": fsync}
+        self.store = None
+        self.journal = None
+        self.seq = 0
+        self._records_since_snapshot = 0
+        self._lock = threading.RLock()
+
+    def open_store(self, default_products=None, thread_safe: bool = False) -> Store:
+        """
+        Recover the store from the latest snapshot and journal tail, or create it.
+
+        Args:
+            default_products (list): Products for a new store when nothing was persisted yet.
+            thread_safe (bool): Whether the store is created in thread-safe mode.
+
+        Returns:
+            Store: The recovered store, attached to this persistence.
+        """
+        products, self.seq = [], 0
+        if os.path.exists(self.snapshot_path):
+            products, self.seq = read_catalog(self.snapshot_path)
+        elif default_products:
+            products = list(default_products)
+        store = Store(products, thread_safe=thread_safe)
+        for record in OrderJournal.read(self.journal_path):
+            if record["seq"] > self.seq:
+                self._apply(store, record)
+                self.seq = record["seq"]
+                self._records_since_snapshot += 1
+        self.store = store
+        self.journal = OrderJournal(self.journal_path, **self._journal_options)
+        store.journal = self
+        if not os.path.exists(self.snapshot_path):
+            self.snapshot()
+        return store
+
+    def record(self, op: str, **data):
+        """
+        Append a change of the attached store to the journal.
+
+        Args:
+            op (str): The kind of change: "order", "add", "remove" or "stock".
+            **data: The JSON-serializable details of the change.
+        """
+        with self._lock:
+            self.seq += 1
+            self.journal.append({"seq": self.seq, "op": op, **data})
+            self._records_since_snapshot += 1
+            if self._records_since_snapshot >= self.snapshot_every:
+                self.snapshot()
+
+    def snapshot(self):
+        """
+        Write the whole catalog to the snapshot file and empty the journal.
+        """
+        with self._lock:
+            self.journal.flush()
+            write_catalog(self.snapshot_path, self.store.list_of_products, self.seq)
+            # Records up to self.seq are now in the snapshot; recovery skips them
+            # even if the process dies before the journal is emptied.
+            self.journal.truncate()
+            self._records_since_snapshot = 0
+
+    def close(self):
+        """
+        Flush the journal and detach from the store.
+        """
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if self.store is not None:
+            self.store.journal = None
+
+    @staticmethod
+    def _apply(store: Store, record: dict):
+        """
+        Replay one journal record against a store without journaling it again.
+
+        Records carry absolute stock levels rather than deltas, so replaying a record
+        whose effect is already in the snapshot leaves the store unchanged.
+        """
+        op = record["op"]
+        if op == "order":
+            for name, quantity in record["stock"].items():
+                store.get_product(name).quantity = quantity
+        elif op == "add":
+            existing = store.get_product(record["product"]["name"])
+            if existing is not None:
+                store.catalog.remove(existing)
+            store.catalog.add(product_from_dict(record["product"]))
+        elif op == "remove":
+            product = store.get_product(record["name"])
+            if product is not None:
+                store.catalog.remove(product)
+        elif op == "stock":
+            product = store.get_product(record["name"])
+            product.quantity = record["quantity"]
+            product.active = record["active"]
+        else:
+            raise ValueError(f"Unknown journal operation {op}.")
+
@@ -1,4 +1,52 @@
-from promotions import Promotion
+import math
+from itertools import repeat
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; column validation falls back to Python builtins.
+    np = None
+
+from promotions import Promotion, promotion_to_dict, promotion_from_dict
+from pricing import QUOTE_CACHE
+from money import CENTS_PER_UNIT, to_cents, from_cents, array_to_cents
+
+
+# The highest price accepted; its value in cents still fits the int64 columns of NumPy and catalog files.
+MAX_PRICE = 10**15
+
+
+class InsufficientStockError(ValueError):
+    """Raised when a purchase asks for more than the available quantity."""
+
+
+class PurchaseLimitError(ValueError):
+    """Raised when a purchase exceeds a LimitedProduct's per-order maximum."""
+
+
+def _check_name(value):
+    """Raise if a value is not a valid product name."""
+    if not isinstance(value, str):
+        raise TypeError("Name must be a string.")
+    if not value:
+        raise ValueError("Name should not be empty.")
+
+
+def _check_price(value):
+    """Raise if a value is not a valid price."""
+    if not isinstance(value, (int, float)):
+        raise TypeError("Price must be a number.")
+    if not 0 <= value <= MAX_PRICE:
+        if value < 0:
+            raise ValueError("Price should not be negative.")
+        raise ValueError(f"Price must be a finite number no larger than {MAX_PRICE}.")
+
+
+def _check_quantity(value):
+    """Raise if a value is not a valid stock quantity."""
+    if not isinstance(value, int):
+        raise TypeError("Quantity must be an integer.")
+    if value < 0:
+        raise ValueError("Quantity should not be negative.")
 
 
 class Product:
@@ -8,10 +56,18 @@ class Product:
     Attributes:
         name (str): The product's name.
         price (float): The product's price.
-        quantity (int): The available quantity.
+        price_cents (int): The price in whole cents, which all totals are computed from.
+        quantity (int): The quantity in stock.
+        reserved (int): The part of the stock held by reservations.
+        available (int): The quantity that can still be bought, stock minus holds.
         active (bool): Indicates if the product is available for purchase.
         promotion (Promotion or None): An optional promotion applied to the product.
+
+    Instances use __slots__ instead of a per-instance __dict__, which keeps large
+    catalogs compact and makes attribute access cheaper.
     """
+    __slots__ = ("_name", "_price", "_price_cents", "_quantity", "_reserved", "_active", "_promotion",
+                 "_observers")
 
     def __init__(self, name: str, price: float, quantity: int):
         """
@@ -22,11 +78,51 @@ class Product:
             price (float): The price of the product.
             quantity (int): The available quantity.
         """
-        self.name = name  # Uses setter for validation
-        self.price = price  # Uses setter for validation
-        self.quantity = quantity  # Uses setter for validation
-        self.active = True
-        self.promotion = None
+        # The values get the setters' checks but are stored directly: a new product has
+        # no observers to notify and no cached quotes to drop.
+        _check_name(name)
+        _check_price(price)
+        _check_quantity(quantity)
+        self._observers = ()
+        self._reserved = 0
+        self._name = name
+        self._price = price
+        self._price_cents = to_cents(price)
+        self._quantity = quantity
+        self._active = True
+        self._promotion = None
+
+    @classmethod
+    def from_trusted(cls, name: str, price: float, quantity: int, active: bool = True,
+                     promotion: Promotion = None, price_cents: int = None):
+        """
+        Build a product from values that are already known to be valid.
+
+        The fields are stored directly, without the setters' type and range checks,
+        observer notifications or quote cache invalidation. Use it only for values
+        validated beforehand, for example by products_from_columns.
+
+        Args:
+            name (str): The product's name.
+            price (float): The product's price.
+            quantity (int): The available quantity.
+            active (bool): Whether the product is active.
+            promotion (Promotion or None): The product's promotion.
+            price_cents (int or None): The price in cents, if already converted.
+
+        Returns:
+            Product: The new product.
+        """
+        product = cls.__new__(cls)
+        product._observers = ()
+        product._reserved = 0
+        product._name = name
+        product._price = price
+        product._price_cents = to_cents(price) if price_cents is None else price_cents
+        product._quantity = quantity
+        product._active = active
+        product._promotion = promotion
+        return product
 
     @property
     def name(self):
@@ -35,11 +131,11 @@ class Product:
 
     @name.setter
     def name(self, value):
-        if not isinstance(value, str):
-            raise TypeError("Name must be a string.")
-        if not value:
-            raise ValueError("Name should not be empty.")
+        _check_name(value)
+        old_value = getattr(self, "_name", None)
         self._name = value
+        if self._observers:
+            self._notify("name", old_value, value)
 
     @property
     def price(self):
@@ -48,11 +144,18 @@ class Product:
 
     @price.setter
     def price(self, value):
-        if not isinstance(value, (int, float)):
-            raise TypeError("Price must be a number.")
-        if value < 0:
-            raise ValueError("Price should not be negative.")
+        _check_price(value)
+        old_value = getattr(self, "_price", None)
         self._price = value
+        self._price_cents = to_cents(value)
+        QUOTE_CACHE.invalidate(self)
+        if self._observers:
+            self._notify("price", old_value, value)
+
+    @property
+    def price_cents(self) -> int:
+        """int: The price in whole cents, rounded half to even."""
+        return self._price_cents
 
     @property
     def quantity(self):
@@ -61,14 +164,35 @@ class Product:
 
     @quantity.setter
     def quantity(self, value):
-        if not isinstance(value, int):
-            raise TypeError("Quantity must be an integer.")
-        if value < 0:
-            raise ValueError("Quantity should not be negative.")
+        _check_quantity(value)
+        old_value = getattr(self, "_quantity", None)
         self._quantity = value
+        if self._observers:
+            self._notify("quantity", old_value, value)
         if self._quantity == 0:
             self.active = False
 
+    @property
+    def reserved(self):
+        """int: Get or set the quantity held by reservations."""
+        return self._reserved
+
+    @reserved.setter
+    def reserved(self, value):
+        if not isinstance(value, int):
+            raise TypeError("Reserved quantity must be an integer.")
+        if value < 0:
+            raise ValueError("Reserved quantity should not be negative.")
+        old_value = self._reserved
+        self._reserved = value
+        if self._observers:
+            self._notify("reserved", old_value, value)
+
+    @property
+    def available(self) -> int:
+        """int: The quantity in stock that is not held by a reservation."""
+        return max(self._quantity - self._reserved, 0)
+
     @property
     def active(self):
         """bool: Get or set the product's active status."""
@@ -78,7 +202,10 @@ class Product:
     def active(self, value):
         if not isinstance(value, bool):
             raise TypeError("Active must be a boolean.")
+        old_value = getattr(self, "_active", None)
         self._active = value
+        if self._observers and old_value != value:
+            self._notify("active", old_value, value)
 
     @property
     def promotion(self):
@@ -89,20 +216,134 @@ class Product:
     def promotion(self, value):
         if value is not None and not isinstance(value, Promotion):
             raise TypeError("Promotion must be a Promotion instance or None.")
+        old_value = getattr(self, "_promotion", None)
         self._promotion = value
+        QUOTE_CACHE.invalidate(self)
+        if self._observers:
+            self._notify("promotion", old_value, value)
+
+    def add_observer(self, callback):
+        """
+        Register a callback that is invoked whenever a product field changes.
+
+        The callback is called as ``callback(product, field, old_value, new_value)``.
+
+        Args:
+            callback (callable): The function to notify on changes.
+        """
+        self._observers += (callback,)
+
+    def remove_observer(self, callback):
+        """
+        Unregister a previously added change callback.
+
+        Args:
+            callback (callable): The function to stop notifying.
+
+        Raises:
+            ValueError: If the callback was never registered.
+        """
+        if callback not in self._observers:
+            raise ValueError("Observer is not registered.")
+        observers = list(self._observers)
+        observers.remove(callback)
+        self._observers = tuple(observers)
+
+    def _notify(self, field, old_value, new_value):
+        """Forward a field change to every registered observer."""
+        for callback in self._observers:
+            callback(self, field, old_value, new_value)
 
     def show(self) -> str:
         """
         Return a string representation of the product.
 
+        The quantity shown is the available quantity, without stock held by reservations.
+
         Returns:
             str: The product's details, including any applied promotion.
         """
-        base_info = f"{self.name}, Price: {self.price}, Quantity: {self.quantity}"
+        base_info = f"{self.name}, Price: {self.price}, Quantity: {self.available}"
         if self.promotion:
             base_info += f", Promotion: {self.promotion.name}"
         return base_info
 
+    def _cents_for(self, quantity: int) -> int:
+        """Return the price of a quantity in cents, applying the promotion if there is one."""
+        if self._promotion:
+            return self._promotion.apply_promotion_cents(self._price_cents, quantity)
+        return self._price_cents * quantity
+
+    def _price_for(self, quantity: int) -> float:
+        """Return the price of a quantity, applying the promotion if there is one."""
+        return from_cents(self._cents_for(quantity))
+
+    def quote_cents(self, quantity: int) -> int:
+        """
+        Return the price of a quantity in cents without buying it.
+
+        Quotes do not check or change the stock. Results are memoized in a bounded
+        LRU cache that drops the product's entries when its price or promotion changes.
+
+        Args:
+            quantity (int): The quantity to price.
+
+        Returns:
+            int: The total price for the quantity in cents.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+        """
+        if quantity <= 0:
+            raise ValueError("The quantity has to be positive.")
+        return QUOTE_CACHE.get_or_compute(self, quantity, lambda: self._cents_for(quantity))
+
+    def quote(self, quantity: int) -> float:
+        """
+        Return the price of a quantity without buying it.
+
+        Args:
+            quantity (int): The quantity to price.
+
+        Returns:
+            float: The total price for the quantity.
+
+        Raises:
+            ValueError: If the quantity is not positive.
+        """
+        return from_cents(self.quote_cents(quantity))
+
+    def buy_cents(self, quantity: int) -> int:
+        """
+        Process a purchase for the product and return its exact price in cents.
+
+        Args:
+            quantity (int): The quantity to purchase.
+
+        Returns:
+            int: The total price for the purchase in cents.
+
+        Raises:
+            TypeError: If the quantity is not an integer.
+            ValueError: If the quantity is not positive or exceeds the stock that is not held
+                by a reservation.
+        """
+        if not isinstance(quantity, int):
+            raise TypeError("Quantity must be an integer.")
+        if quantity <= 0:
+            raise ValueError("The quantity has to be positive.")
+        old_quantity = self._quantity
+        if quantity > old_quantity - self._reserved:
+            raise InsufficientStockError("Not enough quantity in storage.")
+        total_cents = self._cents_for(quantity)
+        # The same update as the quantity setter, without repeating checks that already passed.
+        new_quantity = self._quantity = old_quantity - quantity
+        for callback in self._observers:
+            callback(self, "quantity", old_quantity, new_quantity)
+        if not new_quantity:
+            self.active = False
+        return total_cents
+
     def buy(self, quantity: int) -> float:
         """
         Process a purchase for the product.
@@ -114,24 +355,18 @@ class Product:
             float: The total price for the purchase.
 
         Raises:
-            ValueError: If the quantity is not positive or exceeds available stock.
+            TypeError: If the quantity is not an integer.
+            ValueError: If the quantity is not positive or exceeds the stock that is not held
+                by a reservation.
         """
-        if quantity <= 0:
-            raise ValueError("The quantity has to be positive.")
-        if quantity > self.quantity:
-            raise ValueError("Not enough quantity in storage.")
-        if self.promotion:
-            total_price = self.promotion.apply_promotion(self, quantity)
-        else:
-            total_price = self.price * quantity
-        self.quantity -= quantity  # Uses setter, which may deactivate the product
-        return total_price
+        return self.buy_cents(quantity) / CENTS_PER_UNIT  # from_cents, without the extra call
 
 
 class NonStockedProduct(Product):
     """
     A product that is non-stocked, meaning it is available with infinite supply.
     """
+    __slots__ = ()
 
     def __init__(self, name: str, price: float):
         """
@@ -143,6 +378,19 @@ class NonStockedProduct(Product):
         """
         super().__init__(name, price, 0)
 
+    @classmethod
+    def from_trusted(cls, name: str, price: float, active: bool = True,
+                     promotion: Promotion = None, price_cents: int = None):
+        """
+        Build a non-stocked product from values that are already known to be valid.
+
+        See Product.from_trusted.
+
+        Returns:
+            NonStockedProduct: The new product.
+        """
+        return super().from_trusted(name, price, 0, active, promotion, price_cents)
+
     def show(self) -> str:
         """
         Return a string representation specific to non-stocked products.
@@ -157,6 +405,7 @@ class LimitedProduct(Product):
     """
     A product with a purchase limit per order.
     """
+    __slots__ = ("_maximum",)
 
     def __init__(self, name: str, price: float, quantity: int, maximum: int):
         """
@@ -171,6 +420,21 @@ class LimitedProduct(Product):
         super().__init__(name, price, quantity)
         self.maximum = maximum
 
+    @classmethod
+    def from_trusted(cls, name: str, price: float, quantity: int, maximum: int, active: bool = True,
+                     promotion: Promotion = None, price_cents: int = None):
+        """
+        Build a limited product from values that are already known to be valid.
+
+        See Product.from_trusted; ``maximum`` must be a positive integer.
+
+        Returns:
+            LimitedProduct: The new product.
+        """
+        product = super().from_trusted(name, price, quantity, active, promotion, price_cents)
+        product._maximum = maximum
+        return product
+
     @property
     def maximum(self):
         """int: Get or set the maximum quantity allowed per order."""
@@ -182,9 +446,12 @@ class LimitedProduct(Product):
             raise TypeError("Maximum must be an integer.")
         if value <= 0:
             raise ValueError("Maximum must be positive.")
+        old_value = getattr(self, "_maximum", None)
         self._maximum = value
+        if self._observers:
+            self._notify("maximum", old_value, value)
 
-    def buy(self, quantity: int) -> float:
+    def buy_cents(self, quantity: int) -> int:
         """
         Process a purchase for a limited product, enforcing the purchase limit.
 
@@ -192,14 +459,31 @@ class LimitedProduct(Product):
             quantity (int): The quantity to purchase.
 
         Returns:
-            float: The total price for the purchase.
+            int: The total price for the purchase in cents.
+
+        Raises:
+            ValueError: If the quantity exceeds the per-order maximum.
+        """
+        if quantity > self.maximum:
+            raise PurchaseLimitError(f"Quantity {quantity} exceeds the limit of {self.maximum}.")
+        return super().buy_cents(quantity)
+
+    def quote_cents(self, quantity: int) -> int:
+        """
+        Return the price of a quantity in cents without buying it, enforcing the purchase limit.
+
+        Args:
+            quantity (int): The quantity to price.
+
+        Returns:
+            int: The total price for the quantity in cents.
 
         Raises:
             ValueError: If the quantity exceeds the per-order maximum.
         """
         if quantity > self.maximum:
-            raise ValueError(f"Quantity {quantity} exceeds the limit of {self.maximum}.")
-        return super().buy(quantity)
+            raise PurchaseLimitError(f"Quantity {quantity} exceeds the limit of {self.maximum}.")
+        return super().quote_cents(quantity)
 
     def show(self) -> str:
         """
@@ -210,3 +494,144 @@ class LimitedProduct(Product):
         """
         base_info = super().show()
         return f"{base_info}, Limited to {self.maximum} per order."
+
+
+def product_to_dict(product) -> dict:
+    """
+    Convert a product into a plain dict that can be stored as JSON.
+
+    Args:
+        product (Product): The product to convert.
+
+    Returns:
+        dict: The product type, fields and promotion.
+    """
+    data = {
+        "type": type(product).__name__,
+        "name": product.name,
+        "price": product.price,
+        "quantity": product.quantity,
+        "active": product.active,
+        "promotion": promotion_to_dict(product.promotion),
+    }
+    if isinstance(product, LimitedProduct):
+        data["maximum"] = product.maximum
+    return data
+
+
+def product_from_dict(data: dict):
+    """
+    Rebuild a product from the dict produced by product_to_dict.
+
+    Args:
+        data (dict): The product type, fields and promotion.
+
+    Returns:
+        Product: The rebuilt product.
+
+    Raises:
+        ValueError: If the product type is unknown or a required field is missing.
+        TypeError: If a field has the wrong type.
+    """
+    product_type = data.get("type", "Product")
+    try:
+        if product_type == "Product":
+            product = Product(data["name"], data["price"], data["quantity"])
+        elif product_type == "NonStockedProduct":
+            product = NonStockedProduct(data["name"], data["price"])
+        elif product_type == "LimitedProduct":
+            product = LimitedProduct(data["name"], data["price"], data["quantity"], data["maximum"])
+        else:
+            raise ValueError(f"Unknown product type {product_type}.")
+    except KeyError as error:
+        raise ValueError(f"Missing field {error.args[0]}.") from None
+    if "active" in data:
+        product.active = data["active"]
+    product.promotion = promotion_from_dict(data.get("promotion"))
+    return product
+
+
+def _check_column(values, label: str, dtype_kinds: str, types, lowest, highest=None) -> list:
+    """
+    Check the type and bounds of a whole column and return it as a list.
+
+    With NumPy the column is converted once and checked on its dtype, minimum and,
+    with an upper bound, on being finite and its maximum; otherwise the check is a
+    single pass of builtins. NaN and infinities fail the upper bound in both cases.
+    """
+    if np is not None:
+        array = np.asarray(values)
+        if array.dtype.kind not in dtype_kinds:
+            raise TypeError(f"Every {label} must be of type {' or '.join(t.__name__ for t in types)}.")
+        if len(array):
+            if highest is not None and not (np.isfinite(array).all() and array.max() <= highest):
+                raise ValueError(f"Every {label} must be a finite number no larger than {highest}.")
+            if lowest is not None and array.min() < lowest:
+                raise ValueError(f"Every {label} must be at least {lowest}.")
+        return array.tolist()
+    values = list(values)
+    if not all(isinstance(value, types) for value in values):
+        raise TypeError(f"Every {label} must be of type {' or '.join(t.__name__ for t in types)}.")
+    if values:
+        # Comparisons with NaN are false, so NaN fails the upper bound as well.
+        if highest is not None and not all(value <= highest for value in values):
+            raise ValueError(f"Every {label} must be a finite number no larger than {highest}.")
+        if lowest is not None and min(values) < lowest:
+            raise ValueError(f"Every {label} must be at least {lowest}.")
+    return values
+
+
+def products_from_columns(names, prices, quantities, maximums=None, actives=None) -> list:
+    """
+    Build many products from columns of field values, validating each column once.
+
+    Each column is checked as a whole, vectorized with NumPy when it is installed,
+    and the products are then built with from_trusted instead of going through the
+    per-field setters of the constructors. A product with a positive maximum
+    becomes a LimitedProduct, the others plain Products.
+
+    Args:
+        names (sequence): The product names.
+        prices (sequence): The prices, ints or floats.
+        quantities (sequence): The quantities in stock.
+        maximums (sequence or None): The per-order maximum of each product, 0 for no limit.
+        actives (sequence or None): The active flag of each product; all active by default.
+
+    Returns:
+        list: The products, in column order.
+
+    Raises:
+        ValueError: If the columns differ in length, a name is empty, a value is negative
+            or a price is not finite or above MAX_PRICE.
+        TypeError: If a column holds a value of the wrong type.
+    """
+    count = len(names)
+    if any(column is not None and len(column) != count for column in (prices, quantities, maximums, actives)):
+        raise ValueError("All columns must have the same length.")
+    if not set(map(type, names)) <= {str}:
+        raise TypeError("Every name must be of type str.")
+    if "" in names:
+        raise ValueError("Name should not be empty.")
+    checked_prices = _check_column(prices, "price", "iuf", (int, float), 0, MAX_PRICE)
+    # Keep the caller's ints and floats as they are; NumPy would turn a mixed list into floats.
+    if isinstance(prices, (list, tuple)):
+        checked_prices = prices
+    if np is not None:
+        price_cents = array_to_cents(np.asarray(checked_prices, dtype="float64")).tolist()
+    else:
+        price_cents = list(map(to_cents, checked_prices))
+    quantities = _check_column(quantities, "quantity", "iu", (int,), 0)
+    maximums = repeat(0) if maximums is None else _check_column(maximums, "maximum", "iu", (int,), 0)
+    actives = repeat(True) if actives is None else _check_column(actives, "active flag", "b", (bool,), None)
+
+    product = Product.from_trusted
+    limited_product = LimitedProduct.from_trusted
+    products = []
+    append = products.append
+    for name, price, cents, quantity, maximum, active in zip(
+            names, checked_prices, price_cents, quantities, maximums, actives):
+        if maximum:
+            append(limited_product(name, price, quantity, maximum, active, None, cents))
+        else:
+            append(product(name, price, quantity, active, None, cents))
+    return products
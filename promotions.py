@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
 
+from money import to_cents, from_cents, array_to_cents, divide_half_even
+
 class Promotion(ABC):
     """
     Abstract base class representing a promotion.
+
+    Promotions compute line totals in integer cents (see the money module) and
+    round at most once per line, half to even. apply_promotion returns the same
+    total converted to a float.
     """
     def __init__(self, name: str):
         """
@@ -13,6 +19,17 @@ class Promotion(ABC):
         """
         self.name = name
 
+    @property
+    def pricing_key(self):
+        """
+        Hashable summary of the parameters the promotion prices with.
+
+        Cached quotes are keyed by it, so a promotion whose parameters can change in
+        place must return a different value after each change. The built-in
+        promotions without parameters return None.
+        """
+        return None
+
     @abstractmethod
     def apply_promotion(self, product, quantity: int) -> float:
         """
@@ -27,6 +44,48 @@ class Promotion(ABC):
         """
         pass
 
+    def apply_promotion_bulk(self, prices, quantities):
+        """
+        Apply the promotion to many order lines at once.
+
+        Subclasses override this with vectorized NumPy arithmetic that gives the same
+        results as apply_promotion. The default implementation prices one line at a time.
+
+        Args:
+            prices (numpy.ndarray): The unit price of each line.
+            quantities (numpy.ndarray): The quantity of each line.
+
+        Returns:
+            list: The total price of each line after applying the promotion.
+        """
+        return [
+            self.apply_promotion(_PricedLine(price), quantity)
+            for price, quantity in zip(prices.tolist(), quantities.tolist())
+        ]
+
+    def apply_promotion_cents(self, price_cents: int, quantity: int) -> int:
+        """
+        Apply the promotion to a unit price in cents.
+
+        The built-in promotions override this with exact integer arithmetic. The
+        default implementation rounds the result of apply_promotion to whole cents.
+
+        Args:
+            price_cents (int): The unit price in cents.
+            quantity (int): The quantity to purchase.
+
+        Returns:
+            int: The total price in cents after applying the promotion.
+        """
+        return to_cents(self.apply_promotion(_PricedLine(from_cents(price_cents)), quantity))
+
+class _PricedLine:
+    """Minimal stand-in for a product when only its price is needed."""
+    __slots__ = ("price",)
+
+    def __init__(self, price):
+        self.price = price
+
 class PercentDiscount(Promotion):
     """
     Applies a percentage discount to the total price.
@@ -36,11 +95,34 @@ class PercentDiscount(Promotion):
         Initialize a PercentDiscount promotion.
 
         Args:
-            percent (float): The percentage discount to apply.
+            percent (float): The percentage discount to apply, from 0 to 100.
+
+        Raises:
+            TypeError: If the percentage is not a number.
+            ValueError: If the percentage is not between 0 and 100.
         """
         super().__init__("Percent Discount")
         self.percent = percent
 
+    @property
+    def percent(self):
+        """float: Get or set the discount in percent; applied with a precision of 0.01%."""
+        return self._percent
+
+    @percent.setter
+    def percent(self, value):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise TypeError("Percent must be a number.")
+        if not 0 <= value <= 100:  # Also false for NaN.
+            raise ValueError("Percent must be between 0 and 100.")
+        self._percent = value
+        self._kept_basis_points = 10_000 - round(value * 100)
+
+    @property
+    def pricing_key(self):
+        """int: The share of the price kept, in basis points."""
+        return self._kept_basis_points
+
     def apply_promotion(self, product, quantity: int) -> float:
         """
         Calculate the total price after applying a percentage discount.
@@ -52,9 +134,37 @@ class PercentDiscount(Promotion):
         Returns:
             float: The discounted total price.
         """
-        total = product.price * quantity
-        discount = total * (self.percent / 100)
-        return total - discount
+        return from_cents(self._total_cents(to_cents(product.price), quantity))
+
+    def apply_promotion_bulk(self, prices, quantities):
+        """
+        Calculate the discounted totals of many lines with vectorized arithmetic.
+
+        Args:
+            prices (numpy.ndarray): The unit price of each line.
+            quantities (numpy.ndarray): The quantity of each line.
+
+        Returns:
+            numpy.ndarray: The discounted total price of each line.
+        """
+        return from_cents(self._total_cents(array_to_cents(prices), quantities))
+
+    def apply_promotion_cents(self, price_cents: int, quantity: int) -> int:
+        """
+        Calculate the discounted total in cents.
+
+        Args:
+            price_cents (int): The unit price in cents.
+            quantity (int): The quantity to purchase.
+
+        Returns:
+            int: The discounted total, rounded half to even to a whole cent.
+        """
+        return self._total_cents(price_cents, quantity)
+
+    def _total_cents(self, price_cents, quantity):
+        """Discounted total in cents for scalar or array operands."""
+        return divide_half_even(price_cents * quantity * self._kept_basis_points, 10_000)
 
 class SecondHalfPrice(Promotion):
     """
@@ -77,10 +187,40 @@ class SecondHalfPrice(Promotion):
         Returns:
             float: The total price after applying the promotion.
         """
-        full_price = product.price
-        pairs = quantity // 2
-        remainder = quantity % 2
-        return pairs * (full_price + full_price / 2) + remainder * full_price
+        return from_cents(self._total_cents(to_cents(product.price), quantity))
+
+    def apply_promotion_bulk(self, prices, quantities):
+        """
+        Calculate the totals of many lines with vectorized arithmetic.
+
+        Args:
+            prices (numpy.ndarray): The unit price of each line.
+            quantities (numpy.ndarray): The quantity of each line.
+
+        Returns:
+            numpy.ndarray: The total price of each line after applying the promotion.
+        """
+        return from_cents(self._total_cents(array_to_cents(prices), quantities))
+
+    def apply_promotion_cents(self, price_cents: int, quantity: int) -> int:
+        """
+        Calculate the total in cents with every second item at half price.
+
+        Args:
+            price_cents (int): The unit price in cents.
+            quantity (int): The quantity to purchase.
+
+        Returns:
+            int: The total, rounded half to even to a whole cent.
+        """
+        return self._total_cents(price_cents, quantity)
+
+    @staticmethod
+    def _total_cents(price_cents, quantity):
+        """Second-half-price total in cents for scalar or array operands."""
+        # Each pair costs 1.5 unit prices and a single item costs 1: count half prices.
+        half_prices = 3 * (quantity // 2) + 2 * (quantity % 2)
+        return divide_half_even(price_cents * half_prices, 2)
 
 class ThirdOneFree(Promotion):
     """
@@ -103,6 +243,89 @@ class ThirdOneFree(Promotion):
         Returns:
             float: The total price after applying the promotion.
         """
+        return from_cents(self._total_cents(to_cents(product.price), quantity))
+
+    def apply_promotion_bulk(self, prices, quantities):
+        """
+        Calculate the totals of many lines with vectorized arithmetic.
+
+        Args:
+            prices (numpy.ndarray): The unit price of each line.
+            quantities (numpy.ndarray): The quantity of each line.
+
+        Returns:
+            numpy.ndarray: The total price of each line after applying the promotion.
+        """
+        return from_cents(self._total_cents(array_to_cents(prices), quantities))
+
+    def apply_promotion_cents(self, price_cents: int, quantity: int) -> int:
+        """
+        Calculate the total in cents with every third item free.
+
+        Args:
+            price_cents (int): The unit price in cents.
+            quantity (int): The quantity to purchase.
+
+        Returns:
+            int: The exact total.
+        """
+        return self._total_cents(price_cents, quantity)
+
+    @staticmethod
+    def _total_cents(price_cents, quantity):
+        """Buy-two-get-one-free total in cents for scalar or array operands."""
         groups = quantity // 3
         remainder = quantity % 3
-        return groups * (2 * product.price) + remainder * product.price
+        return price_cents * (2 * groups + remainder)
+
+def promotion_to_dict(promotion) -> dict:
+    """
+    Convert a promotion into a plain dict that can be stored as JSON.
+
+    Args:
+        promotion (Promotion or None): The promotion to convert.
+
+    Returns:
+        dict or None: The promotion type and its parameters, or None without a promotion.
+
+    Raises:
+        TypeError: If the promotion type cannot be serialized.
+    """
+    if promotion is None:
+        return None
+    if isinstance(promotion, PercentDiscount):
+        return {"type": "PercentDiscount", "percent": promotion.percent}
+    if isinstance(promotion, SecondHalfPrice):
+        return {"type": "SecondHalfPrice"}
+    if isinstance(promotion, ThirdOneFree):
+        return {"type": "ThirdOneFree"}
+    raise TypeError(f"Cannot serialize promotion {type(promotion).__name__}.")
+
+def promotion_from_dict(data):
+    """
+    Rebuild a promotion from the dict produced by promotion_to_dict.
+
+    Args:
+        data (dict or None): The promotion type and its parameters.
+
+    Returns:
+        Promotion or None: The rebuilt promotion, or None without a promotion.
+
+    Raises:
+        ValueError: If the data is not a dict, the promotion type is unknown or a
+            required parameter is missing.
+    """
+    if data is None:
+        return None
+    if not isinstance(data, dict):
+        raise ValueError("Promotion must be an object with a type.")
+    promotion_type = data.get("type")
+    if promotion_type == "PercentDiscount":
+        if "percent" not in data:
+            raise ValueError("Missing field percent.")
+        return PercentDiscount(data["percent"])
+    if promotion_type == "SecondHalfPrice":
+        return SecondHalfPrice()
+    if promotion_type == "ThirdOneFree":
+        return ThirdOneFree()
+    raise ValueError(f"Unknown promotion type {promotion_type}.")
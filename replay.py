@@ -0,0 +1,272 @@
+import json
+import os
+from itertools import islice
+
+from money import to_cents, from_cents
+
+
+class ReplayStats:
+    """
+    Running totals of an order replay.
+
+    Attributes:
+        position (int): The number of input lines consumed so far.
+        orders_committed (int): The number of orders placed successfully.
+        orders_failed (int): The number of orders that could not be placed.
+        revenue_cents (int): The sum of the totals of the committed orders in cents.
+        units_sold (dict): The units sold per product name.
+        discount_cents (dict): The discount in cents granted per promotion name, relative to list price,
+            with the store's pricing rule discounts under "Pricing rules".
+        failures (dict): The number of failed orders per error type, for example
+            "InsufficientStockError" or "TypeError".
+
+    Money is accumulated in integer cents, so totals do not drift however many
+    orders are replayed; ``revenue`` and ``discounts`` give the same values in
+    currency units.
+    """
+    def __init__(self):
+        """
+        Initialize empty totals.
+        """
+        self.position = 0
+        self.orders_committed = 0
+        self.orders_failed = 0
+        self.revenue_cents = 0
+        self.units_sold = {}
+        self.discount_cents = {}
+        self.failures = {}
+
+    @property
+    def revenue(self) -> float:
+        """float: The sum of the totals of the committed orders."""
+        return from_cents(self.revenue_cents)
+
+    @property
+    def discounts(self) -> dict:
+        """dict: The discount granted per promotion name, relative to list price."""
+        return {name: from_cents(cents) for name, cents in self.discount_cents.items()}
+
+    def to_dict(self) -> dict:
+        """
+        Return the totals as a JSON-serializable dict.
+
+        Returns:
+            dict: Every attribute of the stats.
+        """
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Rebuild stats from the dict produced by to_dict.
+
+        Args:
+            data (dict): The saved totals.
+
+        Returns:
+            ReplayStats: The restored stats.
+        """
+        stats = cls()
+        for key, value in data.items():
+            setattr(stats, key, value)
+        return stats
+
+
+def parse_orders(lines):
+    """
+    Parse JSON Lines order records.
+
+    Each record looks like ``{"order_id": "A1", "lines": [["MacBook Air M2", 1], ...]}``.
+    Blank lines are skipped.
+
+    Args:
+        lines (iterable): Numbered input lines as (position, text) pairs.
+
+    Yields:
+        tuple: The position and either the parsed record or a ValueError.
+    """
+    for position, text in lines:
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+            if not isinstance(record, dict) or not isinstance(record.get("lines"), list):
+                raise ValueError("Order record must be an object with a lines list.")
+        except ValueError as error:
+            yield position, ValueError(f"Invalid order record: {error}")
+            continue
+        yield position, record
+
+
+def resolve_orders(records, store):
+    """
+    Turn the product names of order records into a shopping list of products.
+
+    Args:
+        records (iterable): The output of parse_orders.
+        store (Store): The store whose products are looked up.
+
+    Yields:
+        tuple: The position and either the shopping list or a ValueError.
+    """
+    for position, record in records:
+        if isinstance(record, ValueError):
+            yield position, record
+            continue
+        try:
+            shopping_list = []
+            for name, quantity in record["lines"]:
+                product = store.get_product(name)
+                if product is None:
+                    raise ValueError(f"Unknown product {name}.")
+                shopping_list.append((product, quantity))
+        except (TypeError, ValueError) as error:
+            yield position, ValueError(str(error))
+            continue
+        yield position, shopping_list
+
+
+def price_orders(shopping_lists):
+    """
+    Price every line of each shopping list through its product's promotion.
+
+    Prices come from Product.quote_cents, which uses the same promotion logic as
+    Store.order without changing stock.
+
+    Args:
+        shopping_lists (iterable): The output of resolve_orders.
+
+    Yields:
+        tuple: The position, the shopping list (or the exception that rejected it) and
+        the quoted line totals in cents.
+    """
+    for position, shopping_list in shopping_lists:
+        if isinstance(shopping_list, Exception):
+            yield position, shopping_list, None
+            continue
+        try:
+            line_totals = [product.quote_cents(quantity) for product, quantity in shopping_list]
+        except (TypeError, ValueError) as error:
+            yield position, error, None
+            continue
+        yield position, shopping_list, line_totals
+
+
+def commit_orders(priced, store, stats: ReplayStats):
+    """
+    Place each priced order through Store.order and update the running totals.
+
+    Revenue is the total returned by Store.order, so the store's pricing rules are
+    included. Promotion discounts come from the quoted line totals; whatever the
+    rules took off on top of them is counted under "Pricing rules".
+
+    Args:
+        priced (iterable): The output of price_orders.
+        store (Store): The store that processes the orders.
+        stats (ReplayStats): The totals to update.
+
+    Yields:
+        int: The position of each processed input line.
+    """
+    for position, shopping_list, line_totals in priced:
+        error = shopping_list if isinstance(shopping_list, Exception) else None
+        if error is None:
+            try:
+                total_cents = to_cents(store.order(shopping_list))
+            except (TypeError, ValueError) as order_error:
+                error = order_error
+        if error is not None:
+            stats.orders_failed += 1
+            reason = type(error).__name__
+            stats.failures[reason] = stats.failures.get(reason, 0) + 1
+        else:
+            stats.orders_committed += 1
+            stats.revenue_cents += total_cents
+            rules_discount = sum(line_totals) - total_cents
+            if rules_discount:
+                discounts = stats.discount_cents
+                discounts["Pricing rules"] = discounts.get("Pricing rules", 0) + rules_discount
+            for (product, quantity), line_total in zip(shopping_list, line_totals):
+                stats.units_sold[product.name] = stats.units_sold.get(product.name, 0) + quantity
+                if product.promotion is not None:
+                    name = product.promotion.name
+                    discount = product.price_cents * quantity - line_total
+                    stats.discount_cents[name] = stats.discount_cents.get(name, 0) + discount
+        stats.position = position
+        yield position
+
+
+def load_checkpoint(path: str, store) -> ReplayStats:
+    """
+    Load the last checkpoint and reset the store's stock to the checkpointed levels.
+
+    Args:
+        path (str): The checkpoint file.
+        store (Store): The store being replayed into.
+
+    Returns:
+        ReplayStats: The saved stats, or empty stats if there is no checkpoint.
+    """
+    if path is None or not os.path.exists(path):
+        return ReplayStats()
+    with open(path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+    for name, quantity in checkpoint["stock"].items():
+        product = store.get_product(name)
+        if product is not None and product.quantity != quantity:
+            store.update_stock(product, quantity)
+    return ReplayStats.from_dict(checkpoint["stats"])
+
+
+def save_checkpoint(path: str, stats: ReplayStats, store):
+    """
+    Atomically save the replay position, the totals and the store's stock levels.
+
+    Saving the stock together with the position makes a resumed replay exact: orders
+    committed after the checkpoint are undone by restoring the stock before they are
+    replayed again.
+
+    Args:
+        path (str): The checkpoint file.
+        stats (ReplayStats): The totals to save.
+        store (Store): The store being replayed into.
+    """
+    checkpoint = {
+        "stats": stats.to_dict(),
+        "stock": {product.name: product.quantity for product in store.catalog},
+    }
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file, separators=(",", ":"))
+    os.replace(temporary_path, path)
+
+
+def replay_orders(store, lines, checkpoint_path: str = None, checkpoint_every: int = 10_000) -> ReplayStats:
+    """
+    Replay an order log through the parse, resolve, price and commit stages.
+
+    The stages are chained generators, so memory stays constant however long the
+    log is. With a checkpoint file, progress and stock levels are saved every
+    ``checkpoint_every`` input lines. A later call with the same log and store
+    restores the checkpointed stock and resumes after the last checkpoint.
+
+    Args:
+        store (Store): The store that processes the orders.
+        lines (iterable): The order log, one JSON record per line.
+        checkpoint_path (str): The checkpoint file, or None to disable checkpoints.
+        checkpoint_every (int): The number of input lines between checkpoints.
+
+    Returns:
+        ReplayStats: The totals of the whole replay, including resumed progress.
+    """
+    stats = load_checkpoint(checkpoint_path, store)
+    numbered = islice(enumerate(lines, start=1), stats.position, None)
+    pipeline = commit_orders(price_orders(resolve_orders(parse_orders(numbered), store)), store, stats)
+    last_checkpoint = stats.position
+    for position in pipeline:
+        if checkpoint_path is not None and position - last_checkpoint >= checkpoint_every:
+            save_checkpoint(checkpoint_path, stats, store)
+            last_checkpoint = position
+    if checkpoint_path is not None:
+        save_checkpoint(checkpoint_path, stats, store)
+    return stats
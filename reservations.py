@@ -0,0 +1,212 @@
+import heapq
+import itertools
+import threading
+import time
+
+from products import InsufficientStockError
+
+
+class Reservation:
+    """
+    A hold on stock for a shopping list until it is committed, released or expires.
+
+    Attributes:
+        id (int): The reservation's number, unique within its ReservationBook.
+        shopping_list (list): The (Product, quantity) tuples that are held.
+        demand (dict): The held quantity per product.
+        expires_at (float): The clock time at which the holds are released.
+    """
+    __slots__ = ("id", "shopping_list", "demand", "expires_at")
+
+    def __init__(self, reservation_id: int, shopping_list: list, demand: dict, expires_at: float):
+        """
+        Initialize a reservation.
+
+        Args:
+            reservation_id (int): The reservation's number.
+            shopping_list (list): The (Product, quantity) tuples that are held.
+            demand (dict): The held quantity per product.
+            expires_at (float): The clock time at which the holds are released.
+        """
+        self.id = reservation_id
+        self.shopping_list = shopping_list
+        self.demand = demand
+        self.expires_at = expires_at
+
+
+class ReservationBook:
+    """
+    The outstanding reservations of a store and their expiry schedule.
+
+    Holds are recorded on the products themselves (Product.reserved), so the
+    available quantity of a product is known without looking at any reservation.
+    Expiry times are kept in a min-heap: releasing expired holds only looks at the
+    reservations that are due. Reservations that are committed or released early
+    leave their heap entry behind, and it is discarded when it comes due.
+
+    Every change to a product's reserved quantity happens under the book's lock.
+    """
+    def __init__(self, clock=time.monotonic):
+        """
+        Initialize an empty book.
+
+        Args:
+            clock (callable): Returns the current time in seconds; the TTLs use the same unit.
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._outstanding = {}
+        self._expiry = []
+
+    def __len__(self):
+        return len(self._outstanding)
+
+    def __contains__(self, reservation):
+        return self._outstanding.get(getattr(reservation, "id", None)) is reservation
+
+    def hold(self, shopping_list: list, demand: dict, ttl: float) -> Reservation:
+        """
+        Hold stock for a shopping list.
+
+        Args:
+            shopping_list (list): The (Product, quantity) tuples to hold.
+            demand (dict): The total quantity per product, as returned by Store._collect_demand.
+            ttl (float): The number of seconds until the holds expire.
+
+        Returns:
+            Reservation: The new reservation.
+
+        Raises:
+            TypeError: If the TTL is not a number.
+            ValueError: If the TTL is not positive or a product does not have enough
+                available stock. Nothing is held in that case.
+        """
+        if not isinstance(ttl, (int, float)):
+            raise TypeError("TTL must be a number.")
+        if ttl <= 0:
+            raise ValueError("TTL must be positive.")
+        with self._lock:
+            now = self._clock()
+            self._release_due(now)
+            for product, quantity in demand.items():
+                if quantity > product.available:
+                    raise InsufficientStockError(
+                        f"Not enough quantity for product {product.name}. "
+                        f"Requested: {quantity}, Available: {product.available}"
+                    )
+            reservation = Reservation(next(self._ids), list(shopping_list), dict(demand), now + ttl)
+            self._add(reservation)
+            return reservation
+
+    def release(self, reservation: Reservation) -> bool:
+        """
+        Release the holds of a reservation before it expires.
+
+        Args:
+            reservation (Reservation): The reservation to release.
+
+        Returns:
+            bool: True if the reservation was outstanding, False if it had already
+            expired, been committed or been released.
+        """
+        with self._lock:
+            self._release_due(self._clock())
+            if self._outstanding.get(reservation.id) is not reservation:
+                return False
+            self._remove(reservation)
+            return True
+
+    def take(self, reservation: Reservation, demand: dict) -> bool:
+        """
+        Release part of a reservation's holds so that the stock can be bought, keeping the rest.
+
+        Args:
+            reservation (Reservation): The reservation to take from.
+            demand (dict): The quantity to take per product.
+
+        Returns:
+            bool: True if the holds were released, False if the reservation was no longer
+            outstanding or holds less than ``demand``. Nothing changes in that case.
+        """
+        with self._lock:
+            self._release_due(self._clock())
+            if self._outstanding.get(reservation.id) is not reservation:
+                return False
+            if any(quantity > reservation.demand.get(product, 0) for product, quantity in demand.items()):
+                return False
+            for product, quantity in demand.items():
+                reservation.demand[product] -= quantity
+                product.reserved = max(product.reserved - quantity, 0)
+            reservation.shopping_list = [(product, quantity) for product, quantity in reservation.demand.items()
+                                         if quantity]
+            return True
+
+    def put_back(self, reservation: Reservation, demand: dict):
+        """
+        Hold again the stock released by take() for a purchase that failed.
+
+        Args:
+            reservation (Reservation): The reservation the stock was taken from.
+            demand (dict): The quantity taken per product.
+        """
+        with self._lock:
+            outstanding = self._outstanding.get(reservation.id) is reservation
+            for product, quantity in demand.items():
+                reservation.demand[product] = reservation.demand.get(product, 0) + quantity
+                if outstanding:
+                    product.reserved += quantity
+            reservation.shopping_list = [(product, quantity) for product, quantity in reservation.demand.items()
+                                         if quantity]
+
+    def restore(self, reservation: Reservation):
+        """
+        Put back the holds of a reservation that was released for a commit that failed.
+
+        Args:
+            reservation (Reservation): The reservation to restore, keeping its expiry time.
+        """
+        with self._lock:
+            self._add(reservation)
+
+    def release_expired(self) -> int:
+        """
+        Release the holds of every reservation whose TTL has passed.
+
+        Cheap when nothing is due: the earliest expiry is checked without taking the lock.
+
+        Returns:
+            int: The number of reservations that expired.
+        """
+        expiry = self._expiry
+        if not expiry:
+            return 0
+        now = self._clock()
+        if expiry[0][0] > now:
+            return 0
+        with self._lock:
+            return self._release_due(now)
+
+    def _add(self, reservation: Reservation):
+        """Record a reservation's holds and schedule its expiry."""
+        for product, quantity in reservation.demand.items():
+            product.reserved += quantity
+        self._outstanding[reservation.id] = reservation
+        heapq.heappush(self._expiry, (reservation.expires_at, reservation.id))
+
+    def _remove(self, reservation: Reservation):
+        """Take back a reservation's holds; its heap entry is dropped when it comes due."""
+        del self._outstanding[reservation.id]
+        for product, quantity in reservation.demand.items():
+            product.reserved = max(product.reserved - quantity, 0)
+
+    def _release_due(self, now: float) -> int:
+        """Release the reservations that expire at or before ``now``."""
+        expired = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            _, reservation_id = heapq.heappop(self._expiry)
+            reservation = self._outstanding.get(reservation_id)
+            if reservation is not None and reservation.expires_at <= now:
+                self._remove(reservation)
+                expired += 1
+        return expired
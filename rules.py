@@ -0,0 +1,330 @@
+import time
+from abc import ABC, abstractmethod
+
+from money import to_cents, divide_half_even
+from promotions import Promotion
+
+
+class Rule(ABC):
+    """
+    Abstract base class of a pricing rule that grants a discount on a cart.
+
+    Rules are evaluated in order of descending priority; rules with equal priority
+    keep the order in which they were compiled. Discounts of several rules stack,
+    but no product is discounted below zero. Each rule computes its discount from
+    what is still left to pay on its products, after their own promotions and the
+    rules applied before it, so no part of a price is discounted twice. When an
+    exclusive rule grants a discount, no later rule is applied to the products it
+    discounted.
+
+    Attributes:
+        name (str): The rule's name, used to report the discounts granted.
+        priority (int): Rules with a higher priority are applied first.
+        exclusive (bool): Whether the rule stops later rules on its products.
+        starts_at (float or None): The Unix time the rule starts applying, or None.
+        ends_at (float or None): The Unix time the rule stops applying, or None.
+    """
+    def __init__(self, name: str, priority: int = 0, exclusive: bool = False,
+                 starts_at: float = None, ends_at: float = None):
+        """
+        Initialize the common rule settings.
+
+        Args:
+            name (str): The rule's name.
+            priority (int): Rules with a higher priority are applied first.
+            exclusive (bool): Whether the rule stops later rules on its products.
+            starts_at (float or None): The Unix time the rule starts applying, or None.
+            ends_at (float or None): The Unix time the rule stops applying, or None.
+
+        Raises:
+            TypeError: If the priority is not an integer.
+            ValueError: If the name is empty or the time window ends before it starts.
+        """
+        if not name:
+            raise ValueError("Rule name should not be empty.")
+        if not isinstance(priority, int):
+            raise TypeError("Priority must be an integer.")
+        if starts_at is not None and ends_at is not None and ends_at <= starts_at:
+            raise ValueError("A rule's time window must end after it starts.")
+        self.name = name
+        self.priority = priority
+        self.exclusive = exclusive
+        self.starts_at = starts_at
+        self.ends_at = ends_at
+
+    @property
+    def product_names(self):
+        """frozenset or None: The names of the products the rule depends on, or None for every product."""
+        return None
+
+    def active_at(self, now: float) -> bool:
+        """
+        Check whether the rule's time window contains a point in time.
+
+        Args:
+            now (float): The Unix time to check.
+
+        Returns:
+            bool: True if the rule applies at that time.
+        """
+        return (self.starts_at is None or self.starts_at <= now) and (self.ends_at is None or now < self.ends_at)
+
+    @abstractmethod
+    def discount_cents(self, cart: dict, remaining: dict) -> int:
+        """
+        Compute the discount the rule grants on a cart.
+
+        Args:
+            cart (dict): The (Product, quantity) pair per product name.
+            remaining (dict): The amount in cents per product name still left to pay
+                after the rules applied so far, limited to the products the rule may
+                discount; products taken by an exclusive rule are left out.
+
+        Returns:
+            int: The discount in cents; it is capped by the plan at what is left to pay.
+        """
+        pass
+
+
+class ProductRule(Rule):
+    """
+    Applies a Promotion to the lines of some products, on top of their own promotions.
+
+    The promotion's saving on the list price of a line is applied as the same
+    fraction of what is left to pay for the line. A 50% rule on a product that is
+    already 30% off takes half of the remaining 70%, not another half of the list price.
+    """
+    def __init__(self, name: str, product_names, promotion: Promotion, **settings):
+        """
+        Initialize a product rule.
+
+        Args:
+            name (str): The rule's name.
+            product_names (iterable): The names of the products the promotion applies to.
+            promotion (Promotion): The promotion that prices the lines.
+            **settings: priority, exclusive, starts_at and ends_at, see Rule.
+
+        Raises:
+            TypeError: If the promotion is not a Promotion instance.
+            ValueError: If no product names are given.
+        """
+        super().__init__(name, **settings)
+        if not isinstance(promotion, Promotion):
+            raise TypeError("Promotion must be a Promotion instance.")
+        self._product_names = frozenset(product_names)
+        if not self._product_names:
+            raise ValueError("A product rule needs at least one product.")
+        self.promotion = promotion
+
+    @property
+    def product_names(self):
+        """frozenset: The names of the products the promotion applies to."""
+        return self._product_names
+
+    def discount_cents(self, cart: dict, remaining: dict) -> int:
+        """Sum the promotion's discount over the rule's products, scaled to what is left to pay."""
+        discount = 0
+        for name in self._product_names.intersection(remaining):
+            product, quantity = cart[name]
+            list_cents = product.price_cents * quantity
+            if list_cents:
+                promoted_cents = self.promotion.apply_promotion_cents(product.price_cents, quantity)
+                left = remaining[name]
+                discount += left - divide_half_even(left * promoted_cents, list_cents)
+        return discount
+
+
+class BundleRule(Rule):
+    """
+    Sells a fixed combination of products at a bundle price.
+
+    Every complete set of the components in the cart is charged the bundle price
+    instead of what the bundled units cost after their own promotions and earlier
+    rules; units left over keep their price. A bundle that would cost more than
+    its units grants nothing.
+    """
+    def __init__(self, name: str, components: dict, price: float, **settings):
+        """
+        Initialize a bundle rule.
+
+        Args:
+            name (str): The rule's name.
+            components (dict): The quantity of each product name in one bundle.
+            price (float): The price of one bundle.
+            **settings: priority, exclusive, starts_at and ends_at, see Rule.
+
+        Raises:
+            ValueError: If there are no components, a component quantity is not positive
+                or the price is negative.
+        """
+        super().__init__(name, **settings)
+        if not components:
+            raise ValueError("A bundle needs at least one component.")
+        if any(not isinstance(quantity, int) or quantity <= 0 for quantity in components.values()):
+            raise ValueError("Bundle quantities must be positive integers.")
+        if price < 0:
+            raise ValueError("Price should not be negative.")
+        self.components = dict(components)
+        self._product_names = frozenset(components)
+        self.price = price
+        self._price_cents = to_cents(price)
+
+    @property
+    def product_names(self):
+        """frozenset: The names of the bundle's components."""
+        return self._product_names
+
+    def discount_cents(self, cart: dict, remaining: dict) -> int:
+        """Grant what the bundled units are left to cost minus the bundle price of every complete bundle."""
+        if not all(name in remaining for name in self.components):
+            return 0
+        bundles = min(cart[name][1] // quantity for name, quantity in self.components.items())
+        if not bundles:
+            return 0
+        # Each line's remaining amount is spread evenly over its units.
+        units_cents = sum(divide_half_even(remaining[name] * bundles * quantity, cart[name][1])
+                          for name, quantity in self.components.items())
+        return max(units_cents - bundles * self._price_cents, 0)
+
+
+class CartRule(Rule):
+    """
+    Discounts the whole cart once what is left to pay reaches a threshold.
+    """
+    def __init__(self, name: str, threshold: float, percent: float = None, amount: float = None, **settings):
+        """
+        Initialize a cart rule with either a percentage or a fixed amount off.
+
+        Args:
+            name (str): The rule's name.
+            threshold (float): The cart amount from which the rule applies.
+            percent (float or None): The percentage taken off the cart.
+            amount (float or None): The fixed amount taken off the cart.
+            **settings: priority, exclusive, starts_at and ends_at, see Rule.
+
+        Raises:
+            ValueError: If not exactly one of percent and amount is given, or a value is negative.
+        """
+        super().__init__(name, **settings)
+        if (percent is None) == (amount is None):
+            raise ValueError("A cart rule needs either a percent or an amount.")
+        if threshold < 0 or (percent or 0) < 0 or (amount or 0) < 0:
+            raise ValueError("Cart rule values should not be negative.")
+        self.threshold = threshold
+        self.percent = percent
+        self.amount = amount
+        self._threshold_cents = to_cents(threshold)
+        self._basis_points = None if percent is None else round(percent * 100)
+        self._amount_cents = None if amount is None else to_cents(amount)
+
+    def discount_cents(self, cart: dict, remaining: dict) -> int:
+        """Take the percentage or amount off once the remaining subtotal reaches the threshold."""
+        subtotal = sum(remaining.values())
+        if subtotal < self._threshold_cents:
+            return 0
+        if self._amount_cents is not None:
+            return self._amount_cents
+        return divide_half_even(subtotal * self._basis_points, 10_000)
+
+
+class PricingPlan:
+    """
+    A rule set compiled for evaluation.
+
+    Compiling ranks the rules once and indexes them by the product names they
+    depend on. Evaluating a cart only looks at the rules of the products in the
+    cart plus the cart-level rules; the other rules are never touched. A plan is
+    immutable, so a store can switch to a new plan by replacing its reference.
+    """
+    def __init__(self, rules):
+        """
+        Compile a rule set.
+
+        Args:
+            rules (iterable): The Rule instances.
+
+        Raises:
+            TypeError: If an item is not a Rule.
+            ValueError: If two rules share a name.
+        """
+        self.rules = tuple(rules)
+        names = set()
+        for rule in self.rules:
+            if not isinstance(rule, Rule):
+                raise TypeError("All rules must be Rule instances.")
+            if rule.name in names:
+                raise ValueError(f"Rule {rule.name} is defined twice.")
+            names.add(rule.name)
+        ranked = sorted(range(len(self.rules)), key=lambda index: (-self.rules[index].priority, index))
+        self._rank = {self.rules[index]: rank for rank, index in enumerate(ranked)}
+        self._by_product = {}
+        cart_rules = []
+        for index in ranked:
+            rule = self.rules[index]
+            if rule.product_names is None:
+                cart_rules.append(rule)
+                continue
+            for name in rule.product_names:
+                self._by_product.setdefault(name, []).append(rule)
+        self._cart_rules = tuple(cart_rules)
+        self._by_product = {name: tuple(rules) for name, rules in self._by_product.items()}
+
+    def rules_for(self, product_names) -> list:
+        """
+        Return the rules that can apply to a cart with the given products, in evaluation order.
+
+        Args:
+            product_names (iterable): The names of the products in the cart.
+
+        Returns:
+            list: The relevant Rule instances.
+        """
+        relevant = set(self._cart_rules)
+        for name in product_names:
+            relevant.update(self._by_product.get(name, ()))
+        return sorted(relevant, key=self._rank.__getitem__)
+
+    def evaluate(self, lines, now: float = None) -> tuple:
+        """
+        Compute the rule discounts of a cart.
+
+        Args:
+            lines (iterable): (Product, quantity, line total in cents) tuples; the line
+                totals already include the products' own promotions.
+            now (float or None): The Unix time used for the time windows; defaults to now.
+
+        Returns:
+            tuple: The total discount in cents and a dict of the discount in cents granted
+            by each rule that applied.
+        """
+        cart = {}
+        remaining = {}
+        for product, quantity, line_cents in lines:
+            name = product.name
+            if name in cart:
+                quantity += cart[name][1]
+            cart[name] = (product, quantity)
+            remaining[name] = remaining.get(name, 0) + line_cents
+        if now is None:
+            now = time.time()
+        applied = {}
+        blocked = set()
+        for rule in self.rules_for(cart):
+            if not rule.active_at(now):
+                continue
+            names = rule.product_names
+            targets = [name for name in remaining if name not in blocked and (names is None or name in names)]
+            scope = {name: remaining[name] for name in targets}
+            discount = min(rule.discount_cents(cart, scope), sum(scope.values()))
+            if discount <= 0:
+                continue
+            applied[rule.name] = discount
+            # Take the discount off the rule's products in cart order.
+            left = discount
+            for name in targets:
+                taken = min(left, remaining[name])
+                remaining[name] -= taken
+                left -= taken
+            if rule.exclusive:
+                blocked.update(targets)
+        return sum(applied.values()), applied
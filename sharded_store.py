@@ -0,0 +1,289 @@
+import itertools
+import multiprocessing
+import threading
+import zlib
+
+from money import from_cents
+from products import InsufficientStockError, product_to_dict, product_from_dict
+from store import Store
+
+
+def shard_of(name: str, shards: int) -> int:
+    """
+    Return the shard that owns a product name.
+
+    Args:
+        name (str): The product's name.
+        shards (int): The number of shards.
+
+    Returns:
+        int: The shard index, stable across processes and runs.
+    """
+    return zlib.crc32(name.encode("utf-8")) % shards
+
+
+def _shard_main(connection, product_dicts: list):
+    """
+    Serve one shard: own a Store with a slice of the catalog and run its purchases.
+
+    Requests are (command, *arguments) tuples and replies are ("ok", result) or
+    ("error", message) tuples. Shopping lists travel as (name, quantity) pairs.
+    """
+    store = Store([product_from_dict(data) for data in product_dicts])
+    prepared = {}
+
+    def resolve(lines):
+        shopping_list = []
+        for name, quantity in lines:
+            product = store.get_product(name)
+            if product is None:
+                raise ValueError(f"Product {name} not found in the store.")
+            shopping_list.append((product, quantity))
+        return shopping_list
+
+    def validate(shopping_list):
+        for product, quantity in store._collect_demand(shopping_list).items():
+            if quantity > product.quantity:
+                raise InsufficientStockError(
+                    f"Not enough quantity for product {product.name}. "
+                    f"Requested: {quantity}, Available: {product.quantity}"
+                )
+
+    while True:
+        command, *arguments = connection.recv()
+        try:
+            if command == "stop":
+                connection.send(("ok", None))
+                return
+            if command == "prepare":
+                txn_id, lines = arguments
+                shopping_list = resolve(lines)
+                validate(shopping_list)
+                prepared[txn_id] = shopping_list
+                result = None
+            elif command == "commit":
+                shopping_list = prepared.pop(arguments[0])
+                result = [product.buy_cents(quantity) for product, quantity in shopping_list]
+            elif command == "abort":
+                prepared.pop(arguments[0], None)
+                result = None
+            elif command == "order_many":
+                orders = []
+                failures = {}
+                for index, lines in enumerate(arguments[0]):
+                    try:
+                        orders.append(resolve(lines))
+                    except ValueError as error:
+                        orders.append([])
+                        failures[index] = str(error)
+                totals, order_failures = store.order_many(orders)
+                failures.update(order_failures)
+                result = ([None if index in failures else total for index, total in enumerate(totals)],
+                          failures)
+            elif command == "products":
+                result = [product_to_dict(product) for product in store.list_of_products]
+            elif command == "total_quantity":
+                result = store.get_total_quantity()
+            else:
+                raise ValueError(f"Unknown shard command {command}.")
+        except Exception as error:  # Report any failure to the coordinator; the shard keeps serving.
+            connection.send(("error", str(error) or type(error).__name__))
+        else:
+            connection.send(("ok", result))
+
+
+class ShardedStore:
+    """
+    A store whose catalog is partitioned across worker processes by product name.
+
+    Each shard process owns its slice of the catalog and runs every Product.buy for
+    it, so order processing is not bound to the coordinator's core. The coordinator
+    routes each shopping-list line to its shard. Orders that span several shards are
+    committed all-or-nothing with two phases: every shard first validates and holds
+    its lines, and only when all of them succeed are the lines bought. Shards return
+    line totals in integer cents, so totals match Store.order exactly.
+
+    Shopping lists hold (name, quantity) or (Product, quantity) pairs.
+    """
+    def __init__(self, products: list, processes: int = 4):
+        """
+        Partition the products and start one shard process per partition.
+
+        Args:
+            products (list): The Product instances of the catalog.
+            processes (int): The number of shard processes.
+
+        Raises:
+            ValueError: If processes is not positive or two products share a name.
+        """
+        if processes <= 0:
+            raise ValueError("Processes must be positive.")
+        partitions = [[] for _ in range(processes)]
+        names = set()
+        for product in products:
+            if product.name in names:
+                raise ValueError(f"Product {product.name} is already in the store.")
+            names.add(product.name)
+            partitions[shard_of(product.name, processes)].append(product_to_dict(product))
+        self.processes = processes
+        self._lock = threading.Lock()
+        self._txn_ids = itertools.count()
+        self._connections = []
+        self._workers = []
+        for partition in partitions:
+            parent_connection, child_connection = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=_shard_main, args=(child_connection, partition), daemon=True)
+            worker.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._workers.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def order(self, shopping_list: list) -> float:
+        """
+        Process an order, committing it on every involved shard or on none.
+
+        Args:
+            shopping_list (list): A list of (name or Product, quantity) tuples.
+
+        Returns:
+            float: The total price for the order.
+
+        Raises:
+            TypeError: If a quantity is not an integer.
+            ValueError: If the shopping list is improperly formatted, a product is
+                unknown, or any shard rejects its lines. No stock changes in that case.
+        """
+        routed = self._route(shopping_list)
+        with self._lock:
+            txn_id = next(self._txn_ids)
+            replies = self._request_all({shard: ("prepare", txn_id, lines) for shard, (lines, _) in routed.items()})
+            errors = [result for status, result in replies.values() if status == "error"]
+            if errors:
+                self._request_all({shard: ("abort", txn_id) for shard, (status, _) in replies.items()
+                                   if status == "ok"})
+                raise ValueError(errors[0])
+            replies = self._request_all({shard: ("commit", txn_id) for shard in routed})
+        total_cents = 0
+        for shard in routed:
+            total_cents += sum(replies[shard][1])
+        return from_cents(total_cents)
+
+    def order_many(self, orders: list) -> tuple:
+        """
+        Process a batch of orders, sending each shard its single-shard orders in one request.
+
+        Single-shard orders run as one Store.order_many batch per shard, and all shards
+        work on their batches at the same time. Orders that span shards are committed
+        afterwards with order(), one at a time.
+
+        Args:
+            orders (list): A list of shopping lists.
+
+        Returns:
+            tuple: A list of order totals aligned with ``orders`` (None for failed orders)
+            and a dict mapping the index of each failed order to its error message.
+        """
+        totals = [None] * len(orders)
+        failures = {}
+        batches = {}
+        spanning = []
+        for index, shopping_list in enumerate(orders):
+            try:
+                routed = self._route(shopping_list)
+            except (TypeError, ValueError) as error:
+                failures[index] = str(error)
+                continue
+            if len(routed) == 1:
+                (shard, (lines, _)), = routed.items()
+                batch = batches.setdefault(shard, ([], []))
+                batch[0].append(index)
+                batch[1].append(lines)
+            elif routed:
+                spanning.append(index)
+            else:
+                totals[index] = 0.0
+        with self._lock:
+            replies = self._request_all({shard: ("order_many", batch_orders)
+                                         for shard, (_, batch_orders) in batches.items()})
+        for shard, (indexes, _) in batches.items():
+            status, result = replies[shard]
+            if status == "error":
+                failures.update({index: result for index in indexes})
+                continue
+            shard_totals, shard_failures = result
+            for position, index in enumerate(indexes):
+                totals[index] = shard_totals[position]
+                if position in shard_failures:
+                    failures[index] = shard_failures[position]
+        for index in spanning:
+            try:
+                totals[index] = self.order(orders[index])
+            except ValueError as error:
+                failures[index] = str(error)
+        return totals, failures
+
+    def get_total_quantity(self) -> int:
+        """
+        Return the total quantity of all products across the shards.
+
+        Returns:
+            int: The sum of the quantities of all products.
+        """
+        with self._lock:
+            replies = self._request_all({shard: ("total_quantity",) for shard in range(self.processes)})
+        return sum(result for _, result in replies.values())
+
+    def get_all_products(self) -> list:
+        """
+        Return copies of the active products of every shard.
+
+        The products are snapshots; buying them does not change the shards' stock.
+
+        Returns:
+            list: A list of active Product instances.
+        """
+        with self._lock:
+            replies = self._request_all({shard: ("products",) for shard in range(self.processes)})
+        products = [product_from_dict(data) for shard in sorted(replies) for data in replies[shard][1]]
+        return [product for product in products if product.active]
+
+    def close(self):
+        """
+        Stop the shard processes.
+        """
+        with self._lock:
+            if not self._workers:
+                return
+            self._request_all({shard: ("stop",) for shard in range(self.processes)})
+            for worker in self._workers:
+                worker.join()
+            for connection in self._connections:
+                connection.close()
+            self._workers = []
+
+    def _route(self, shopping_list: list) -> dict:
+        """Group the lines of a shopping list by shard, keeping their positions."""
+        routed = {}
+        for position, item in enumerate(shopping_list):
+            if not (isinstance(item, tuple) and len(item) == 2):
+                raise ValueError("Shopping list must contain tuples of (Product, quantity).")
+            product, quantity = item
+            if not isinstance(quantity, int) or isinstance(quantity, bool):
+                raise TypeError("Quantity must be an integer.")
+            name = product if isinstance(product, str) else product.name
+            lines, positions = routed.setdefault(shard_of(name, self.processes), ([], []))
+            lines.append((name, quantity))
+            positions.append(position)
+        return routed
+
+    def _request_all(self, requests: dict) -> dict:
+        """Send one request per shard, then collect the replies, so shards work in parallel."""
+        for shard, request in requests.items():
+            self._connections[shard].send(request)
+        return {shard: self._connections[shard].recv() for shard in requests}
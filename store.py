@@ -1,25 +1,98 @@
-from products import Product
+import threading
+from collections import Counter
+from contextlib import ExitStack, nullcontext
+from itertools import chain
+
+from products import (Product, LimitedProduct, InsufficientStockError, PurchaseLimitError,
+                      product_to_dict)
+from catalog import Catalog
+from money import CENTS_PER_UNIT, from_cents
+from reservations import ReservationBook
+from listing import ProductListing
+from catalog_index import CatalogIndex
+from events import ChangeFeed
 
 class Store:
     """
     Manages a collection of products in the store.
+
+    Products are kept in an indexed Catalog keyed by product name, so lookup,
+    removal and listing of active products do not scan the whole collection.
+
+    A thread-safe store guards every product with its own lock. Orders lock the
+    products they touch in a fixed order (by name), so orders over disjoint
+    products run in parallel, orders over shared products serialize, and no two
+    orders can deadlock. Each order validates and commits while holding its locks,
+    so it is applied all-or-nothing.
+
+    A store can be made durable by attaching a StorePersistence as ``journal``;
+    orders, added and removed products and stock updates are then journaled.
+
+    Stock can be held for a shopping list with reserve() and bought later with
+    commit(). Held stock is excluded from each product's available quantity until
+    the reservation is committed, released or expires. Reservations are not journaled.
+
+    Cart-wide pricing rules (bundles, cart discounts, stacked promotions) apply to
+    orders and quotes once a compiled rules.PricingPlan is assigned to ``rules``.
+
+    Incremental consumers can follow the catalog through ``changes``, a numbered
+    feed of product additions, removals and field changes.
+
+    Stock spread over several warehouses is modeled by assigning a
+    locations.Inventory to ``inventory``; orders are then routed to locations and
+    each product's quantity is the total over its locations. set_location_stock
+    restocks one location under the product's lock.
     """
-    def __init__(self, list_of_products: list):
+    def __init__(self, list_of_products: list, thread_safe: bool = False):
         """
         Initialize the store with a list of products.
 
         Args:
             list_of_products (list): A list containing Product instances.
+            thread_safe (bool): Whether orders may be placed from several threads at once.
 
         Raises:
             TypeError: If list_of_products is not a list or if items are not valid Product instances.
+            ValueError: If two products share the same name.
         """
         if not isinstance(list_of_products, list):
             raise TypeError("list_of_products must be a list.")
         for item in list_of_products:
             if not hasattr(item, "buy"):
                 raise TypeError("All items must be product instances.")
-        self.list_of_products = list_of_products
+        self.catalog = Catalog(list_of_products, thread_safe=thread_safe)
+        self._product_locks = {} if thread_safe else None
+        self.journal = None
+        self.reservations = ReservationBook()
+        self.rules = None
+        self._listing = None
+        self._index = None
+        self._changes = None
+        self.inventory = None
+
+    @property
+    def thread_safe(self) -> bool:
+        """bool: Whether the store guards orders with per-product locks."""
+        return self._product_locks is not None
+
+    @property
+    def listing(self) -> ProductListing:
+        """ProductListing: The cached, paginated listing of the active products, created on first use."""
+        if self._listing is None:
+            self._listing = ProductListing(self)
+        return self._listing
+
+    @property
+    def changes(self) -> ChangeFeed:
+        """ChangeFeed: The feed of catalog changes, recording changes from its first use."""
+        if self._changes is None:
+            self._changes = ChangeFeed(self.catalog)
+        return self._changes
+
+    @property
+    def list_of_products(self) -> list:
+        """list: All products in the store, active or not, in insertion order."""
+        return list(self.catalog)
 
     def add_product(self, product):
         """
@@ -29,13 +102,43 @@ class Store:
             product (Product): The product instance to add.
 
         Raises:
-            ValueError: If the product is None or falsy.
+            ValueError: If the product is None or falsy, or a product with the same name exists.
         """
         if not product:
             raise ValueError("Product should not be empty.")
-        self.list_of_products.append(product)
+        self.catalog.add(product)
+        if self.journal is not None:
+            self.journal.record("add", product=product_to_dict(product))
+        self._publish_changes()
         print(f"Added {product.show()} to the store.")
 
+    def add_products(self, products: list):
+        """
+        Add many products to the store without printing anything.
+
+        The products are checked before any of them is added, so either all of them
+        are added or none is.
+
+        Args:
+            products (list): The product instances to add.
+
+        Raises:
+            TypeError: If an item is not a product instance.
+            ValueError: If a name is already in the store or appears twice in the list.
+        """
+        names = set()
+        for product in products:
+            if not hasattr(product, "buy"):
+                raise TypeError("All items must be product instances.")
+            if product.name in names or self.catalog.get(product.name) is not None:
+                raise ValueError(f"Product {product.name} is already in the store.")
+            names.add(product.name)
+        for product in products:
+            self.catalog.add(product)
+            if self.journal is not None:
+                self.journal.record("add", product=product_to_dict(product))
+        self._publish_changes()
+
     def remove_product(self, product):
         """
         Remove a product from the store.
@@ -48,55 +151,526 @@ class Store:
         """
         if not product:
             raise ValueError("Product should not be empty.")
-        if product in self.list_of_products:
-            self.list_of_products.remove(product)
-        else:
+        self.catalog.remove(product)
+        if self.journal is not None:
+            self.journal.record("remove", name=product.name)
+        self._publish_changes()
+
+    def update_stock(self, product, quantity: int):
+        """
+        Set the stock of a product, reactivating it if the new quantity is positive.
+
+        Args:
+            product (Product): The product to restock.
+            quantity (int): The new quantity.
+
+        Raises:
+            TypeError: If the quantity is not an integer.
+            ValueError: If the quantity is negative or the product is not in the store.
+        """
+        if product not in self.catalog:
+            raise ValueError("Product not found in the store.")
+        with self._locked([product]):
+            product.quantity = quantity
+            if quantity > 0:
+                product.active = True
+            if self.journal is not None:
+                self.journal.record("stock", name=product.name, quantity=product.quantity,
+                                    active=product.active)
+        self._publish_changes()
+
+    def set_location_stock(self, product, location: str, quantity: int):
+        """
+        Set the stock of a product at one location of the store's inventory.
+
+        Unlike calling Inventory.set_stock directly, this holds the product's lock, so
+        on a thread-safe store the change cannot interleave with an order of the product.
+
+        Args:
+            product (Product): The product to restock.
+            location (str): The location's name.
+            quantity (int): The new quantity at that location.
+
+        Raises:
+            TypeError: If the quantity is not an integer.
+            ValueError: If the store has no inventory, the product is not in the store,
+                the quantity is negative or the location is unknown.
+        """
+        if self.inventory is None:
+            raise ValueError("The store has no inventory.")
+        if product not in self.catalog:
             raise ValueError("Product not found in the store.")
+        with self._locked([product]):
+            self.inventory.set_stock(product, location, quantity)
+            if self.journal is not None:
+                self.journal.record("stock", name=product.name, quantity=product.quantity,
+                                    active=product.active)
+        self._publish_changes()
+
+    def get_product(self, name: str):
+        """
+        Look up a product by its name.
+
+        Args:
+            name (str): The product's name.
+
+        Returns:
+            Product or None: The matching product, or None if it is not in the store.
+        """
+        return self.catalog.get(name)
+
+    def query(self, text: str = "", min_price: float = None, max_price: float = None,
+              in_stock: bool = False, page: int = 1, size: int = 20) -> tuple:
+        """
+        Search the products by name words, price range and stock, one page at a time.
+
+        The name and price indexes are built on the first query and kept up to date
+        with every later change to the store. Every word of ``text`` must be a prefix
+        of a word of the product name, ignoring case. Results are ordered by price,
+        then by name.
+
+        Args:
+            text (str): The search words; empty to match every product.
+            min_price (float or None): The lowest price to include.
+            max_price (float or None): The highest price to include.
+            in_stock (bool): Whether to include only active products with available stock.
+            page (int): The page number, starting at 1.
+            size (int): The number of products per page.
+
+        Returns:
+            tuple: The list of products on the page and whether more pages follow.
+
+        Raises:
+            ValueError: If the page number or size is not positive.
+        """
+        if self._index is None:
+            self._index = CatalogIndex(self.catalog)
+        self.reservations.release_expired()
+        return self._index.query(text, min_price, max_price, in_stock, page, size)
 
     def get_total_quantity(self) -> int:
         """
-        Calculate the total quantity of all products in the store.
+        Return the total quantity of all products in the store.
+
+        The value is maintained incrementally, so this runs in constant time.
 
         Returns:
             int: The sum of the quantities of all products.
         """
-        return sum(product.quantity for product in self.list_of_products)
+        return self.catalog.total_quantity
+
+    def get_available_quantity(self) -> int:
+        """
+        Return the total quantity of all products that is not held by a reservation.
+
+        Expired reservations are released first.
+
+        Returns:
+            int: The total quantity minus the held quantity.
+        """
+        self.reservations.release_expired()
+        return self.catalog.total_quantity - self.catalog.total_reserved
+
+    def get_total_value(self) -> float:
+        """
+        Return the total value of the stock at list price.
+
+        Returns:
+            float: The sum of price times quantity over all products.
+        """
+        return self.catalog.total_value
+
+    def get_active_count(self) -> int:
+        """
+        Return the number of active products in the store.
+
+        Returns:
+            int: The number of active products.
+        """
+        return self.catalog.active_count
+
+    def get_inactive_count(self) -> int:
+        """
+        Return the number of inactive products in the store.
+
+        Returns:
+            int: The number of inactive products.
+        """
+        return self.catalog.inactive_count
+
+    def verify_aggregates(self) -> bool:
+        """
+        Verify the running inventory aggregates against a full recompute.
+
+        Returns:
+            bool: True if the aggregates are consistent.
+
+        Raises:
+            AssertionError: If any aggregate has drifted from the recomputed value.
+        """
+        return self.catalog.verify_aggregates()
 
     def get_all_products(self) -> list:
         """
         Retrieve all active products from the store.
 
+        Expired reservations are released first, so the products' available
+        quantities are current.
+
         Returns:
             list: A list of active Product instances.
         """
-        return [product for product in self.list_of_products if product.active]
+        self.reservations.release_expired()
+        return self.catalog.active_products()
+
+    def quote(self, shopping_list: list) -> float:
+        """
+        Price a shopping list without placing the order.
+
+        The stock is neither checked nor changed, which makes quotes suitable for cart
+        previews. Line prices come from Product.quote and are memoized.
+
+        Args:
+            shopping_list (list): A list of tuples, where each tuple contains a Product and the quantity to price.
+
+        Returns:
+            float: The total price the order would have.
+
+        Raises:
+            ValueError: If the shopping list is improperly formatted, a quantity is not positive
+                or a line exceeds a LimitedProduct's per-order limit.
+        """
+        self._collect_demand(shopping_list)
+        self.reservations.release_expired()
+        line_cents = [product.quote_cents(quantity) for product, quantity in shopping_list]
+        return from_cents(self._cart_cents(shopping_list, line_cents))
 
-    def order(self, shopping_list: list) -> float:
+    def order(self, shopping_list: list, destination=None) -> float:
         """
         Process an order based on the provided shopping list.
 
+        With an inventory, each product's quantity is drawn from the locations chosen
+        by the inventory's routing strategy and split over several of them if needed.
+
         Args:
             shopping_list (list): A list of tuples, where each tuple contains a Product and the quantity to purchase.
+            destination (tuple or None): The (x, y) coordinates the order is shipped to, used by routing.
 
         Returns:
             float: The total price for the order.
 
         Raises:
-            ValueError: If the shopping list is improperly formatted or if any product's quantity is insufficient.
+            TypeError: If a quantity is not an integer.
+            ValueError: If the shopping list is improperly formatted, if any product's quantity
+                is insufficient or if a line exceeds a LimitedProduct's per-order limit.
+                In that case no product is changed.
         """
-        if not all(isinstance(item, tuple) and len(item) == 2 for item in shopping_list):
-            raise ValueError("Shopping list must contain tuples of (Product, quantity).")
-        total_price = 0.0
-        # Validate each item before processing the order.
-        for product, quantity in shopping_list:
-            if quantity <= 0:
-                raise ValueError("Quantity must be positive.")
-            if quantity > product.quantity:
-                raise ValueError(
+        demand = self._collect_demand(shopping_list)
+        if self._product_locks is None:
+            total = self._place_order(shopping_list, demand, destination)
+        else:
+            with self._locked(demand):
+                total = self._place_order(shopping_list, demand, destination)
+        if self._changes is not None:
+            self._changes.flush()
+        return total
+
+    def reserve(self, shopping_list: list, ttl: float):
+        """
+        Hold stock for a shopping list so that it can be ordered later.
+
+        The same checks as order() apply, including the per-order limits of
+        LimitedProduct, but against the available quantity; stock held by other
+        reservations cannot be reserved or bought.
+
+        Args:
+            shopping_list (list): A list of tuples, where each tuple contains a Product and the quantity to hold.
+            ttl (float): The number of seconds until the holds expire.
+
+        Returns:
+            Reservation: The reservation to pass to commit() or release().
+
+        Raises:
+            TypeError: If the TTL is not a number.
+            ValueError: If the shopping list is improperly formatted, a quantity is not positive
+                or exceeds the available quantity or a LimitedProduct's limit, or the TTL is
+                not positive. Nothing is held in that case.
+        """
+        demand = self._collect_demand(shopping_list)
+        with self._locked(demand):
+            return self.reservations.hold(shopping_list, demand, ttl)
+
+    def allocate(self, product, quantity: int, ttl: float):
+        """
+        Hold a block of one product's stock, to be sold in parts with commit().
+
+        Unlike reserve(), the per-order limit of a LimitedProduct does not apply to
+        the block; it applies to each order committed from it.
+
+        Args:
+            product (Product): The product to hold.
+            quantity (int): The quantity to hold.
+            ttl (float): The number of seconds until the hold expires.
+
+        Returns:
+            Reservation: The reservation holding the block.
+
+        Raises:
+            TypeError: If the TTL is not a number.
+            ValueError: If the product is not in the store, the quantity is not positive or
+                exceeds the available quantity, or the TTL is not positive.
+        """
+        if product not in self.catalog:
+            raise ValueError("Product not found in the store.")
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Quantity must be positive.")
+        with self._locked([product]):
+            return self.reservations.hold([(product, quantity)], {product: quantity}, ttl)
+
+    def commit(self, reservation, shopping_list: list = None) -> float:
+        """
+        Place the order of a reservation, buying the held stock.
+
+        With a shopping list, only that part of the held stock is bought and the
+        rest stays held.
+
+        Args:
+            reservation (Reservation): A reservation returned by reserve() or allocate().
+            shopping_list (list or None): The (Product, quantity) tuples to buy from the
+                reservation; None to buy everything it holds.
+
+        Returns:
+            float: The total price for the order.
+
+        Raises:
+            ValueError: If the reservation has expired, was already committed or released,
+                holds less than the shopping list, or its stock was lowered below the held
+                quantity by update_stock. The holds are kept in the last case.
+        """
+        if shopping_list is not None:
+            demand = self._collect_demand(shopping_list)
+            with self._locked(demand):
+                if not self.reservations.take(reservation, demand):
+                    raise ValueError("Reservation has expired, is no longer outstanding "
+                                     "or does not hold the shopping list.")
+                try:
+                    total = self._place_order(shopping_list, demand)
+                except ValueError:
+                    self.reservations.put_back(reservation, demand)
+                    raise
+        else:
+            with self._locked(reservation.demand):
+                if not self.reservations.release(reservation):
+                    raise ValueError("Reservation has expired or is no longer outstanding.")
+                try:
+                    total = self._place_order(reservation.shopping_list, reservation.demand)
+                except ValueError:
+                    self.reservations.restore(reservation)
+                    raise
+        self._publish_changes()
+        return total
+
+    def release(self, reservation) -> bool:
+        """
+        Release the holds of a reservation without ordering.
+
+        Args:
+            reservation (Reservation): A reservation returned by reserve().
+
+        Returns:
+            bool: True if the holds were released, False if the reservation was no
+            longer outstanding.
+        """
+        return self.reservations.release(reservation)
+
+    def _publish_changes(self):
+        """Deliver the recorded catalog changes to the change feed's subscribers, outside any product lock."""
+        if self._changes is not None:
+            self._changes.flush()
+
+    def _place_order(self, shopping_list: list, demand: dict, destination=None) -> float:
+        """Check the grouped demand against available stock, buy every line and journal the order."""
+        # Holds whose TTL has passed must not block the sale; a heap peek when none is due.
+        self.reservations.release_expired()
+        for product, quantity in demand.items():
+            if quantity > product.available:
+                raise InsufficientStockError(
                     f"Not enough quantity for product {product.name}. "
-                    f"Requested: {quantity}, Available: {product.quantity}"
+                    f"Requested: {quantity}, Available: {product.available}"
                 )
-        # Process the order.
-        for product, quantity in shopping_list:
-            total_price += product.buy(quantity)
-        return total_price
+        if self.inventory is None:
+            line_cents = [product.buy_cents(quantity) for product, quantity in shopping_list]
+        else:
+            with self.inventory.fulfill(demand, destination):
+                line_cents = [product.buy_cents(quantity) for product, quantity in shopping_list]
+        if self.journal is not None:
+            self._journal_order(demand)
+        return from_cents(self._cart_cents(shopping_list, line_cents))
+
+    def _cart_cents(self, shopping_list: list, line_cents: list) -> int:
+        """Add up the line totals of an order and take off the discounts of the pricing rules."""
+        total_cents = sum(line_cents)
+        if self.rules is not None:
+            discount, _ = self.rules.evaluate(
+                (product, quantity, cents) for (product, quantity), cents in zip(shopping_list, line_cents)
+            )
+            total_cents -= discount
+        return total_cents
+
+    def _journal_order(self, demand: dict):
+        """Journal the products and quantities of an order with the resulting stock."""
+        self.journal.record(
+            "order",
+            lines=[[product.name, quantity] for product, quantity in demand.items()],
+            stock={product.name: product.quantity for product in demand},
+        )
+
+    def _locked(self, products) -> ExitStack:
+        """
+        Acquire the locks of the given products in a deadlock-free order.
+
+        Args:
+            products (iterable): The products to lock.
+
+        Returns:
+            ExitStack: A context manager that releases the locks on exit.
+        """
+        stack = ExitStack()
+        if self._product_locks is None:
+            return stack
+        for product in sorted(products, key=lambda product: (product.name, id(product))):
+            lock = self._product_locks.get(product)
+            if lock is None:
+                lock = self._product_locks.setdefault(product, threading.Lock())
+            stack.enter_context(lock)
+        return stack
+
+    def order_many(self, orders: list) -> tuple:
+        """
+        Process a batch of orders in a single pass over the affected products.
+
+        Demand is grouped per product across the batch, so each product's stock is
+        validated once and written once, instead of once per order line. Line prices
+        are computed through the product's promotion once per distinct
+        (product, quantity) pair in the batch.
+
+        Orders are applied in sequence: an order fails if any of its lines cannot be
+        served from the stock left by the orders before it, and a failed order does
+        not affect the rest of the batch. With an inventory, the grouped demand is
+        drawn from the locations chosen by its routing strategy, as in order().
+
+        Args:
+            orders (list): A list of shopping lists, each in the format accepted by order().
+
+        Returns:
+            tuple: A list of order totals aligned with ``orders`` (None for failed orders)
+            and a dict mapping the index of each failed order to its error message.
+
+        Raises:
+            InsufficientStockError: If the inventory's locations together hold less than
+                the grouped demand of a product; nothing is changed in that case.
+        """
+        line_totals = {}
+        line_total = line_totals.__getitem__
+        accepted = []
+        totals = []
+        failures = {}
+        for index, shopping_list in enumerate(orders):
+            try:
+                try:
+                    total = sum(map(line_total, shopping_list))
+                except KeyError:
+                    # First time this batch sees one of the lines: validate and price it.
+                    for line in shopping_list:
+                        if line not in line_totals:
+                            self._collect_demand([line])
+                            line_totals[line] = line[0]._cents_for(line[1])
+                    total = sum(map(line_total, shopping_list))
+                # 1.0 and True hash like 1, so a cached line does not prove the quantity is an int.
+                for _, quantity in shopping_list:
+                    if quantity.__class__ is not int:
+                        raise TypeError("Quantity must be an integer.")
+            except (TypeError, ValueError) as error:
+                totals.append(None)
+                failures[index] = str(error) if isinstance(error, ValueError) else \
+                    "Shopping list must contain tuples of (Product, quantity) with integer quantities."
+                continue
+            if self.rules is not None:
+                total = self._cart_cents(shopping_list, list(map(line_total, shopping_list)))
+            totals.append(total / CENTS_PER_UNIT)  # from_cents, without a call per order
+            accepted.append(shopping_list)
+        demand = {}
+        for (product, quantity), count in Counter(chain.from_iterable(accepted)).items():
+            demand[product] = demand.get(product, 0) + quantity * count
+
+        with self._locked(demand):
+            self.reservations.release_expired()
+            self._commit_batch(orders, totals, failures, demand)
+        self._publish_changes()
+        return totals, failures
+
+    def _commit_batch(self, orders: list, totals: list, failures: dict, demand: dict):
+        """Allocate oversubscribed products order by order, then commit the grouped demand."""
+        # Validate the grouped demand once per product. Only orders touching a product
+        # whose batch demand exceeds its stock need to be allocated one by one.
+        short = {product for product, quantity in demand.items() if quantity > product.available}
+        if short:
+            remaining = {product: product.available for product in short}
+            for index, shopping_list in enumerate(orders):
+                if totals[index] is None or not any(product in short for product, _ in shopping_list):
+                    continue
+                order_demand = self._collect_demand(shopping_list)
+                for product, quantity in order_demand.items():
+                    if product in short and quantity > remaining[product]:
+                        totals[index] = None
+                        failures[index] = (
+                            f"Not enough quantity for product {product.name}. "
+                            f"Requested: {quantity}, Available: {remaining[product]}"
+                        )
+                        for failed_product, failed_quantity in order_demand.items():
+                            demand[failed_product] -= failed_quantity
+                        break
+                else:
+                    for product in short.intersection(order_demand):
+                        remaining[product] -= order_demand[product]
+
+        # Commit the grouped demand with one quantity update per product, drawn from the
+        # locations the inventory routes it to, like Store.order.
+        committed = {product: quantity for product, quantity in demand.items() if quantity}
+        if not committed:
+            return
+        with nullcontext() if self.inventory is None else self.inventory.fulfill(committed):
+            for product, quantity in committed.items():
+                product.quantity -= quantity
+        if self.journal is not None:
+            self._journal_order(committed)
+
+    @staticmethod
+    def _collect_demand(shopping_list: list) -> dict:
+        """
+        Validate the format of a shopping list and sum the requested quantity per product.
+
+        Args:
+            shopping_list (list): A list of (Product, quantity) tuples.
+
+        Returns:
+            dict: The total requested quantity per product.
+
+        Raises:
+            TypeError: If a quantity is not an integer.
+            ValueError: If the list is improperly formatted, a quantity is not positive
+                or a line exceeds the per-order limit of a LimitedProduct.
+        """
+        demand = {}
+        for item in shopping_list:
+            if not (isinstance(item, tuple) and len(item) == 2):
+                raise ValueError("Shopping list must contain tuples of (Product, quantity).")
+            product, quantity = item
+            if quantity.__class__ is not int:
+                raise TypeError("Quantity must be an integer.")
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive.")
+            if isinstance(product, LimitedProduct) and quantity > product.maximum:
+                raise PurchaseLimitError(f"Quantity {quantity} exceeds the limit of {product.maximum}.")
+            demand[product] = demand.get(product, 0) + quantity
+        return demand
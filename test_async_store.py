@@ -0,0 +1,64 @@
+import asyncio
+import threading
+
+import pytest
+from async_store import AsyncStore
+from products import Product
+from store import Store
+
+# Test that concurrent async orders go through Store.order and respect the queue bound.
+def test_async_store_processes_concurrent_orders():
+    mac = Product("MacBook Air M2", 100, 10)
+    store = Store([mac], thread_safe=True)
+
+    async def scenario():
+        async with AsyncStore(store, workers=2, max_queue=3) as front_end:
+            totals = await asyncio.gather(*(front_end.order([(mac, 1)]) for _ in range(10)))
+            with pytest.raises(ValueError):
+                await front_end.order([(mac, 1)])
+            products = await front_end.list_products()
+            return totals, products, front_end.stats()
+
+    totals, products, stats = asyncio.run(scenario())
+    assert totals == [100] * 10
+    assert products == []
+    assert stats["completed"] == 10
+    assert stats["failed"] == 1
+    assert stats["max_queue_depth"] <= 3
+
+# Test that a malformed order fails on its own without stopping the worker.
+def test_async_store_survives_malformed_order():
+    mac = Product("MacBook Air M2", 100, 10)
+    store = Store([mac])
+
+    async def scenario():
+        async with AsyncStore(store, workers=1) as front_end:
+            with pytest.raises(TypeError):
+                await front_end.order([(mac, "1")])
+            total = await front_end.order([(mac, 1)])
+            return total, front_end.stats()
+
+    total, stats = asyncio.run(scenario())
+    assert total == 100
+    assert stats["failed"] == 1
+    assert stats["completed"] == 1
+
+# Test that the workers place orders at the same time, off the event loop.
+def test_async_store_workers_run_orders_concurrently():
+    mac = Product("MacBook Air M2", 100, 10)
+    both_placing = threading.Barrier(2, timeout=5)
+
+    class MeetingStore(Store):
+        def order(self, shopping_list, destination=None):
+            both_placing.wait()  # Breaks unless a second order is placed meanwhile.
+            return super().order(shopping_list, destination)
+
+    store = MeetingStore([mac], thread_safe=True)
+
+    async def scenario():
+        async with AsyncStore(store, workers=2) as front_end:
+            return await asyncio.gather(front_end.order([(mac, 1)]), front_end.order([(mac, 2)]))
+
+    assert asyncio.run(scenario()) == [100, 200]
+    with pytest.raises(ValueError):
+        AsyncStore(Store([mac]), workers=2)
@@ -0,0 +1,52 @@
+from catalog_file import MappedCatalog, write_catalog, read_catalog
+from products import Product, LimitedProduct, NonStockedProduct
+from promotions import PercentDiscount
+
+
+def sample_products():
+    mac = Product("MacBook Air M2", 1450, 100)
+    mac.promotion = PercentDiscount(30)
+    empty = Product("Google Pixel 7", 500, 1)
+    empty.buy(1)
+    return [mac, empty, NonStockedProduct("Unlimited Warranty", 100),
+            LimitedProduct("Exclusive Sneakers", 150, 50, maximum=2)]
+
+# Test that a catalog file round-trips every product type, promotion and flag.
+def test_catalog_file_round_trip(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_catalog(path, sample_products(), seq=7)
+    products, seq = read_catalog(path)
+    assert seq == 7
+    assert [p.show() for p in products] == [p.show() for p in sample_products()]
+    assert [p.active for p in products] == [True, False, True, True]
+
+# Test that the mapped catalog scans columns without materializing and writes changes back.
+def test_mapped_catalog_scans_columns_lazily(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_catalog(path, sample_products())
+    with MappedCatalog(path) as catalog:
+        assert len(catalog) == 4
+        assert catalog.get_total_quantity() == 150
+        assert catalog.active_indices() == [0, 2, 3]
+        assert catalog.materialized_count == 0
+        sneakers = catalog.get_product("Exclusive Sneakers")
+        assert sneakers.maximum == 2
+        assert catalog.materialized_count == 1
+        sneakers.buy(2)
+        assert catalog.get_total_quantity() == 148
+        catalog.get_product("MacBook Air M2").active = False
+        assert [p.name for p in catalog.get_all_products()] == ["Unlimited Warranty", "Exclusive Sneakers"]
+    # The file itself is unchanged.
+    assert read_catalog(path)[0][3].quantity == 50
+
+# Test that products materialized from a mapped catalog stay usable after it is closed.
+def test_mapped_catalog_products_survive_close(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    write_catalog(path, sample_products())
+    catalog = MappedCatalog(path)
+    sneakers = catalog.get_product("Exclusive Sneakers")
+    catalog.close()
+    assert sneakers.buy(1) == sneakers.price
+    assert sneakers.quantity == 49
+    sneakers.price = 150
+    assert sneakers.price == 150
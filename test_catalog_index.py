@@ -0,0 +1,76 @@
+import pytest
+from products import Product
+
+
+def catalog():
+    return [
+        Product("MacBook Air M2", 1450, 100),
+        Product("MacBook Pro 14", 2400, 0),
+        Product("Bose QuietComfort Earbuds", 250, 500),
+        Product("Google Pixel 7", 500, 250),
+        Product("Google Pixel Buds", 99.99, 10),
+    ]
+
+# Test that name words match as case-insensitive prefixes, ordered by price.
+def test_query_matches_name_prefixes(make_store):
+    store = make_store(catalog())
+    assert [p.name for p in store.query("macbook")[0]] == ["MacBook Air M2", "MacBook Pro 14"]
+    assert [p.name for p in store.query("goo pix")[0]] == ["Google Pixel Buds", "Google Pixel 7"]
+    assert [p.name for p in store.query("BUDS")[0]] == ["Google Pixel Buds"]
+    assert store.query("iphone") == ([], False)
+
+# Test price-range and in-stock filters with pagination.
+def test_query_filters_and_pages(make_store):
+    store = make_store(catalog())
+    products, more = store.query(min_price=99.99, max_price=1450, size=2)
+    assert [p.name for p in products] == ["Google Pixel Buds", "Bose QuietComfort Earbuds"]
+    assert more
+    products, more = store.query(min_price=99.99, max_price=1450, page=2, size=2)
+    assert [p.name for p in products] == ["Google Pixel 7", "MacBook Air M2"]
+    assert not more
+    assert [p.name for p in store.query("macbook", in_stock=True)[0]] == ["MacBook Air M2"]
+    with pytest.raises(ValueError):
+        store.query(page=0)
+
+# Test that the indexes follow additions, removals, renames, price changes and purchases.
+def test_query_indexes_stay_consistent(make_store):
+    store = make_store(catalog())
+    store.query()
+    pixel = store.get_product("Google Pixel 7")
+    store.order([(pixel, 250)])
+    assert store.query("pixel 7", in_stock=True)[0] == []
+    store.add_products([Product("Google Pixel 8", 700, 5)])
+    store.remove_product(store.get_product("Google Pixel Buds"))
+    store.get_product("MacBook Pro 14").name = "MacBook Pro 16"
+    store.get_product("MacBook Air M2").price = 999
+    assert [p.name for p in store.query("pixel")[0]] == ["Google Pixel 7", "Google Pixel 8"]
+    assert [p.name for p in store.query("macbook pro")[0]] == ["MacBook Pro 16"]
+    assert store.query("14")[0] == []
+    assert [p.name for p in store.query(max_price=999)[0]] == ["Bose QuietComfort Earbuds", "Google Pixel 7",
+                                                               "Google Pixel 8", "MacBook Air M2"]
+
+# Test that broad words, checked product by product, give the same results as the posting sets.
+def test_query_broad_terms_match_selective_terms(make_store, monkeypatch):
+    import catalog_index
+    store = make_store(catalog())
+    expected = [store.query(text)[0] for text in ("goo pix", "macbook 14", "e")]
+    monkeypatch.setattr(catalog_index, "BROAD_TERM_LIMIT", 1)
+    assert [store.query(text)[0] for text in ("goo pix", "macbook 14", "e")] == expected
+
+# Test that the in-stock filter follows purchases, reservations, restocks and deactivation.
+def test_query_in_stock_follows_stock_changes(make_store):
+    store = make_store(catalog())
+    assert len(store.query(in_stock=True)[0]) == 4
+    buds = store.get_product("Google Pixel Buds")
+    reservation = store.reserve([(buds, 10)], ttl=60)
+    assert buds not in store.query(in_stock=True)[0]
+    store.release(reservation)
+    assert buds in store.query("buds", in_stock=True)[0]
+    for product in store.list_of_products:
+        if product.quantity:
+            store.order([(product, product.quantity)])
+    assert store.query(in_stock=True) == ([], False)
+    store.update_stock(store.get_product("MacBook Pro 14"), 3)
+    assert [p.name for p in store.query(in_stock=True)[0]] == ["MacBook Pro 14"]
+    store.get_product("MacBook Pro 14").active = False
+    assert store.query("macbook", in_stock=True) == ([], False)
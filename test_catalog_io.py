@@ -0,0 +1,79 @@
+import io
+
+from catalog_io import (import_products, read_products_csv, read_products_jsonl,
+                        write_products_csv, write_products_jsonl)
+from products import Product, LimitedProduct, NonStockedProduct
+from promotions import PercentDiscount, SecondHalfPrice
+from store import Store
+
+
+def sample_products():
+    mac = Product("MacBook Air M2", 1450, 100)
+    mac.promotion = PercentDiscount(30)
+    bose = Product("Bose QuietComfort Earbuds", 250.5, 500)
+    bose.promotion = SecondHalfPrice()
+    return [mac, bose, NonStockedProduct("Unlimited Warranty", 100),
+            LimitedProduct("Exclusive Sneakers", 150, 50, maximum=2)]
+
+
+def round_trip(write, read):
+    buffer = io.StringIO(newline="")
+    write(sample_products(), buffer)
+    buffer.seek(0)
+    store = Store([])
+    report = import_products(store, read(buffer, chunk_size=3))
+    return store, report
+
+# Test that CSV and JSONL exports import back into identical products.
+def test_csv_and_jsonl_round_trip():
+    expected = [p.show() for p in sample_products()]
+    for write, read in ((write_products_csv, read_products_csv),
+                        (write_products_jsonl, read_products_jsonl)):
+        store, report = round_trip(write, read)
+        assert report == {"imported": 4, "error_count": 0, "errors": []}
+        assert [p.show() for p in store.list_of_products] == expected
+        assert store.get_product("Exclusive Sneakers").maximum == 2
+
+# Test that invalid and duplicate rows are reported per row without stopping the import.
+def test_import_reports_errors_per_row(capsys):
+    data = io.StringIO(
+        "type,name,price,quantity,active,maximum,promotion,percent\n"
+        "Product,Pixel,500,10,true,,,\n"
+        "Product,,500,10,true,,,\n"
+        "Product,Bose,-1,10,true,,,\n"
+        "Product,Pixel,400,1,true,,,\n"
+        "LimitedProduct,Sneakers,150,5,true,x,,\n"
+        "Product,Mac,1450,3,true,,PercentDiscount,30\n"
+    )
+    store = Store([])
+    report = import_products(store, read_products_csv(data, chunk_size=2))
+    assert report["imported"] == 2
+    assert [row for row, _ in report["errors"]] == [3, 4, 5, 6]
+    assert store.get_product("Mac").promotion.percent == 30
+    assert capsys.readouterr().out == ""
+
+# Test that rows with a malformed promotion or a non-finite price are reported, not raised.
+def test_import_reports_malformed_promotions_and_prices():
+    lines = [
+        '{"type": "Product", "name": "A", "price": 5, "quantity": 1, "promotion": {"type": "PercentDiscount"}}',
+        '{"type": "Product", "name": "B", "price": 5, "quantity": 1, "promotion": "ThirdOneFree"}',
+        '{"type": "Product", "name": "C", "price": Infinity, "quantity": 1}',
+        '{"type": "Product", "name": "D", "price": 5, "quantity": 1}',
+    ]
+    store = Store([])
+    report = import_products(store, read_products_jsonl(io.StringIO("\n".join(lines))))
+    assert report["imported"] == 1
+    assert report["errors"] == [(1, "Missing field percent."), (2, "Promotion must be an object with a type."),
+                                (3, "Price must be a finite number no larger than 1000000000000000.")]
+    csv_data = io.StringIO("type,name,price,quantity,active,maximum,promotion,percent\n"
+                           "Product,E,inf,1,true,,,\n"
+                           "Product,F,5,1,true,,PercentDiscount,\n"
+                           "Product,G,5,1,true,,PercentDiscount,inf\n"
+                           "Product,H,5,1,true,,PercentDiscount,1e400\n"
+                           "Product,I,5,1,true,,PercentDiscount,150\n")
+    report = import_products(store, read_products_csv(csv_data))
+    assert [row for row, _ in report["errors"]] == [2, 3, 4, 5, 6]
+    huge = '{"type": "Product", "name": "J", "price": 5, "quantity": 1, ' \
+           '"promotion": {"type": "PercentDiscount", "percent": 1e400}}'
+    report = import_products(store, read_products_jsonl(io.StringIO(huge)))
+    assert report["errors"] == [(1, "Percent must be between 0 and 100.")]
@@ -0,0 +1,101 @@
+import pytest
+from products import Product
+from promotions import ThirdOneFree
+from store import Store
+from events import (ChangeFeed, ADDED, REMOVED, STOCK_CHANGED, DEACTIVATED, PRICE_CHANGED,
+                    PROMOTION_CHANGED, RENAMED)
+
+
+# Test that a purchase that empties the stock records a stock change followed by a deactivation.
+def test_feed_records_typed_events_in_order():
+    pixel = Product("Google Pixel 7", 500, 2)
+    store = Store([pixel])
+    feed = store.changes
+    store.order([(pixel, 2)])
+    pixel.price = 450
+    pixel.promotion = ThirdOneFree()
+    pixel.name = "Pixel 7"
+    earbuds = Product("Bose Earbuds", 250, 5)
+    store.add_product(earbuds)
+    store.remove_product(earbuds)
+    events = feed.events_since(0)
+    assert [event.kind for event in events] == [STOCK_CHANGED, DEACTIVATED, PRICE_CHANGED, PROMOTION_CHANGED,
+                                                RENAMED, ADDED, REMOVED]
+    assert [event.seq for event in events] == list(range(1, 8))
+    assert (events[0].old_value, events[0].new_value) == (2, 0)
+    assert (events[4].name, events[4].old_value) == ("Pixel 7", "Google Pixel 7")
+    assert events[6].product is earbuds
+
+# Test that changes are only recorded while they happen and delivered in batches on flush.
+def test_feed_delivers_in_batches():
+    product = Product("Cable", 5, 100)
+    store = Store([product])
+    feed = ChangeFeed(store.catalog, batch_size=3)
+    batches = []
+    feed.subscribe(batches.append)
+    for _ in range(4):
+        product.buy(1)
+    assert batches == []
+    feed.flush()
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert [event.new_value for batch in batches for event in batch] == [99, 98, 97, 96]
+
+# Test that a consumer catches up from a cursor and that trimmed events are reported.
+def test_feed_catch_up_from_cursor():
+    product = Product("Cable", 5, 100)
+    store = Store([product])
+    feed = ChangeFeed(store.catalog, batch_size=1, capacity=2)
+    product.buy(1)
+    cursor = feed.last_seq
+    product.buy(1)
+    product.buy(1)
+    assert [event.new_value for event in feed.events_since(cursor)] == [98, 97]
+    received = []
+    subscription = feed.subscribe(received.extend, cursor=cursor)
+    feed.flush()
+    assert [event.new_value for event in received] == [98, 97]
+    assert subscription.cursor == feed.last_seq
+    for _ in range(3):
+        product.buy(1)
+    with pytest.raises(ValueError):
+        feed.events_since(0)
+    with pytest.raises(ValueError):
+        feed.events_since(feed.last_seq + 1)
+
+# Test that events caused by a subscriber are delivered after the current batch.
+def test_feed_subscriber_may_change_products():
+    product = Product("Cable", 5, 100)
+    store = Store([product])
+    feed = ChangeFeed(store.catalog, batch_size=1)
+    seen = []
+
+    def restock(events):
+        seen.extend(event.new_value for event in events)
+        if product.quantity < 100:
+            product.quantity = 100
+
+    feed.subscribe(restock)
+    product.buy(1)
+    feed.flush()
+    assert seen == [99, 100]
+
+# Test that the store delivers after an order completes and a failing subscriber does not affect it.
+def test_store_delivers_after_order_and_isolates_subscriber_errors():
+    cable = Product("Cable", 5, 10)
+    charger = Product("Charger", 20, 10)
+    store = Store([cable, charger], thread_safe=True)
+    seen = []
+
+    def failing(events):
+        raise RuntimeError("subscriber is down")
+
+    def record(events):
+        seen.append((cable.quantity, charger.quantity, [event.name for event in events]))
+
+    broken = store.changes.subscribe(failing)
+    store.changes.subscribe(record)
+    assert store.order([(cable, 2), (charger, 1)]) == 30
+    assert (cable.quantity, charger.quantity) == (8, 9)
+    assert seen == [(8, 9, ["Cable", "Charger"])]
+    assert broken.errors == 1 and isinstance(broken.last_error, RuntimeError)
+    assert broken.cursor == store.changes.last_seq
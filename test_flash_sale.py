@@ -0,0 +1,154 @@
+import sys
+import threading
+import time
+
+import pytest
+from products import LimitedProduct
+from flash_sale import (FlashSale, StockCounter, FairLock, SoldOutError, CustomerLimitError,
+                        SaleClosedError)
+
+
+@pytest.fixture
+def open_sale(make_store, clock):
+    def make(stock=100, quantity=10, per_customer=2):
+        sneakers = LimitedProduct("Exclusive Sneakers", 200, stock, 2)
+        store = make_store([sneakers], thread_safe=True)
+        sale = FlashSale(store, sneakers, quantity, per_customer, 0, 100, shards=4, clock=clock)
+        sale.open()
+        return store, sneakers, sale
+
+    return make
+
+# Test that the sale's stock is held from regular orders and unsold stock returns on close.
+def test_flash_sale_allocates_and_returns_stock(open_sale):
+    store, sneakers, sale = open_sale()
+    assert sneakers.available == 90
+    assert sale.buy("alice", 2) == 400
+    assert sneakers.quantity == 98
+    assert sale.close() == 2
+    assert sneakers.available == 98
+
+# Test that per-customer limits apply across orders and the per-order limit still applies.
+def test_flash_sale_enforces_customer_limit_across_orders(open_sale):
+    store, sneakers, sale = open_sale(per_customer=3)
+    sale.buy("alice", 2)
+    with pytest.raises(CustomerLimitError):
+        sale.buy("alice", 2)
+    sale.buy("alice", 1)
+    with pytest.raises(ValueError):
+        sale.buy("bob", 3)
+    assert sale.remaining == 7
+
+# Test that buyers are rejected once the stock is gone and outside the time window.
+def test_flash_sale_rejects_when_sold_out_or_closed(open_sale, clock):
+    store, sneakers, sale = open_sale(quantity=3, per_customer=1)
+    for customer in range(3):
+        sale.buy(customer)
+    with pytest.raises(SoldOutError):
+        sale.buy("late")
+    assert sale.sold == 3
+    clock.now = 100
+    with pytest.raises(SaleClosedError):
+        sale.buy("later")
+
+# Test that concurrent buyers never oversell the sale.
+def test_flash_sale_concurrent_buyers_do_not_oversell(open_sale):
+    store, sneakers, sale = open_sale(stock=1000, quantity=50, per_customer=1)
+    results = []
+
+    def buyer(customer):
+        try:
+            sale.buy(customer)
+            results.append(True)
+        except ValueError:
+            results.append(False)
+
+    threads = [threading.Thread(target=buyer, args=(customer,)) for customer in range(200)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == sale.sold == 50
+    assert sneakers.quantity == 950
+    store.verify_aggregates()
+
+# Test that buyers claim stock in the order they reached the admission queue.
+def test_flash_sale_claims_stock_in_arrival_order(open_sale):
+    store, sneakers, sale = open_sale(quantity=2, per_customer=1)
+    results = {}
+
+    def buyer(customer):
+        try:
+            results[customer] = sale.buy(customer)
+        except SoldOutError:
+            results[customer] = None
+
+    threads = []
+    with sale._admission:
+        for customer in ["carol", "alice", "bob"]:
+            threads.append(threading.Thread(target=buyer, args=(customer,)))
+            threads[-1].start()
+            deadline = time.monotonic() + 5
+            while len(sale._admission._waiters) < len(threads) and time.monotonic() < deadline:
+                time.sleep(0.001)
+        # Queued buyers have not claimed anything yet.
+        assert sale.remaining == 2
+    for thread in threads:
+        thread.join()
+    assert results == {"carol": 200, "alice": 200, "bob": None}
+    assert sale.sold == 2
+
+# Test that the counter gathers a quantity over shards and the fair lock serves waiters in order.
+def test_stock_counter_and_fair_lock():
+    counter = StockCounter(5, shards=4)
+    assert counter.take(3, shard=0)
+    assert not counter.take(3, shard=1)
+    assert counter.remaining == 2 and not counter.exhausted
+    assert counter.take(2, shard=3)
+    assert not counter.take(1) and counter.exhausted
+
+    lock = FairLock()
+    order = []
+
+    def waiter(index):
+        with lock:
+            order.append(index)
+
+    threads = []
+    with lock:
+        for index in range(5):
+            thread = threading.Thread(target=waiter, args=(index,))
+            thread.start()
+            threads.append(thread)
+            while len(lock._waiters) <= index:
+                pass
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3, 4]
+
+# Test that concurrent takes and put-backs never reject a buyer while enough stock is left.
+def test_stock_counter_take_and_put_back_under_contention():
+    threads_count = 8
+    counter = StockCounter(2 * threads_count, shards=4)
+    rejected = []
+
+    def churn(index):
+        for _ in range(2000):
+            if counter.take(2, shard=index % 2):
+                counter.put_back(1, shard=index)
+                counter.put_back(1, shard=index + 1)
+            else:
+                rejected.append(index)
+
+    threads = [threading.Thread(target=churn, args=(index,)) for index in range(threads_count)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often so takes and put-backs interleave.
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert rejected == []
+    assert counter.remaining == 2 * threads_count and not counter.exhausted
@@ -0,0 +1,108 @@
+import asyncio
+
+from http_service import OrderService
+from loadgen_http import request
+from products import Product
+from promotions import SecondHalfPrice
+
+
+def catalog():
+    mac = Product("MacBook Air M2", 1450, 10)
+    earbuds = Product("Bose QuietComfort Earbuds", 250, 500)
+    earbuds.promotion = SecondHalfPrice()
+    return [mac, earbuds]
+
+
+def serve(store, scenario, **settings):
+    async def main():
+        async with OrderService(store, **settings) as service:
+            reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+            try:
+                return await scenario(service, reader, writer)
+            finally:
+                writer.close()
+
+    return asyncio.run(main())
+
+# Test that listing, quote and order are served one after another on a single keep-alive connection.
+def test_service_serves_requests_on_one_connection(make_store):
+    store = make_store(catalog())
+
+    async def scenario(service, reader, writer):
+        listing = await request(reader, writer, "GET", "/products?size=1")
+        quote = await request(reader, writer, "POST", "/quote",
+                              {"items": [{"name": "Bose QuietComfort Earbuds", "quantity": 2}]})
+        order = await request(reader, writer, "POST", "/order",
+                              {"items": [{"name": "MacBook Air M2", "quantity": 2}]})
+        return listing, quote, order
+
+    listing, quote, order = serve(store, scenario)
+    assert listing == (200, {"products": [{"name": "MacBook Air M2", "price": 1450, "quantity": 10,
+                                           "promotion": None}], "total": 2})
+    assert quote == (200, {"total": 375})
+    assert order == (200, {"total": 2900})
+    assert store.get_product("MacBook Air M2").quantity == 8
+
+# Test that concurrent orders are placed in one store pass and fail individually.
+def test_service_batches_concurrent_orders(make_store):
+    store = make_store(catalog())
+
+    async def scenario(service, reader, writer):
+        connections = [await asyncio.open_connection("127.0.0.1", service.port) for _ in range(6)]
+        results = await asyncio.gather(*(
+            request(conn_reader, conn_writer, "POST", "/order",
+                    {"items": [{"name": "MacBook Air M2", "quantity": 2}]})
+            for conn_reader, conn_writer in connections
+        ))
+        for _, conn_writer in connections:
+            conn_writer.close()
+        return results, service.stats()
+
+    results, stats = serve(store, scenario, batch_window=0.05)
+    assert sorted(status for status, _ in results) == [200] * 5 + [409]
+    assert stats == {"orders": 6, "batches": 1, "largest_batch": 6}
+    assert store.get_product("MacBook Air M2").quantity == 0
+
+# Test that malformed carts and unknown paths get error responses without closing the connection.
+def test_service_rejects_bad_requests(make_store):
+    store = make_store(catalog())
+
+    async def scenario(service, reader, writer):
+        missing = await request(reader, writer, "GET", "/missing")
+        wrong_method = await request(reader, writer, "GET", "/order")
+        unknown = await request(reader, writer, "POST", "/quote", {"items": [{"name": "Pixel", "quantity": 1}]})
+        malformed = await request(reader, writer, "POST", "/order", {"lines": []})
+        boolean = await request(reader, writer, "POST", "/order",
+                                {"items": [{"name": "MacBook Air M2", "quantity": True}]})
+        return missing, wrong_method, unknown, malformed, boolean
+
+    missing, wrong_method, unknown, malformed, boolean = serve(store, scenario)
+    assert missing[0] == 404
+    assert wrong_method[0] == 405
+    assert unknown == (400, {"error": "Unknown product Pixel."})
+    assert malformed[0] == 400
+    assert boolean[0] == 400
+    assert store.get_product("MacBook Air M2").quantity == 10
+
+# Test that every order of a batch gets an error response when the store pass raises.
+def test_service_answers_batch_when_store_fails(make_store, monkeypatch):
+    store = make_store(catalog())
+
+    def broken(orders):
+        raise RuntimeError("store is down")
+
+    monkeypatch.setattr(store, "order_many", broken)
+
+    async def scenario(service, reader, writer):
+        connections = [await asyncio.open_connection("127.0.0.1", service.port) for _ in range(3)]
+        results = await asyncio.wait_for(asyncio.gather(*(
+            request(conn_reader, conn_writer, "POST", "/order",
+                    {"items": [{"name": "MacBook Air M2", "quantity": 1}]})
+            for conn_reader, conn_writer in connections
+        )), timeout=5)
+        for _, conn_writer in connections:
+            conn_writer.close()
+        return results
+
+    results = serve(store, scenario, batch_window=0.01)
+    assert results == [(500, {"error": "Internal server error."})] * 3
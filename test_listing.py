@@ -0,0 +1,72 @@
+import pytest
+from products import Product, LimitedProduct
+from promotions import SecondHalfPrice
+from listing import ProductListing
+
+
+class CountingProduct(Product):
+    renders = 0
+
+    def show(self):
+        CountingProduct.renders += 1
+        return super().show()
+
+
+def counting_products(count):
+    CountingProduct.renders = 0
+    return [CountingProduct(f"Product {idx}", 10 + idx, 5) for idx in range(count)]
+
+# Test that pages render only their own rows and reuse them on later listings.
+def test_listing_pages_render_rows_once(make_store):
+    store = make_store(counting_products(10))
+    rows, total = store.listing.page(2, size=4)
+    assert total == 10
+    assert [row for _, row in rows] == [f"Product {idx}, Price: {10 + idx}, Quantity: 5" for idx in range(4, 8)]
+    assert CountingProduct.renders == 4
+    store.listing.page(2, size=4)
+    assert CountingProduct.renders == 4
+    assert store.listing.page(3, size=4)[0][-1][0].name == "Product 9"
+    assert store.listing.page_count(size=4) == 3
+
+# Test that a field change re-renders only that product's row.
+def test_listing_invalidates_changed_rows(make_store):
+    store = make_store(counting_products(3))
+    store.listing.page()
+    product = store.get_product("Product 1")
+    product.promotion = SecondHalfPrice()
+    store.order([(store.get_product("Product 2"), 5)])
+    rows, total = store.listing.page()
+    assert total == 2
+    assert rows[1][1] == "Product 1, Price: 11, Quantity: 5, Promotion: Second Half Price"
+    assert CountingProduct.renders == 4
+
+# Test that searches match names case-insensitively and follow renames and new products.
+def test_listing_search(make_store):
+    store = make_store(counting_products(12))
+    rows, total = store.listing.page(search="product 1")
+    assert total == 3
+    assert [product.name for product, _ in rows] == ["Product 1", "Product 10", "Product 11"]
+    store.add_products([LimitedProduct("Product 1 Limited", 5, 5, maximum=1)])
+    store.get_product("Product 10").name = "Renamed"
+    rows, total = store.listing.page(search="PRODUCT 1")
+    assert [product.name for product, _ in rows] == ["Product 1", "Product 11", "Product 1 Limited"]
+    with pytest.raises(ValueError):
+        store.listing.page(0)
+
+# Test that only the most recently used searches stay cached and page_count rejects bad sizes.
+def test_listing_search_cache_is_bounded(make_store):
+    store = make_store(counting_products(12))
+    listing = ProductListing(store, max_searches=2)
+    listing.page(search="product 1")
+    listing.page(search="product 2")
+    listing.page(search="product 1")
+    listing.page(search="product 3")
+    assert list(listing._searches) == ["product 1", "product 3"]
+    for idx in range(4, 200):
+        listing.page(search=f"product {idx}")
+    assert len(listing._searches) == 2
+    assert listing.page_count(size=5, search="product 1") == 1
+    with pytest.raises(ValueError):
+        listing.page_count(size=0)
+    with pytest.raises(ValueError):
+        ProductListing(store, max_searches=0)
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+from products import Product, InsufficientStockError
+from locations import Location, Inventory, NearestFirst, LargestStockFirst
+
+
+@pytest.fixture
+def stocked_store(make_store):
+    def make(strategy=None):
+        product = Product("MacBook Air M2", 1450, 1)
+        inventory = Inventory([Location("Berlin", 0, 0), Location("Hamburg", 0, 10), Location("Munich", 0, -20)],
+                              strategy)
+        store = make_store([product], inventory=inventory)
+        store.set_location_stock(product, "Berlin", 2)
+        store.set_location_stock(product, "Hamburg", 5)
+        store.set_location_stock(product, "Munich", 3)
+        return store, product
+
+    return make
+
+# Test that the product's quantity is the total over its locations.
+def test_inventory_keeps_product_quantity_as_total(stocked_store):
+    store, product = stocked_store()
+    assert product.quantity == 10
+    assert store.get_total_quantity() == 10
+    assert store.inventory.stock_at("Hamburg") == {product: 5}
+
+# Test that largest-stock-first routing splits a line over the biggest locations.
+def test_order_splits_line_largest_stock_first(stocked_store):
+    store, product = stocked_store()
+    assert store.order([(product, 7)]) == 7 * 1450
+    assert store.inventory.stock(product) == {"Berlin": 2, "Munich": 1}
+    assert product.quantity == 3
+
+# Test that nearest-first routing draws from the locations closest to the destination.
+def test_order_routes_nearest_first(stocked_store):
+    store, product = stocked_store(NearestFirst())
+    assert store.inventory.route({product: 4}, destination=(0, -15)) == {product: [("Munich", 3), ("Berlin", 1)]}
+    store.order([(product, 4)], destination=(0, -15))
+    assert store.inventory.stock(product) == {"Berlin": 1, "Hamburg": 5}
+    assert store.inventory.route({product: 6}, strategy=LargestStockFirst()) == \
+        {product: [("Hamburg", 5), ("Berlin", 1)]}
+
+# Test that stock changes made through the product API reach the locations.
+def test_inventory_follows_direct_quantity_changes(stocked_store):
+    store, product = stocked_store()
+    store.update_stock(product, 12)
+    assert store.inventory.stock(product)["Berlin"] == 4
+    product.buy(6)
+    assert sum(store.inventory.stock(product).values()) == product.quantity == 6
+    store.verify_aggregates()
+
+# Test that a line larger than the stock of all locations is rejected.
+def test_route_rejects_demand_above_total_stock(stocked_store):
+    store, product = stocked_store()
+    with pytest.raises(InsufficientStockError):
+        store.inventory.route({product: 11})
+    with pytest.raises(ValueError):
+        store.inventory.set_stock(product, "Paris", 1)
+
+# Test that a batch of orders is drawn from the locations the routing strategy picks.
+def test_order_many_routes_through_inventory(stocked_store):
+    store, product = stocked_store(NearestFirst(origin=(0, -15)))
+    totals, failures = store.order_many([[(product, 2)], [(product, 2)], [(product, 9)]])
+    assert totals == [2 * 1450, 2 * 1450, None] and list(failures) == [2]
+    assert store.inventory.stock(product) == {"Berlin": 1, "Hamburg": 5}
+    assert product.quantity == 6
+
+# Test that a per-location restock through the store waits for an order of the product in flight.
+def test_set_location_stock_waits_for_concurrent_order(make_store):
+    cable = Product("USB-C Cable", 10, 5)
+    product = Product("MacBook Air M2", 1450, 1)
+    store = make_store([cable, product], thread_safe=True,
+                       inventory=Inventory([Location("Berlin"), Location("Hamburg")]))
+    store.set_location_stock(product, "Berlin", 1)
+    restocks = []
+
+    def restock_mid_order(changed, field, old_value, new_value):
+        # Runs between the two lines of the order; the restock must not get in between.
+        if field == "quantity" and not restocks:
+            restocks.append(threading.Thread(target=store.set_location_stock, args=(product, "Berlin", 0)))
+            restocks[0].start()
+            restocks[0].join(timeout=0.2)
+
+    cable.add_observer(restock_mid_order)
+    assert store.order([(cable, 1), (product, 1)]) == 1460
+    restocks[0].join()
+    assert cable.quantity == 4
+    assert product.quantity == 0
+    assert store.inventory.stock(product) == {}
+    with pytest.raises(ValueError):
+        make_store([product]).set_location_stock(product, "Berlin", 1)
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+from metrics import Metrics
+from products import Product, LimitedProduct
+from promotions import PercentDiscount
+from store import Store
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+
+# Test that orders, purchases and promotion pricing are counted and timed.
+def test_metrics_count_calls_and_discounts(metrics):
+    product = Product("MacBook Air M2", 100, 10)
+    product.promotion = PercentDiscount(30)
+    store = Store([product])
+    assert store.order([(product, 2)]) == 140
+    store.get_all_products()
+    snapshot = metrics.snapshot()
+    assert snapshot["calls"]["Store.order"] == 1
+    assert snapshot["calls"]["Product.buy_cents"] == 1
+    assert snapshot["calls"]["PercentDiscount.apply_promotion_cents"] == 1
+    assert snapshot["calls"]["Store.get_all_products"] == 1
+    assert snapshot["latency"]["Store.order"]["count"] == 1
+    assert snapshot["latency"]["Store.order"]["buckets"][-1] == ["+Inf", 1]
+    assert snapshot["discounts"] == {"Percent Discount": 60}
+    json.loads(metrics.to_json())
+
+# Test that discounts add up in whole cents without float drift.
+def test_metrics_add_up_discounts_in_cents(metrics):
+    product = Product("USB-C Cable", 1, 10_000)
+    product.promotion = PercentDiscount(10)
+    for _ in range(1000):
+        product.buy(1)
+    assert metrics.discount_cents == {"Percent Discount": 10_000}
+    assert metrics.discounts == {"Percent Discount": 100}
+    assert 'promotion="Percent Discount"} 100.0\n' in metrics.to_prometheus()
+
+# Test that rejected orders are classified by reason.
+def test_metrics_record_rejection_reasons(metrics):
+    product = Product("Google Pixel 7", 500, 1)
+    limited = LimitedProduct("Shipping", 10, 250, maximum=1)
+    store = Store([product, limited])
+    with pytest.raises(ValueError):
+        store.order([(product, 2)])
+    with pytest.raises(ValueError):
+        store.order([(limited, 2)])
+    assert metrics.snapshot()["rejections"]["Store.order"] == {"insufficient_stock": 1, "limit_exceeded": 1}
+    text = metrics.to_prometheus()
+    assert 'bestbuy_rejections_total{method="Store.order",reason="insufficient_stock"} 1' in text
+    assert 'bestbuy_call_duration_seconds_count{method="Store.order"} 2' in text
+
+# Test that disabling restores the original methods and trace hooks see every call.
+def test_metrics_disable_restores_methods():
+    original = Store.order
+    metrics = Metrics()
+    traced = []
+    metrics.add_trace_hook(lambda method, duration, error: traced.append(method))
+    metrics.enable()
+    assert Store.order is not original
+    product = Product("Bose QuietComfort Earbuds", 250, 5)
+    Store([product]).order([(product, 1)])
+    metrics.disable()
+    assert Store.order is original
+    assert traced == ["Product.buy_cents", "Store.order"]
+    product.buy(1)
+    assert metrics.snapshot()["calls"]["Product.buy_cents"] == 1
@@ -0,0 +1,38 @@
+import pytest
+from money import to_cents, divide_half_even
+from products import Product
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+from store import Store
+
+# Test that amounts convert to cents and divisions round half to even.
+def test_to_cents_and_half_even_division():
+    assert to_cents(1450) == 145_000
+    assert to_cents(0.1) == 10
+    assert to_cents(19.99) == 1999
+    assert [divide_half_even(n, 2) for n in (1, 3, 5, 7)] == [0, 2, 2, 4]
+    assert divide_half_even(1249, 1000) == 1
+
+# Test that promotions compute exact cent totals with one rounding per line.
+@pytest.mark.parametrize("promotion, quantity, expected", [
+    (PercentDiscount(30), 3, 2098),       # 2097.9 cents
+    (PercentDiscount(50), 1, 500),        # 499.5 cents, tie rounds to even
+    (PercentDiscount(12.5), 1, 874),      # 874.125 cents
+    (SecondHalfPrice(), 2, 1498),         # 1498.5 cents, tie rounds to even
+    (SecondHalfPrice(), 3, 2498),         # 2498.5 cents, tie rounds to even
+    (ThirdOneFree(), 4, 2997),
+])
+def test_promotion_cent_totals(promotion, quantity, expected):
+    product = Product("Item", 9.99, 10)
+    product.promotion = promotion
+    assert product.quote_cents(quantity) == expected
+    assert product.buy(quantity) == expected / 100
+
+# Test that order totals are exact where float accumulation would drift.
+def test_order_totals_do_not_drift():
+    items = [Product(f"Item {idx}", 0.1, 10) for idx in range(10)]
+    store = Store(items)
+    assert sum(0.1 for _ in items) != 1.0
+    assert store.order([(item, 1) for item in items]) == 1.0
+    totals, failures = store.order_many([[(item, 1)] for item in items] + [[(item, 1) for item in items]])
+    assert failures == {}
+    assert totals[-1] == 1.0
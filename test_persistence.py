@@ -0,0 +1,50 @@
+from persistence import StorePersistence
+from products import Product, LimitedProduct, NonStockedProduct
+from promotions import PercentDiscount, ThirdOneFree
+
+
+def sample_products():
+    mac = Product("MacBook Air M2", 1450, 100)
+    mac.promotion = PercentDiscount(30)
+    pixel = Product("Google Pixel 7", 500, 250)
+    pixel.promotion = ThirdOneFree()
+    return [mac, pixel, NonStockedProduct("Unlimited Warranty", 100),
+            LimitedProduct("Exclusive Sneakers", 150, 50, maximum=2)]
+
+
+def state(store):
+    return [(type(p).__name__, p.name, p.price, p.quantity, p.active,
+             type(p.promotion).__name__, getattr(p, "maximum", None)) for p in store.list_of_products]
+
+# Test that a reopened store recovers orders, catalog changes and stock updates.
+def test_store_state_survives_restart(tmp_path):
+    persistence = StorePersistence(str(tmp_path), snapshot_every=1000)
+    store = persistence.open_store(sample_products())
+    mac = store.get_product("MacBook Air M2")
+    store.order([(mac, 3), (store.get_product("Exclusive Sneakers"), 2)])
+    store.order_many([[(mac, 1)], [(store.get_product("Google Pixel 7"), 250)]])
+    store.add_product(Product("Bose QuietComfort Earbuds", 250, 500))
+    store.remove_product(store.get_product("Unlimited Warranty"))
+    store.update_stock(store.get_product("Google Pixel 7"), 10)
+    expected = state(store)
+    persistence.close()
+
+    recovered = StorePersistence(str(tmp_path)).open_store(sample_products())
+    assert state(recovered) == expected
+    assert recovered.verify_aggregates()
+
+# Test that snapshots bound the journal and recovery skips a torn last record.
+def test_snapshot_truncates_journal_and_recovery_ignores_torn_write(tmp_path):
+    persistence = StorePersistence(str(tmp_path), snapshot_every=3, batch_size=1)
+    store = persistence.open_store(sample_products())
+    mac = store.get_product("MacBook Air M2")
+    for _ in range(4):
+        store.order([(mac, 1)])
+    persistence.close()
+    with open(persistence.journal_path) as file:
+        assert len(file.readlines()) == 1
+    with open(persistence.journal_path, "a") as file:
+        file.write('{"seq": 99, "op": "order"')
+
+    recovered = StorePersistence(str(tmp_path)).open_store()
+    assert recovered.get_product("MacBook Air M2").quantity == 96
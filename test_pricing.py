@@ -0,0 +1,43 @@
+import random
+
+import pytest
+import pricing
+from products import Product
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+
+PROMOTIONS = [None, PercentDiscount(30), SecondHalfPrice(), ThirdOneFree(), PercentDiscount(12.5)]
+
+
+def random_lines(count):
+    rng = random.Random(7)
+    prices = [rng.choice([rng.randint(1, 2000), rng.uniform(0.5, 999.99)]) for _ in range(count)]
+    quantities = [rng.randint(1, 50) for _ in range(count)]
+    kinds = [rng.randrange(len(PROMOTIONS)) for _ in range(count)]
+    return prices, quantities, kinds
+
+
+def scalar_totals(prices, quantities, kinds):
+    totals = []
+    for price, quantity, kind in zip(prices, quantities, kinds):
+        product = Product("Line", price, quantity)
+        product.promotion = PROMOTIONS[kind]
+        totals.append(product.buy(quantity))
+    return totals
+
+# Test that bulk pricing matches the scalar promotion results line for line.
+def test_price_lines_matches_scalar_promotions():
+    prices, quantities, kinds = random_lines(2000)
+    totals = pricing.price_lines(prices, quantities, kinds, PROMOTIONS)
+    assert list(totals) == scalar_totals(prices, quantities, kinds)
+
+# Test that the vectorized NumPy path matches the scalar promotion results exactly.
+def test_price_lines_numpy_matches_scalar_promotions():
+    pytest.importorskip("numpy")
+    prices, quantities, kinds = random_lines(2000)
+    totals = pricing.price_lines(prices, quantities, kinds, PROMOTIONS)
+    assert totals.tolist() == scalar_totals(prices, quantities, kinds)
+
+# Test that a promotion kind outside the promotion table raises an exception.
+def test_price_lines_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        pricing.price_lines([10], [1], [len(PROMOTIONS)], PROMOTIONS)
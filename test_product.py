@@ -1,5 +1,5 @@
 import pytest
-from products import Product
+from products import Product, LimitedProduct, NonStockedProduct, products_from_columns
 
 # Test that creating a normal product works.
 def test_normal_product_creation():
@@ -72,3 +72,43 @@ def test_multiple_purchases_reduce_quantity_and_deactivate():
     # Now, trying to purchase further should raise an exception.
     with pytest.raises(ValueError):
         p.buy(1)
+
+
+# Test that a trusted product behaves like one built by the constructor.
+def test_from_trusted_matches_constructor():
+    trusted = LimitedProduct.from_trusted("Shipping", 10.5, 3, 1)
+    built = LimitedProduct("Shipping", 10.5, 3, 1)
+    assert trusted.show() == built.show()
+    assert trusted.price_cents == built.price_cents == 1050
+    assert trusted.buy(1) == built.buy(1) == 10.5
+    assert NonStockedProduct.from_trusted("License", 250).show() == NonStockedProduct("License", 250).show()
+
+# Test that the bulk factory builds limited products from positive maximums and keeps prices as given.
+def test_products_from_columns_builds_products():
+    products = products_from_columns(["A", "B"], [1450, 9.99], [10, 0], maximums=[0, 2], actives=[True, False])
+    assert [type(product) for product in products] == [Product, LimitedProduct]
+    assert products[0].price == 1450 and isinstance(products[0].price, int)
+    assert products[1].price_cents == 999
+    assert products[1].maximum == 2
+    assert products[1].active is False
+
+# Test that the bulk factory rejects invalid columns before building anything.
+def test_products_from_columns_validates_columns():
+    with pytest.raises(ValueError):
+        products_from_columns(["A", "B"], [1, 2], [1])
+    with pytest.raises(ValueError):
+        products_from_columns(["A", ""], [1, 2], [1, 1])
+    with pytest.raises(ValueError):
+        products_from_columns(["A", "B"], [1, -2], [1, 1])
+    with pytest.raises(TypeError):
+        products_from_columns(["A", "B"], [1, 2], [1, 1.5])
+    with pytest.raises(TypeError):
+        products_from_columns(["A", 3], [1, 2], [1, 1])
+
+# Test that the bulk factory and the constructor reject non-finite and huge prices alike.
+def test_products_from_columns_rejects_non_finite_prices():
+    for price in (float("nan"), float("inf"), 1e300):
+        with pytest.raises(ValueError):
+            products_from_columns(["A", "B"], [1, price], [1, 1])
+        with pytest.raises(ValueError):
+            Product("A", price, 1)
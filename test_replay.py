@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from products import Product
+from promotions import PercentDiscount
+from replay import replay_orders
+from rules import CartRule, PricingPlan
+
+
+def catalog():
+    mac = Product("MacBook Air M2", 100, 10)
+    mac.promotion = PercentDiscount(50)
+    return [mac, Product("Bose QuietComfort Earbuds", 10, 5)]
+
+
+ORDER_LOG = [
+    json.dumps({"order_id": "1", "lines": [["MacBook Air M2", 2], ["Bose QuietComfort Earbuds", 1]]}),
+    json.dumps({"order_id": "2", "lines": [["Unknown", 1]]}),
+    "",
+    json.dumps({"order_id": "3", "lines": [["Bose QuietComfort Earbuds", 5]]}),
+    "not json",
+    json.dumps({"order_id": "4", "lines": [["MacBook Air M2", 3]]}),
+    json.dumps({"order_id": "5", "lines": [["Bose QuietComfort Earbuds", 4]]}),
+]
+
+# Test that a replay reports revenue, units sold, discounts and failures.
+def test_replay_orders_reports_running_totals(make_store):
+    store = make_store(catalog())
+    stats = replay_orders(store, ORDER_LOG)
+    assert stats.orders_committed == 3
+    assert stats.orders_failed == 3
+    assert stats.revenue == 100 + 10 + 150 + 40
+    assert stats.units_sold == {"MacBook Air M2": 5, "Bose QuietComfort Earbuds": 5}
+    assert stats.discounts == {"Percent Discount": 250}
+    assert stats.failures == {"ValueError": 2, "InsufficientStockError": 1}
+    assert store.get_product("Bose QuietComfort Earbuds").quantity == 0
+
+# Test that revenue includes pricing rule discounts and non-integer quantities fail the order only.
+def test_replay_orders_counts_rules_and_bad_quantities(make_store):
+    store = make_store(catalog())
+    store.rules = PricingPlan([CartRule("Ten off", threshold=50, amount=10)])
+    log = [
+        json.dumps({"order_id": "1", "lines": [["MacBook Air M2", 1.5]]}),
+        json.dumps({"order_id": "2", "lines": [["MacBook Air M2", 2]]}),
+    ]
+    stats = replay_orders(store, log)
+    assert stats.orders_failed == 1 and stats.failures == {"TypeError": 1}
+    assert stats.revenue == 90
+    assert stats.discounts == {"Percent Discount": 100, "Pricing rules": 10}
+
+# Test that an interrupted replay resumes from its checkpoint with identical results.
+def test_replay_orders_resumes_from_checkpoint(make_store, tmp_path):
+    checkpoint = str(tmp_path / "replay.checkpoint")
+
+    def interrupted_log():
+        for position, line in enumerate(ORDER_LOG, start=1):
+            if position == 7:
+                raise KeyboardInterrupt
+            yield line
+
+    store = make_store(catalog())
+    with pytest.raises(KeyboardInterrupt):
+        replay_orders(store, interrupted_log(), checkpoint_path=checkpoint, checkpoint_every=2)
+    stats = replay_orders(store, ORDER_LOG, checkpoint_path=checkpoint, checkpoint_every=2)
+
+    expected_store = make_store(catalog())
+    expected = replay_orders(expected_store, ORDER_LOG)
+    assert stats.to_dict() == expected.to_dict()
+    assert [p.quantity for p in store.list_of_products] == [p.quantity for p in expected_store.list_of_products]
@@ -0,0 +1,64 @@
+import pytest
+from products import Product, LimitedProduct
+
+
+def catalog():
+    return [Product("Google Pixel 7", 500, 5), LimitedProduct("Exclusive Sneakers", 150, 50, maximum=2)]
+
+# Test that held stock is excluded from the available quantity and cannot be bought.
+def test_reserve_holds_stock_until_commit(make_store):
+    store = make_store(catalog())
+    pixel, _ = store.list_of_products
+    reservation = store.reserve([(pixel, 3)], ttl=60)
+    assert pixel.available == 2
+    assert store.get_available_quantity() == 52
+    assert "Quantity: 2" in pixel.show()
+    with pytest.raises(ValueError):
+        store.order([(pixel, 3)])
+    with pytest.raises(ValueError):
+        store.reserve([(pixel, 3)], ttl=60)
+    assert store.commit(reservation) == 1500
+    assert (pixel.quantity, pixel.reserved) == (2, 0)
+    with pytest.raises(ValueError):
+        store.commit(reservation)
+    store.verify_aggregates()
+
+# Test that reservations enforce per-order limits and expire after their TTL.
+def test_reservations_enforce_limits_and_expire(make_store, clock):
+    store = make_store(catalog())
+    pixel, sneakers = store.list_of_products
+    with pytest.raises(ValueError):
+        store.reserve([(sneakers, 3)], ttl=60)
+    reservation = store.reserve([(pixel, 5), (sneakers, 2)], ttl=60)
+    assert store.get_available_quantity() == 48
+    clock.now = 60
+    assert store.get_available_quantity() == 55
+    assert len(store.reservations) == 0
+    with pytest.raises(ValueError):
+        store.commit(reservation)
+    assert pixel.quantity == 5
+
+# Test that released holds can be reserved by someone else.
+def test_release_frees_stock(make_store):
+    store = make_store(catalog())
+    pixel, _ = store.list_of_products
+    reservation = store.reserve([(pixel, 5)], ttl=60)
+    assert store.release(reservation)
+    assert not store.release(reservation)
+    assert store.order([(pixel, 5)]) == 2500
+
+# Test that an order releases expired holds before checking the stock it needs.
+def test_order_releases_expired_holds(make_store, clock):
+    store = make_store(catalog())
+    pixel, _ = store.list_of_products
+    store.reserve([(pixel, 5)], ttl=60)
+    with pytest.raises(ValueError):
+        store.order([(pixel, 1)])
+    clock.now = 61
+    assert store.order([(pixel, 4)]) == 2000
+    assert (pixel.quantity, pixel.reserved) == (1, 0)
+    store.reserve([(pixel, 1)], ttl=60)
+    clock.now = 122
+    totals, failures = store.order_many([[(pixel, 1)]])
+    assert totals == [500] and not failures
+    store.verify_aggregates()
@@ -0,0 +1,76 @@
+import pytest
+from products import Product
+from promotions import PercentDiscount, ThirdOneFree
+from rules import BundleRule, CartRule, PricingPlan, ProductRule
+from store import Store
+
+
+def make_products():
+    return (Product("MacBook Air M2", 1000, 100), Product("Bose QuietComfort Earbuds", 200, 100),
+            Product("Google Pixel 7", 500, 100))
+
+# Test that bundle and cart rules stack in priority order and are applied to orders.
+def test_rules_stack_bundles_and_cart_discounts():
+    mac, bose, pixel = make_products()
+    store = Store([mac, bose, pixel])
+    store.rules = PricingPlan([
+        CartRule("10% over 1000", threshold=1000, percent=10, priority=0),
+        BundleRule("Work from home", {"MacBook Air M2": 1, "Bose QuietComfort Earbuds": 1}, price=1100, priority=10),
+    ])
+    # 2 x 1000 + 1 x 200 = 2200, one bundle saves 100, then 10% of 2100.
+    assert store.quote([(mac, 2), (bose, 1)]) == 1890
+    assert store.order([(mac, 2), (bose, 1)]) == 1890
+    totals, _ = store.order_many([[(mac, 2), (bose, 1)], [(pixel, 1)]])
+    assert totals == [1890, 500]
+
+# Test that an exclusive rule stops lower-priority rules on its products.
+def test_exclusive_rule_blocks_later_rules():
+    mac, bose, pixel = make_products()
+    plan = PricingPlan([
+        ProductRule("Pixel third free", ["Google Pixel 7"], ThirdOneFree(), priority=5, exclusive=True),
+        ProductRule("Everything 50% off", ["Google Pixel 7", "MacBook Air M2"], PercentDiscount(50)),
+    ])
+    discount, applied = plan.evaluate([(pixel, 3, 150_000), (mac, 1, 100_000)], now=0)
+    assert applied == {"Pixel third free": 50_000, "Everything 50% off": 50_000}
+    assert discount == 100_000
+
+# Test that rules only apply inside their time window.
+def test_rules_respect_time_windows():
+    mac, _, _ = make_products()
+    plan = PricingPlan([ProductRule("Launch week", ["MacBook Air M2"], PercentDiscount(10),
+                                    starts_at=100, ends_at=200)])
+    line = [(mac, 1, 100_000)]
+    assert plan.evaluate(line, now=99)[0] == 0
+    assert plan.evaluate(line, now=150)[0] == 10_000
+    assert plan.evaluate(line, now=200)[0] == 0
+
+# Test that the compiled plan only hands out the rules of the cart's products.
+def test_plan_indexes_rules_by_product():
+    cart_rule = CartRule("5 off", threshold=0, amount=5)
+    mac_rule = ProductRule("Mac deal", ["MacBook Air M2"], PercentDiscount(5), priority=1)
+    plan = PricingPlan([cart_rule, mac_rule] + [
+        ProductRule(f"Rule {index}", [f"Other {index}"], PercentDiscount(5)) for index in range(1000)
+    ])
+    assert plan.rules_for(["MacBook Air M2"]) == [mac_rule, cart_rule]
+    assert plan.rules_for(["Bose QuietComfort Earbuds"]) == [cart_rule]
+    with pytest.raises(ValueError):
+        PricingPlan([cart_rule, cart_rule])
+
+# Test that rules discount what is left after the products' own promotions, not the list price.
+def test_rules_stack_on_promoted_lines():
+    mac, bose, pixel = make_products()
+    mac.promotion = PercentDiscount(30)
+    bose.promotion = PercentDiscount(50)
+    store = Store([mac, bose, pixel])
+    store.rules = PricingPlan([ProductRule("Mac half off", ["MacBook Air M2"], PercentDiscount(50))])
+    # 1000 at 30% off is 700, and the rule takes half of that.
+    assert store.quote([(mac, 1)]) == 350
+    store.rules = PricingPlan([
+        BundleRule("Work from home", {"MacBook Air M2": 1, "Bose QuietComfort Earbuds": 1}, price=750),
+    ])
+    # The bundled units cost 700 + 100 after their promotions, so the bundle saves 50, not 450.
+    assert store.quote([(mac, 1), (bose, 2)]) == 750 + 100
+    store.rules = PricingPlan([
+        BundleRule("Work from home", {"MacBook Air M2": 1, "Bose QuietComfort Earbuds": 1}, price=900),
+    ])
+    assert store.quote([(mac, 1), (bose, 1)]) == 800
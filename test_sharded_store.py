@@ -0,0 +1,67 @@
+import random
+
+import pytest
+from products import Product, LimitedProduct
+from promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
+from sharded_store import ShardedStore, shard_of
+from store import Store
+
+
+def make_products():
+    promotions = [None, PercentDiscount(30), SecondHalfPrice(), ThirdOneFree()]
+    products = []
+    for idx in range(12):
+        product = Product(f"Product {idx}", 10.5 + idx, 20)
+        product.promotion = promotions[idx % len(promotions)]
+        products.append(product)
+    products.append(LimitedProduct("Exclusive Sneakers", 150, 50, maximum=2))
+    return products
+
+# Test that sharded orders give the same totals and failures as Store.order.
+def test_sharded_store_matches_store_order():
+    rng = random.Random(3)
+    names = [product.name for product in make_products()]
+    orders = [[(rng.choice(names), rng.randint(1, 4)) for _ in range(rng.randint(1, 4))] for _ in range(60)]
+    store = Store(make_products())
+    expected = []
+    for shopping_list in orders:
+        try:
+            expected.append(store.order([(store.get_product(name), quantity) for name, quantity in shopping_list]))
+        except ValueError:
+            expected.append(None)
+    with ShardedStore(make_products(), processes=3) as sharded:
+        totals = []
+        for shopping_list in orders:
+            try:
+                totals.append(sharded.order(shopping_list))
+            except ValueError:
+                totals.append(None)
+        assert totals == expected
+        assert sharded.get_total_quantity() == store.get_total_quantity()
+        assert len(sharded.get_all_products()) == len(store.get_all_products())
+
+# Test that an order spanning shards is not applied when one shard rejects its lines.
+def test_sharded_store_cross_shard_order_is_all_or_nothing():
+    products = make_products()
+    with ShardedStore(products, processes=2) as sharded:
+        first = next(p.name for p in products if shard_of(p.name, 2) == 0)
+        second = next(p.name for p in products if shard_of(p.name, 2) == 1)
+        with pytest.raises(ValueError):
+            sharded.order([(first, 5), (second, 21)])
+        assert sharded.get_total_quantity() == sum(p.quantity for p in products)
+        totals, failures = sharded.order_many([[(first, 1)], [(first, 1), (second, 1)], [("Unknown", 1)]])
+        assert totals[2] is None and set(failures) == {2}
+        assert sharded.get_total_quantity() == sum(p.quantity for p in products) - 3
+
+# Test that malformed quantities are rejected before they reach a shard and that shards survive bad requests.
+def test_sharded_store_rejects_malformed_quantities():
+    products = make_products()
+    with ShardedStore(products, processes=2) as sharded:
+        with pytest.raises(TypeError):
+            sharded.order([("Product 0", 1.5)])
+        totals, failures = sharded.order_many([[("Product 0", "1")], [("Product 0", 1)]])
+        assert totals[0] is None and set(failures) == {0}
+        connection = sharded._connections[0]
+        connection.send(("prepare", -1, [("Product 0", "1")]))
+        assert connection.recv()[0] == "error"
+        assert sharded.get_total_quantity() == sum(p.quantity for p in products) - 1
@@ -0,0 +1,170 @@
+import pytest
+from products import Product
+from store import Store
+
+# Test that products can be looked up by name and removed without scanning the list.
+def test_store_lookup_and_remove_by_name():
+    mac = Product("MacBook Air M2", 1450, 100)
+    bose = Product("Bose QuietComfort Earbuds", 250, 500)
+    store = Store([mac, bose])
+    assert store.get_product("MacBook Air M2") is mac
+    store.remove_product(mac)
+    assert store.get_product("MacBook Air M2") is None
+    assert store.list_of_products == [bose]
+    with pytest.raises(ValueError):
+        store.remove_product(mac)
+
+# Test that adding a second product with the same name raises an exception.
+def test_store_rejects_duplicate_names():
+    store = Store([Product("Pixel", 500, 10)])
+    with pytest.raises(ValueError):
+        store.add_product(Product("Pixel", 400, 5))
+
+# Test that the active-products view follows quantity and active changes.
+def test_store_active_view_updates_incrementally():
+    pixel = Product("Google Pixel 7", 500, 2)
+    bose = Product("Bose QuietComfort Earbuds", 250, 500)
+    store = Store([pixel, bose])
+    store.order([(pixel, 2)])
+    assert store.get_all_products() == [bose]
+    pixel.quantity = 5
+    pixel.active = True
+    assert store.get_all_products() == [bose, pixel]
+    bose.active = False
+    assert store.get_all_products() == [pixel]
+
+# Test that renaming a product keeps the name index in sync.
+def test_store_rename_updates_index():
+    pixel = Product("Google Pixel 7", 500, 2)
+    store = Store([pixel])
+    pixel.name = "Google Pixel 8"
+    assert store.get_product("Google Pixel 8") is pixel
+    assert store.get_product("Google Pixel 7") is None
+
+# Test that the running aggregates follow orders, stock changes and catalog changes.
+def test_store_aggregates_are_maintained_incrementally():
+    mac = Product("MacBook Air M2", 1450, 10)
+    bose = Product("Bose QuietComfort Earbuds", 250, 4)
+    store = Store([mac, bose])
+    assert store.get_total_quantity() == 14
+    assert store.get_total_value() == 1450 * 10 + 250 * 4
+    store.order([(bose, 4), (mac, 1)])
+    assert store.get_total_quantity() == 9
+    assert store.get_active_count() == 1
+    assert store.get_inactive_count() == 1
+    mac.price = 1000
+    store.add_product(Product("Google Pixel 7", 500, 3))
+    store.remove_product(bose)
+    assert store.get_total_quantity() == 12
+    assert store.get_total_value() == 1000 * 9 + 500 * 3
+    assert store.verify_aggregates()
+
+# Test that a batch of orders returns per-order totals and failures without aborting.
+def test_store_order_many_reports_failures_per_order():
+    mac = Product("MacBook Air M2", 100, 5)
+    bose = Product("Bose QuietComfort Earbuds", 10, 3)
+    store = Store([mac, bose])
+    totals, failures = store.order_many([
+        [(mac, 2), (bose, 1)],
+        [(bose, 3)],
+        [(mac, 3), (bose, 2)],
+        [(mac, 0)],
+    ])
+    assert totals == [210, None, 320, None]
+    assert set(failures) == {1, 3}
+    assert mac.quantity == 0 and mac.active is False
+    assert bose.quantity == 0
+    assert store.verify_aggregates()
+
+# Test that a line exceeding stock when the same product appears twice leaves the order unapplied.
+def test_store_order_is_all_or_nothing_with_duplicate_lines():
+    mac = Product("MacBook Air M2", 100, 3)
+    bose = Product("Bose QuietComfort Earbuds", 10, 10)
+    store = Store([bose, mac])
+    with pytest.raises(ValueError):
+        store.order([(bose, 1), (mac, 2), (mac, 2)])
+    assert mac.quantity == 3
+    assert bose.quantity == 10
+
+# Stress test: concurrent orders on a thread-safe store never oversell or apply partially.
+def test_thread_safe_store_concurrent_orders_stress():
+    import random
+    import sys
+    import threading
+
+    products = [Product(f"Product {idx}", 10, 3000) for idx in range(3)]
+    store = Store(list(products), thread_safe=True)
+    placed = []
+    placed_lock = threading.Lock()
+
+    def customer(seed):
+        rng = random.Random(seed)
+        for _ in range(1000):
+            shopping_list = [(rng.choice(products), rng.randint(1, 4)) for _ in range(rng.randint(1, 4))]
+            try:
+                store.order(shopping_list)
+            except ValueError:
+                continue
+            with placed_lock:
+                placed.append(shopping_list)
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=customer, args=(seed,)) for seed in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    sold = {product: 0 for product in products}
+    for shopping_list in placed:
+        for product, quantity in shopping_list:
+            sold[product] += quantity
+    for product in products:
+        # Every unit that left stock belongs to a fully placed order, and none was oversold.
+        assert product.quantity == 3000 - sold[product]
+        assert product.quantity >= 0
+    assert store.verify_aggregates()
+
+# Test that quotes do not change stock and follow price and promotion changes.
+def test_store_quote_is_side_effect_free_and_invalidated():
+    from promotions import PercentDiscount
+    mac = Product("MacBook Air M2", 100, 5)
+    store = Store([mac])
+    assert store.quote([(mac, 2)]) == 200
+    assert store.quote([(mac, 2)]) == 200
+    assert mac.quantity == 5
+    mac.promotion = PercentDiscount(50)
+    assert store.quote([(mac, 2)]) == 100
+    mac.price = 80
+    assert mac.quote(2) == 80
+    assert store.order([(mac, 2)]) == store.quote([(mac, 2)])
+
+# Test that changing a promotion in place is not answered from cached quotes.
+def test_store_quote_follows_promotion_changed_in_place():
+    from promotions import PercentDiscount
+    mac = Product("MacBook Air M2", 100, 5)
+    mac.promotion = PercentDiscount(10)
+    store = Store([mac])
+    assert mac.quote(1) == 90.0
+    assert store.quote([(mac, 1)]) == 90
+    mac.promotion.percent = 50
+    assert mac.quote(1) == 50.0
+    assert store.quote([(mac, 1)]) == 50
+    assert store.order([(mac, 1)]) == 50
+
+# Test that non-integer quantities are rejected before any line of an order is bought.
+def test_store_order_rejects_non_integer_quantities():
+    a = Product("A", 10, 5)
+    b = Product("B", 20, 5)
+    store = Store([a, b])
+    for bad in (1.5, 1.0, True, "1"):
+        with pytest.raises(TypeError):
+            store.order([(a, 1), (b, bad)])
+    assert (a.quantity, b.quantity) == (5, 5)
+    totals, failures = store.order_many([[(a, 1)], [(a, 1.0)], [(b, True)], [(a, 1.0), (b, 2)]])
+    assert totals == [10, None, None, None] and set(failures) == {1, 2, 3}
+    assert (a.quantity, b.quantity) == (4, 5)